@@ -0,0 +1 @@
+# Lets pytest import the sudoku package from the repository root
@@ -1,7 +1,14 @@
 #!/usr/bin/env python3
 import sys
-from typing import List
-from sudoku.solver import SudokuSolver
+import time
+from typing import Any, List, Optional, Tuple
+from sudoku.board import Board
+from sudoku.solver import SOLVED, SudokuSolver, SolveResult
+from sudoku.cache import SolutionCache
+from sudoku import parallel
+
+# Solutions of boards seen before, shared by every solve_sudoku call
+solution_cache = SolutionCache()
 
 def reverse_list(l: list) -> list:
     """
@@ -39,22 +46,78 @@ def reverse_list(l: list) -> list:
     
     return result
 
-def solve_sudoku(matrix: List[List[int]]) -> bool:
+def solve_sudoku(matrix: Any, max_nodes: Optional[int] = None,
+                 deadline: Optional[float] = None, engine: str = 'dfs',
+                 use_cache: bool = True, profile: bool = False) -> SolveResult:
     """
-    Solve a 9x9 Sudoku board.
+    Solve a Sudoku board: 9x9, or any N²xN² size such as 16x16.
     
     Sudoku is one of the most popular puzzle games of all time. The goal of Sudoku is to fill a 9×9 grid with numbers so that each row, column and 3×3 section contain all of the digits between 1 and 9. As a logic puzzle, Sudoku is also an excellent brain game.
 
     Args:
-        matrix (List[List[int]]): A 9x9 matrix representing the Sudoku board, 
-                                where 0 represents empty cells.
+        matrix (List[List[int]]): A 9x9 (or N²xN²) matrix representing the
+                                Sudoku board, where 0 represents empty cells.
+                                A sudoku.board.Board, an 81-character string
+                                ('.' or '0' for blanks) or a NumPy array
+                                works as well.
+        max_nodes (int, optional): Stop after this many search nodes.
+        deadline (float, optional): Stop after this many seconds.
+        engine (str): 'dfs' for the heuristic search or 'dlx' for Dancing Links.
+        use_cache (bool): Answer boards seen before, or isomorphic to one seen
+                          before, from solution_cache instead of searching
+                          (9x9 boards only).
+        profile (bool): Also report backtracks, search depth, propagation
+                        steps and nanosecond timings per solver phase.
     Returns:
-        bool: True if solved successfully, False otherwise.
+        SolveResult: Truthy if solved successfully, falsy otherwise; its
+        status tells an unsolvable board from an exceeded budget.
         The results will saved in sudoku/puzzles directory
     """
-    matrix_p = [row[:] for row in matrix]
-    solver = SudokuSolver(matrix_p)
-    return solver.solve(verbose=True)
+    board = Board.parse(matrix)
+    solver = SudokuSolver(board, engine=engine,
+                          cache=solution_cache if use_cache and board.size == 9 else None,
+                          profile=profile)
+    return solver.solve(verbose=True, max_nodes=max_nodes, deadline=deadline)
+
+
+def solve_many(puzzles: List[Any], workers: Optional[int] = None,
+               engine: str = 'dfs', use_cache: bool = True,
+               chunksize: Optional[int] = None) -> List[Tuple[Optional[List[List[int]]], SolveResult]]:
+    """
+    Solve many Sudoku boards of one size on a pool of worker processes.
+
+    Args:
+        puzzles (List[List[List[int]]]): Boards with 0 for empty cells, in any
+                                         form solve_sudoku accepts.
+        workers (int, optional): Number of processes, one per core by default;
+                                 1 solves everything in this process.
+        engine (str): 'dfs' for the heuristic search or 'dlx' for Dancing Links.
+        use_cache (bool): Answer 9x9 boards from solution_cache where possible
+                          and store the new solutions in it. Lookups happen
+                          here, so only the misses are sent to the workers.
+        chunksize (int, optional): Puzzles sent to a worker at a time.
+    Returns:
+        List of (solution, result) in the order of puzzles; solution is None
+        where the board was not solved. Nothing is printed.
+    """
+    puzzles = [Board.parse(puzzle) for puzzle in puzzles]
+    results: List[Optional[Tuple[Optional[List[List[int]]], SolveResult]]] = [None] * len(puzzles)
+    pending = []
+    for i, puzzle in enumerate(puzzles):
+        if use_cache and puzzle.size == 9:
+            start_time = time.perf_counter()
+            solution = solution_cache.get(puzzle)
+            if solution is not None:
+                results[i] = (solution, SolveResult(SOLVED, 0, time.perf_counter() - start_time, True))
+                continue
+        pending.append(i)
+
+    solved = parallel.solve_many([puzzles[i] for i in pending], workers, chunksize, engine=engine)
+    for i, (solution, result) in zip(pending, solved):
+        if solution is not None and use_cache and puzzles[i].size == 9:
+            solution_cache.put(puzzles[i], solution)
+        results[i] = (solution, result)
+    return results
 
 
 # if __name__ == "__main__":
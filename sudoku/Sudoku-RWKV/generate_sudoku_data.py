@@ -8,6 +8,8 @@ import os
 import time
 from utils import *
 from formatter import *
+import geometry  # noqa: F401  Imported for its side effect: puts the repository root on sys.path
+from sudoku.generator import SudokuGenerator
 
 
 class Logger:
@@ -38,91 +40,38 @@ class Logger:
             f.write(json_entry + "\n")
 
 
-def is_valid(grid, row, col, num):
-    if num in grid[row]:
-        return False
-
-    if num in (grid[i][col] for i in range(9)):
-        return False
-
-    start_row, start_col = 3 * (row // 3), 3 * (col // 3)
-    for i in range(3):
-        for j in range(3):
-            if grid[i + start_row][j + start_col] == num:
-                return False
-
-    return True
-
-
-def find_empty(grid):
-    for i in range(9):
-        for j in range(9):
-            if grid[i][j] == 0:
-                return i, j
-    return None
-
-
-def solve_grid(grid):
-    empty = find_empty(grid)
-    if not empty:
-        return True
-    row, col = empty
-    for num in random.sample(range(1, 10), 9):
-        if is_valid(grid, row, col, num):
-            grid[row][col] = num
-            if solve_grid(grid):
-                return True
-            grid[row][col] = 0
-    return False
-
-
-def count_solutions(grid, limit=2):
-    empty = find_empty(grid)
-    if not empty:
-        return 1
-    row, col = empty
-    count = 0
-    for num in range(1, 10):
-        if is_valid(grid, row, col, num):
-            grid[row][col] = num
-            count += count_solutions(grid, limit - count)
-            grid[row][col] = 0
-            if count >= limit:
-                break
-    return count
-
-
-def generate_sudoku_base():
-    grid = [[0 for _ in range(9)] for _ in range(9)]
-    for i in range(0, 9, 3):
-        nums = random.sample(range(1, 10), 9)
-        for r in range(3):
-            for c in range(3):
-                grid[i + r][i + c] = nums[r * 3 + c]
-    return grid
-
-
+# Returns a puzzle with a unique solution and `difficulty` empty cells, and its
+# solution. Clues are removed at random; if the puzzle becomes minimal first, a
+# minimal puzzle with at most 81 - difficulty clues is searched for and clues of
+# the solution are put back until exactly `difficulty` cells are empty. If that
+# search times out, the stuck puzzle is returned with fewer empty cells.
 def generate_sudoku(difficulty, seed=None):
     if seed is not None:
         random.seed(seed)
     else:
         random.seed()
-    grid = generate_sudoku_base()
-
-    solve_grid(grid)
+    # A shuffled base pattern, built without search
+    grid = SudokuGenerator.solved_board()
 
     solved_grid = deepcopy(grid)
 
-    cells = [(i, j) for i in range(9) for j in range(9)]
-    random.shuffle(cells)
+    # Each removal is checked incrementally, keeping the solution unique
+    removed = 0
+    if difficulty:
+        for removed, puzzle in enumerate(SudokuGenerator.remove_clues(solved_grid, rng=random), 1):
+            grid = puzzle.rows()
+            if removed >= difficulty:
+                break
 
-    for i, j in cells:
-        if sum(row.count(0) for row in grid) >= difficulty:
-            break
-        temp = grid[i][j]
-        grid[i][j] = 0
-        if count_solutions(deepcopy(grid)) != 1:
-            grid[i][j] = temp
+    if removed < difficulty:
+        # The puzzle became minimal first; search for one with fewer clues
+        minimal, _ = SudokuGenerator.generate_minimal(81 - difficulty, rng=random, solution=solved_grid)
+        if minimal is not None:
+            # Clues put back keep the solution unique
+            grid = minimal
+            holes = [(i, j) for i in range(9) for j in range(9) if grid[i][j] == 0]
+            for i, j in random.sample(holes, len(holes) - difficulty):
+                grid[i][j] = solved_grid[i][j]
 
     return grid, solved_grid
 
@@ -374,7 +323,8 @@ def parallel_generate_sudoku(
 if __name__ == '__main__':
     SAMPLE_COUNT = 10
     # Difficulty refers to the number of empty cells in the Sudoku puzzle.
-    # Warning: Higher difficulties (more than 50 empty cells) will exponentially increase the time to generate the puzzle.
+    # Up to 59 empty cells (22 clues) take seconds; beyond that the puzzle
+    # may keep a few more clues than asked for.
     DIFFICULTY = {
         0.3: (0, 42),
         0.65: (42, 53),
@@ -0,0 +1,9 @@
+"""Board geometry tables shared with the solvers in the sudoku package."""
+import sys
+from pathlib import Path
+
+# This folder runs as a standalone script directory, so make the repository
+# root importable to reach the sudoku package
+sys.path.append(str(Path(__file__).resolve().parents[2]))
+
+from sudoku.geometry import ROW_OF, COL_OF, BOX_OF, UNITS, CELL_UNITS, PEERS
@@ -1,8 +1,9 @@
-import torch
-import torch.nn as nn
 import os
 import time
 from pathlib import Path
+from geometry import ROW_OF, COL_OF, UNITS, PEERS
+from sudoku.board import Board
+from sudoku.solver import PHASES, SOLVED, UNSOLVABLE, SolveResult
 
 current_path = Path(__file__).parent
 
@@ -89,25 +90,10 @@ class RWKVSolver:
         if any(0 in row for row in matrix):
             return False
             
-        # Check rows
-        for row in matrix:
-            if len(set(row)) != 9:
+        # Check rows, columns and boxes
+        for unit in UNITS:
+            if len(set(matrix[ROW_OF[idx]][COL_OF[idx]] for idx in unit)) != 9:
                 return False
-                
-        # Check columns 
-        for col in range(9):
-            if len(set(matrix[row][col] for row in range(9))) != 9:
-                return False
-                
-        # Check boxes
-        for box_row in range(0, 9, 3):
-            for box_col in range(0, 9, 3):
-                box = []
-                for i in range(3):
-                    for j in range(3):
-                        box.append(matrix[box_row + i][box_col + j])
-                if len(set(box)) != 9:
-                    return False
                     
         return True
 
@@ -145,56 +131,71 @@ class BaseSolver:
         """Check if number is valid in position."""
         row, col = pos
         
-        # Check row
-        for j in range(self.size):
-            if matrix[row][j] == num and col != j:
+        # Check row, column and box through the peer table
+        for peer in PEERS[row * self.size + col]:
+            if matrix[ROW_OF[peer]][COL_OF[peer]] == num:
                 return False
-                
-        # Check column    
-        for i in range(self.size):
-            if matrix[i][col] == num and row != i:
-                return False
-                
-        # Check box
-        box_x = (row // self.box_size) * self.box_size
-        box_y = (col // self.box_size) * self.box_size
-        
-        for i in range(box_x, box_x + self.box_size):
-            for j in range(box_y, box_y + self.box_size):
-                if matrix[i][j] == num and (i,j) != (row,col):
-                    return False
                     
         return True
 
 class DFSSolver(BaseSolver):
     """DFS-based Sudoku solver with MRV heuristic."""
     
-    def __init__(self):
-        """Initialize DFS solver."""
+    def __init__(self, profile=False):
+        """
+        Initialize DFS solver.
+
+        Args:
+            profile (bool): Count backtracks and depth and time the search,
+                as in sudoku.solver.SolveResult
+        """
         super().__init__()
         self.attempts = 0
         self.solve_time = 0
+        self.profile = profile
+        self.backtracks = None
+        self.max_depth = None
+        self.phase_ns = None
+        self.board = None
         
     def solve(self, matrix):
         """
         Solve Sudoku using DFS with MRV heuristic.
         
         Args:
-            matrix (List[List[int]]): 9x9 Sudoku board
+            matrix (List[List[int]]): 9x9 Sudoku board, or a sudoku.board.Board
+                or anything Board.parse accepts
             
         Returns: 
-            bool: True if solved, False otherwise
-            Matrix is modified in place
+            SolveResult: Truthy if solved, falsy otherwise
+            A matrix is modified in place; self.board holds the result
+            for every kind of input
         """
-        start_time = time.time()
+        if not isinstance(matrix, list):
+            matrix = Board.parse(matrix, self.box_size).validate().rows()
+        self.board = matrix
+        start_time = time.perf_counter()
         self.attempts = 0
-        result = self._solve_dfs(matrix)
-        self.solve_time = time.time() - start_time
-        return result
+        if self.profile:
+            self.backtracks = 0
+            self.max_depth = 0
+            self.phase_ns = dict.fromkeys(PHASES, 0)
+            start = time.perf_counter_ns()
+            result = self._solve_dfs(matrix)
+            self.phase_ns['branch'] = time.perf_counter_ns() - start
+        else:
+            result = self._solve_dfs(matrix)
+        self.solve_time = time.perf_counter() - start_time
+        return SolveResult(SOLVED if result else UNSOLVABLE, self.attempts, self.solve_time,
+                           backtracks=self.backtracks, max_depth=self.max_depth,
+                           propagation_steps=0 if self.profile else None,
+                           phase_ns=self.phase_ns)
     
-    def _solve_dfs(self, matrix):
+    def _solve_dfs(self, matrix, depth=0):
         """DFS implementation with MRV heuristic."""
         self.attempts += 1
+        if self.profile and depth > self.max_depth:
+            self.max_depth = depth
         
         # Find empty cell with minimum remaining values
         pos = self.find_empty(matrix)
@@ -206,10 +207,12 @@ class DFSSolver(BaseSolver):
             if self.is_valid(matrix, num, (row, col)):
                 matrix[row][col] = num
                 
-                if self._solve_dfs(matrix):
+                if self._solve_dfs(matrix, depth + 1):
                     return True
                     
                 matrix[row][col] = 0
+                if self.profile:
+                    self.backtracks += 1
                 
         return False
         
@@ -217,5 +220,8 @@ class DFSSolver(BaseSolver):
         """Get solving statistics."""
         return {
             'attempts': self.attempts,
-            'time': self.solve_time
+            'time': self.solve_time,
+            'backtracks': self.backtracks,
+            'max_depth': self.max_depth,
+            'phase_ns': self.phase_ns
         }
\ No newline at end of file
@@ -0,0 +1,126 @@
+"""
+Vectorized batch solving with NumPy.
+
+All puzzles of a batch are propagated together: candidates are an
+(N, 81) array of 9-bit masks derived from the placed digits through the
+unit index tables, and naked/hidden singles are found with array
+reductions.
+Only the puzzles that propagation cannot finish are handed to the
+per-puzzle SudokuSolver search.
+"""
+from typing import Any, List, Optional
+
+import numpy as np
+
+from .board import Board
+from .geometry import (UNITS, CELL_UNITS, NUM_CELLS, SIZE, BOX_SIZE,
+                       FULL_MASK, POPCOUNT, LOWEST_DIGIT)
+from .solver import SudokuSolver
+
+UNIT_INDEX = np.array(UNITS, dtype=np.intp)             # (27, 9) cells per unit
+CELL_UNIT_INDEX = np.array(CELL_UNITS, dtype=np.intp)   # (81, 3) units per cell
+FULL = np.int16(FULL_MASK)
+POPCOUNT_TABLE = np.array(POPCOUNT, dtype=np.int8)
+LOWEST_DIGIT_TABLE = np.array(LOWEST_DIGIT, dtype=np.int8)
+
+# Bit of each digit, with 0 (empty) mapping to no bit
+DIGIT_BIT = np.array([0] + [1 << d for d in range(SIZE)], dtype=np.int16)
+
+# Cells of rows, columns and boxes as three permutations of 0..80, so
+# per-unit results of one unit type can be scattered back to cells
+UNIT_GROUPS = [(slice(g * SIZE, (g + 1) * SIZE), UNIT_INDEX[g * SIZE:(g + 1) * SIZE].ravel())
+               for g in range(3)]
+
+
+def _propagate(grid: np.ndarray) -> np.ndarray:
+    """
+    Fill naked and hidden singles in place until every puzzle is stuck.
+
+    Candidates are 9-bit masks per cell, recomputed each round from the
+    placed digits: a cell may hold any digit not used in its three units.
+
+    Args:
+        grid: (N, 81) int8 boards, 0 for empty cells
+
+    Returns:
+        (N,) bool array marking puzzles that reached a contradiction
+    """
+    dead = np.zeros(len(grid), dtype=bool)
+    active = np.arange(len(grid))
+
+    while len(active):
+        board = grid[active]
+        empty = board == 0
+
+        # Digits used per unit; duplicates make the sum differ from the OR
+        unit_bits = DIGIT_BIT[board][:, UNIT_INDEX]                   # (n, 27, 9)
+        used = np.bitwise_or.reduce(unit_bits, axis=2)                # (n, 27)
+        failed = (unit_bits.sum(axis=2) != used).any(axis=1)
+
+        blocked = np.bitwise_or.reduce(used[:, CELL_UNIT_INDEX], axis=2)
+        candidates = np.where(empty, FULL & ~blocked, 0)              # (n, 81)
+        counts = POPCOUNT_TABLE[candidates]
+        failed |= (empty & (counts == 0)).any(axis=1)
+
+        # Naked singles: cells left with exactly one candidate
+        assign = np.where(counts == 1, candidates, 0)
+
+        # Hidden singles: digits seen exactly once across a unit's cells
+        unit_candidates = candidates[:, UNIT_INDEX]                   # (n, 27, 9)
+        once = np.zeros_like(used)
+        twice = np.zeros_like(used)
+        for pos in range(SIZE):
+            twice |= once & unit_candidates[:, :, pos]
+            once |= unit_candidates[:, :, pos]
+        failed |= ((once | used) != FULL).any(axis=1)
+        hidden = once & ~twice
+
+        for units, cells in UNIT_GROUPS:
+            found = unit_candidates[:, units] & hidden[:, units, None]
+            assign[:, cells] |= found.reshape(len(board), -1)
+
+        # A cell forced to two digits is a contradiction as well
+        failed |= (POPCOUNT_TABLE[assign] > 1).any(axis=1)
+        progress = assign.any(axis=1) & ~failed
+
+        dead[active[failed]] = True
+        filled = board[progress] + LOWEST_DIGIT_TABLE[assign[progress]]
+        grid[active[progress]] = filled
+        active = active[progress]
+
+    return dead
+
+
+def solve_batch(puzzles: List[Any], **solver_args) -> List[Optional[List[List[int]]]]:
+    """
+    Solve many 9x9 puzzles at once.
+
+    Args:
+        puzzles: 9x9 boards with 0 for empty cells, as matrices or
+            anything sudoku.board.Board.parse accepts
+        **solver_args: Passed to SudokuSolver for the puzzles that need search
+
+    Returns:
+        The solved board of every puzzle, or None where no solution exists
+    """
+    if not puzzles:
+        return []
+
+    # One byte per cell already, so the boards are joined without conversion
+    cells = b''.join(Board.parse(puzzle, BOX_SIZE).cells for puzzle in puzzles)
+    grid = np.frombuffer(cells, dtype=np.int8).reshape(len(puzzles), NUM_CELLS).copy()
+
+    dead = _propagate(grid)
+    stuck = (grid == 0).any(axis=1) & ~dead
+
+    solutions: List[Optional[List[List[int]]]] = []
+    for i, board in enumerate(grid.reshape(len(puzzles), SIZE, SIZE).tolist()):
+        if dead[i]:
+            solutions.append(None)
+        elif stuck[i]:
+            # Propagation only made sound deductions, so search from there
+            solver = SudokuSolver(board, **solver_args)
+            solutions.append(solver.board if solver.solve() else None)
+        else:
+            solutions.append(board)
+    return solutions
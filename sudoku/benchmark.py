@@ -0,0 +1,628 @@
+import argparse
+import glob
+import hashlib
+import importlib.util
+import json
+import math
+import os
+import platform
+import random
+import sys
+import time
+from itertools import islice
+from typing import List, Dict, Any, Callable, Optional, Sequence, Tuple
+from .board import Board
+from .corpus import read_corpus
+from .solver import SudokuSolver
+from .strategies import STRATEGIES
+from .generator import UNIQUE, SudokuGenerator
+from .dlx import get_matrix
+
+PUZZLE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'puzzles')
+RWKV_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'Sudoku-RWKV')
+
+Grid = List[List[int]]
+
+
+def load_puzzles(paths: Sequence[str], limit: int = None) -> List[List[List[int]]]:
+    """
+    Load puzzles from files.
+
+    Reads the JSON files of SudokuTester.save_puzzles, puzzle lists (.txt,
+    one 81-character puzzle per line with '.' or '0' for blanks, '#'
+    comments) and the corpora and indexed stores of sudoku.corpus.
+
+    Args:
+        paths: File paths or glob patterns
+        limit: Keep at most this many puzzles
+    """
+    puzzles = []
+    for pattern in paths:
+        for filename in sorted(glob.glob(pattern)):
+            if filename.endswith('.json'):
+                with open(filename) as f:
+                    data = json.load(f)
+                puzzles.extend(entry['puzzle'] for entry in data['puzzles'])
+            elif filename.endswith('.txt'):
+                with open(filename) as f:
+                    puzzles.extend(Board.from_string(line.split()[0]).rows() for line in f
+                                   if line.strip() and not line.lstrip().startswith('#'))
+            else:
+                remaining = limit - len(puzzles) if limit else None
+                puzzles.extend(puzzle.rows() for puzzle, _ in
+                               islice(read_corpus(filename), max(remaining, 0) if limit else None))
+    return puzzles[:limit] if limit else puzzles
+
+
+def run_solver(puzzles: List[List[List[int]]], **solver_args) -> Dict[str, Any]:
+    """Solve every puzzle with one solver configuration and total the stats."""
+    nodes = 0
+    solved = 0
+    strategy_stats: Dict[str, Dict[str, float]] = {}
+
+    start_time = time.perf_counter()
+    for puzzle in puzzles:
+        solver = SudokuSolver(puzzle, **solver_args)
+        if solver.solve():
+            solved += 1
+        nodes += solver.get_attempts()
+        for name, stats in solver.strategy_stats.items():
+            totals = strategy_stats.setdefault(name, dict.fromkeys(stats, 0))
+            for key, value in stats.items():
+                totals[key] += value
+    total_time = time.perf_counter() - start_time
+
+    return {
+        'solved': solved,
+        'nodes': nodes,
+        'time': total_time,
+        'strategy_stats': strategy_stats
+    }
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """q-th percentile (0-100) of values by the nearest-rank method."""
+    ordered = sorted(values)
+    return ordered[max(1, math.ceil(q / 100 * len(ordered))) - 1]
+
+
+def benchmark_strategies(puzzles: List[List[List[int]]]) -> List[Dict[str, Any]]:
+    """
+    Measure what each strategy buys over plain singles + DFS.
+
+    Runs the baseline (no strategies), each strategy on its own and the
+    full default pipeline over the same puzzles.
+    """
+    configs = [('none', [])]
+    configs += [(name, [name]) for name in STRATEGIES]
+    configs += [('all', list(STRATEGIES))]
+
+    rows = []
+    for label, strategies in configs:
+        row = run_solver(puzzles, strategies=strategies)
+        row['config'] = label
+        rows.append(row)
+
+    # Strategy times are only measured by profiling solvers, which would
+    # slow down the timed runs above
+    profiled = run_solver(puzzles, strategies=list(STRATEGIES), profile=True)
+    rows[-1]['strategy_stats'] = profiled['strategy_stats']
+    return rows
+
+
+def print_strategy_report(rows: List[Dict[str, Any]], count: int) -> None:
+    """Print the strategy comparison relative to the baseline row."""
+    base = rows[0]
+    print(f"{'Config':<20}{'Nodes':>10}{'Avg nodes':>11}{'Nodes vs base':>15}"
+          f"{'Time (ms)':>12}{'Time vs base':>14}")
+    print("-" * 82)
+    for row in rows:
+        node_delta = (row['nodes'] - base['nodes']) / base['nodes'] * 100
+        time_delta = (row['time'] - base['time']) / base['time'] * 100
+        print(f"{row['config']:<20}{row['nodes']:>10}{row['nodes'] / count:>11.2f}"
+              f"{node_delta:>+14.1f}%{row['time'] * 1000:>12.1f}{time_delta:>+13.1f}%")
+
+    print("\nStrategy stats in the full pipeline")
+    print(f"{'Strategy':<20}{'Calls':>10}{'Hits':>10}{'Eliminations':>14}{'Time (ms)':>12}")
+    print("-" * 66)
+    for name, stats in rows[-1]['strategy_stats'].items():
+        print(f"{name:<20}{stats['calls']:>10}{stats['hits']:>10}"
+              f"{stats['eliminations']:>14}{stats['time'] * 1000:>12.1f}")
+
+
+def benchmark_batch(puzzles: List[List[List[int]]]) -> Dict[str, float]:
+    """Compare one-at-a-time solving with solve_batch on the same puzzles."""
+    from .batch import solve_batch  # NumPy is only needed for this benchmark
+
+    single = run_solver(puzzles)
+
+    start_time = time.perf_counter()
+    solutions = solve_batch(puzzles)
+    batch_time = time.perf_counter() - start_time
+
+    return {
+        'single_time': single['time'],
+        'single_solved': single['solved'],
+        'batch_time': batch_time,
+        'batch_solved': sum(solution is not None for solution in solutions)
+    }
+
+
+def benchmark_restarts(puzzles: List[List[List[int]]], seed: int,
+                       restart_nodes: int = 100) -> List[Dict[str, Any]]:
+    """
+    Compare the solve time tail of plain DFS and of each restart schedule.
+
+    Puzzles are timed one by one. Every schedule draws the per-puzzle
+    seeds from the same stream, so a run is reproducible from seed.
+    """
+    configs = [('none', {})]
+    configs += [(schedule, {'restarts': schedule, 'restart_nodes': restart_nodes})
+                for schedule in SudokuSolver.RESTART_SCHEDULES]
+
+    rows = []
+    for label, solver_args in configs:
+        rng = random.Random(seed)
+        times = []
+        nodes = solved = restarts = 0
+        for puzzle in puzzles:
+            solver = SudokuSolver(puzzle, seed=rng.getrandbits(32), **solver_args)
+            result = solver.solve()
+            solved += result.solved
+            nodes += result.nodes
+            restarts += result.restarts or 0
+            times.append(result.solve_time)
+        rows.append({
+            'config': label,
+            'solved': solved,
+            'nodes': nodes,
+            'restarts': restarts,
+            'time': sum(times),
+            'p50': percentile(times, 50),
+            'p99': percentile(times, 99),
+            'max': max(times)
+        })
+    return rows
+
+
+def print_restart_report(rows: List[Dict[str, Any]], count: int) -> None:
+    """Print solve time percentiles per restart schedule."""
+    print(f"{'Config':<12}{'Solved':>10}{'Avg nodes':>11}{'Restarts':>10}"
+          f"{'p50 ms':>10}{'p99 ms':>10}{'Max ms':>10}{'Total ms':>11}")
+    print("-" * 84)
+    for row in rows:
+        print(f"{row['config']:<12}{row['solved']:>5}/{count:<4}{row['nodes'] / count:>11.1f}"
+              f"{row['restarts']:>10}{row['p50'] * 1000:>10.2f}{row['p99'] * 1000:>10.2f}"
+              f"{row['max'] * 1000:>10.2f}{row['time'] * 1000:>11.1f}")
+
+
+def benchmark_scaling(box_sizes: Sequence[int], count: int, difficulty: float,
+                      timeout: float) -> List[Dict[str, Any]]:
+    """
+    Generate puzzles of each board size and solve them with both engines.
+
+    Args:
+        box_sizes: Box sizes to run (2 = 4x4 up to 5 = 25x25)
+        count: Puzzles per size
+        difficulty: Passed to SudokuGenerator.generate_puzzle
+        timeout: Generation time limit per puzzle
+    """
+    rows = []
+    for box_size in box_sizes:
+        start_time = time.perf_counter()
+        puzzles = [SudokuGenerator.generate_puzzle(difficulty, timeout, box_size)[0]
+                   for _ in range(count)]
+        generate_time = time.perf_counter() - start_time
+
+        get_matrix(box_size)  # Build the Dancing Links matrix outside the timings
+        for engine in SudokuSolver.ENGINES:
+            row = run_solver(puzzles, engine=engine)
+            row.update(box_size=box_size, engine=engine, count=count,
+                       generate_time=generate_time,
+                       holes=sum(r.count(0) for p in puzzles for r in p) / count)
+            rows.append(row)
+    return rows
+
+
+def print_scaling_report(rows: List[Dict[str, Any]]) -> None:
+    """Print per-size solve costs, one row per size and engine."""
+    print(f"{'Board':<8}{'Engine':<8}{'Holes':>8}{'Solved':>8}{'Avg nodes':>11}"
+          f"{'Avg ms':>10}{'Gen ms':>10}")
+    print("-" * 63)
+    for row in rows:
+        size = row['box_size'] ** 2
+        count = row['count']
+        print(f"{f'{size}x{size}':<8}{row['engine']:<8}{row['holes']:>8.1f}"
+              f"{row['solved']:>5}/{count:<2}{row['nodes'] / count:>11.1f}"
+              f"{row['time'] / count * 1000:>10.2f}{row['generate_time'] / count * 1000:>10.1f}")
+
+
+# Engines of the suite: SudokuSolver, the naive DFS, the DFS of the RWKV
+# scripts, their ground-truth solver and the generator's uniqueness check
+SUITE_ENGINES = ('dfs', 'naive', 'rwkv_dfs', 'rwkv_gt', 'uniqueness')
+SUITE_CORPORA = ('inkala', 'saved')
+
+# Puzzle files of the 'saved' suite corpus, the ones shipped with the
+# package; tester runs add files to sudoku/puzzles, so this is no glob
+SAVED_CORPUS = (
+    'sudoku_extreme_20241214_222211.json',
+    'sudoku_extreme_20241215_141241.json',
+    'sudoku_extreme_20241215_141352.json',
+    'sudoku_extreme_20241215_142712.json',
+    'sudoku_inkala2006_20241215_003238.json',
+    'sudoku_inkala2006_20241215_140731.json',
+    'sudoku_inkala2006_20241215_140927.json',
+    'sudoku_inkala2006_20241215_141356.json',
+    'sudoku_inkala2006_20241215_142016.json',
+    'sudoku_inkala2006_20241215_142119.json',
+    'sudoku_inkala2006_20241215_142126.json',
+    'sudoku_inkala2006_20241215_142151.json',
+    'sudoku_inkala2006_20241215_142153.json',
+    'sudoku_inkala2006_20241215_142216.json',
+    'sudoku_inkala2006_20241215_142229.json',
+    'sudoku_inkala2006_20241215_142422.json',
+    'sudoku_inkala2006_20241215_142425.json',
+    'sudoku_inkala2010_20241215_003256.json',
+    'sudoku_inkala2010_20241215_142113.json',
+    'sudoku_inkala2010_20241215_142134.json',
+    'sudoku_inkala2010_20241215_142149.json',
+    'sudoku_inkala2010_20241215_142155.json',
+    'sudoku_inkala2010_20241215_142213.json',
+    'sudoku_inkala2010_20241215_142417.json',
+)
+
+# Suite engines that only solve 9x9 boards
+SUITE_9X9_ENGINES = ('naive', 'rwkv_dfs', 'rwkv_gt')
+
+PERCENTILES = (50, 95, 99)
+
+# Stats a baseline comparison gates on; the time tail above p99 is too noisy
+GATED_TIME = ('p50', 'p95', 'p99')
+GATED_NODES = ('p50', 'p95', 'p99', 'max')
+
+
+def _rwkv_module(name: str) -> Any:
+    """Import a module of the Sudoku-RWKV scripts folder, which is not a package."""
+    module = sys.modules.get(f'rwkv_{name}')
+    if module is None:
+        if RWKV_DIR not in sys.path:
+            sys.path.append(RWKV_DIR)  # For the modules' own imports
+        spec = importlib.util.spec_from_file_location(f'rwkv_{name}',
+                                                      os.path.join(RWKV_DIR, f'{name}.py'))
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        sys.modules[spec.name] = module
+    return module
+
+
+def load_engine(name: str,
+                max_nodes: Optional[int] = None) -> Callable[[Grid], Tuple[bool, Optional[int]]]:
+    """
+    Solve function of a suite engine: (solved, nodes) of a puzzle, with
+    nodes None for engines that do not count them.
+
+    The uniqueness check counts as solved when it proves the solution
+    unique, the ground-truth solver when it returns a unique solution.
+    max_nodes is the search budget per puzzle of the engines that take
+    one (dfs, naive and uniqueness).
+
+    Raises:
+        ImportError: If the engine's dependencies are not installed
+    """
+    if name == 'dfs':
+        def solve(puzzle: Grid) -> Tuple[bool, Optional[int]]:
+            result = SudokuSolver(puzzle).solve(max_nodes=max_nodes)
+            return result.solved, result.nodes
+    elif name == 'naive':
+        from .solver_naiveDFS import SudokuSolver as NaiveSolver
+
+        def solve(puzzle: Grid) -> Tuple[bool, Optional[int]]:
+            result = NaiveSolver(puzzle).solve(max_nodes=max_nodes)
+            return result.solved, result.nodes
+    elif name == 'rwkv_dfs':
+        dfs_solver = _rwkv_module('solver').DFSSolver
+
+        def solve(puzzle: Grid) -> Tuple[bool, Optional[int]]:
+            result = dfs_solver().solve(puzzle)
+            return result.solved, result.nodes
+    elif name == 'rwkv_gt':
+        solve_sudoku_gt = _rwkv_module('utils').solve_sudoku_gt
+
+        def solve(puzzle: Grid) -> Tuple[bool, Optional[int]]:
+            return solve_sudoku_gt(puzzle)[0] == 1, None
+    elif name == 'uniqueness':
+        def solve(puzzle: Grid) -> Tuple[bool, Optional[int]]:
+            return SudokuGenerator.check_uniqueness(puzzle, max_nodes) == UNIQUE, None
+    else:
+        raise ValueError(f"Unknown engine {name!r}, expected one of {SUITE_ENGINES}")
+    return solve
+
+
+def corpus_digest(puzzles: List[Grid]) -> str:
+    """Short hash of a corpus, so runs are only compared on the same puzzles."""
+    digest = hashlib.sha256()
+    for puzzle in puzzles:
+        digest.update(bytes(num for row in puzzle for num in row))
+    return digest.hexdigest()[:16]
+
+
+def load_suite_corpora(names: Sequence[str], files: Sequence[str] = (),
+                       limit: Optional[int] = None) -> Dict[str, List[Grid]]:
+    """
+    Frozen corpora of the suite by name.
+
+    'inkala' is the two Inkala puzzles and 'saved' the puzzle files
+    shipped in sudoku/puzzles (SAVED_CORPUS); every file or pattern in
+    files is a corpus of its own, named after it (see load_puzzles for
+    the formats).
+    """
+    corpora = {}
+    for name in names:
+        if name == 'inkala':
+            corpora[name] = [SudokuGenerator.INKALA_2006, SudokuGenerator.INKALA_2010][:limit]
+        elif name == 'saved':
+            corpora[name] = load_puzzles([os.path.join(PUZZLE_DIR, filename)
+                                          for filename in SAVED_CORPUS], limit)
+        else:
+            raise ValueError(f"Unknown corpus {name!r}, expected one of {SUITE_CORPORA}")
+    for pattern in files:
+        corpora[os.path.basename(pattern)] = load_puzzles([pattern], limit)
+    return corpora
+
+
+def _summary(values: List[float]) -> Dict[str, float]:
+    """p50/p95/p99/max of values."""
+    summary = {f'p{q}': percentile(values, q) for q in PERCENTILES}
+    summary['max'] = max(values)
+    return summary
+
+
+def run_suite(corpora: Dict[str, List[Grid]], engines: Sequence[str] = SUITE_ENGINES,
+              warmup: int = 5, repeats: int = 3,
+              max_nodes: Optional[int] = None) -> List[Dict[str, Any]]:
+    """
+    Time every engine on every corpus.
+
+    Each engine first solves the first warmup puzzles of a corpus
+    untimed. Then every puzzle is solved repeats times, and the fastest
+    run counts, which filters out most scheduling noise; node counts are
+    deterministic. Times include building the solver. A puzzle that runs
+    out of max_nodes counts as unsolved, with the time it took to give up.
+    Engines that only solve 9x9 boards (SUITE_9X9_ENGINES) leave out the
+    other puzzles.
+
+    Returns:
+        One row per (corpus, engine) with the corpus digest, the puzzle
+        and solved counts and the time (seconds) and node percentiles;
+        engines whose dependencies are missing get a 'skipped' reason
+    """
+    rows = []
+    for corpus, puzzles in corpora.items():
+        if not puzzles:
+            continue
+        all_puzzles = puzzles
+        for engine in engines:
+            puzzles = all_puzzles
+            if engine in SUITE_9X9_ENGINES:
+                puzzles = [puzzle for puzzle in puzzles if len(puzzle) == 9]
+            row = {'corpus': corpus, 'engine': engine, 'digest': corpus_digest(puzzles),
+                   'count': len(puzzles)}
+            rows.append(row)
+            if not puzzles:
+                row['skipped'] = "no 9x9 puzzles"
+                continue
+            try:
+                solve = load_engine(engine, max_nodes)
+            except ImportError as e:
+                row['skipped'] = str(e)
+                continue
+
+            for puzzle in puzzles[:warmup]:
+                solve([line[:] for line in puzzle])
+            times = []
+            nodes = []
+            solved = 0
+            for puzzle in puzzles:
+                best = math.inf
+                for _ in range(repeats):
+                    board = [line[:] for line in puzzle]  # Some engines solve in place
+                    start_time = time.perf_counter()
+                    ok, count = solve(board)
+                    best = min(best, time.perf_counter() - start_time)
+                solved += ok
+                times.append(best)
+                if count is not None:
+                    nodes.append(count)
+            row.update(solved=solved, time=_summary(times),
+                       nodes=_summary(nodes) if nodes else None)
+    return rows
+
+
+def print_suite_report(rows: List[Dict[str, Any]]) -> None:
+    """Print time and node percentiles per corpus and engine."""
+    print(f"{'Corpus':<10}{'Engine':<12}{'Solved':>11}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}"
+          f"{'Max ms':>10}{'p50 nodes':>11}{'p99 nodes':>11}{'Max nodes':>11}")
+    print("-" * 103)
+    for row in rows:
+        label = f"{row['corpus'][:9]:<10}{row['engine']:<12}"
+        if 'skipped' in row:
+            print(f"{label}skipped: {row['skipped']}")
+            continue
+        times, nodes = row['time'], row['nodes']
+        node_text = ''.join(f"{nodes[stat]:>11}" if nodes else f"{'-':>11}"
+                            for stat in ('p50', 'p99', 'max'))
+        print(f"{label}{row['solved']:>6}/{row['count']:<4}{times['p50'] * 1000:>9.3f}"
+              f"{times['p95'] * 1000:>9.3f}{times['p99'] * 1000:>9.3f}{times['max'] * 1000:>10.3f}"
+              f"{node_text}")
+
+
+def compare_to_baseline(rows: List[Dict[str, Any]], baseline: Dict[str, Any],
+                        threshold: float = 0.2,
+                        min_time: float = 1e-4) -> Tuple[List[str], List[str]]:
+    """
+    Regressions of a suite run against a baseline run.
+
+    A row regresses when it solves fewer puzzles, or when a gated time or
+    node percentile grows by more than threshold (a fraction; time also
+    by more than min_time seconds). Rows whose corpus changed since the
+    baseline are not compared.
+
+    Returns:
+        (regressions, notes) as messages
+    """
+    previous = {(row['corpus'], row['engine']): row for row in baseline['rows']
+                if 'skipped' not in row}
+    regressions = []
+    notes = []
+    for row in rows:
+        old = previous.get((row['corpus'], row['engine']))
+        if old is None or 'skipped' in row:
+            continue
+        label = f"{row['corpus']}/{row['engine']}"
+        if old['digest'] != row['digest']:
+            notes.append(f"{label}: corpus changed since the baseline, not compared")
+            continue
+        if row['solved'] < old['solved']:
+            regressions.append(f"{label}: solved {row['solved']}, baseline {old['solved']}")
+        for stat in GATED_TIME:
+            new, base = row['time'][stat], old['time'][stat]
+            if new > base * (1 + threshold) and new - base > min_time:
+                regressions.append(f"{label}: time {stat} {new * 1000:.3f}ms, "
+                                   f"baseline {base * 1000:.3f}ms ({new / base - 1:+.0%})")
+        if row['nodes'] and old['nodes']:
+            for stat in GATED_NODES:
+                new, base = row['nodes'][stat], old['nodes'][stat]
+                if new > base * (1 + threshold):
+                    regressions.append(f"{label}: nodes {stat} {new}, baseline {base} "
+                                       f"({new / max(base, 1) - 1:+.0%})")
+    return regressions, notes
+
+
+def main():
+    """Command line interface."""
+    parser = argparse.ArgumentParser(description='Sudoku Solver Benchmarks')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    # Corpus options shared by every benchmark
+    corpus = argparse.ArgumentParser(add_help=False)
+    corpus.add_argument('-f', '--files', nargs='+',
+                        default=[os.path.join(PUZZLE_DIR, 'sudoku_extreme_*.json')],
+                        help='Puzzle JSON files or glob patterns '
+                             '(default: sudoku/puzzles/sudoku_extreme_*.json)')
+    corpus.add_argument('-n', '--num_puzzles', type=int, default=None,
+                        help='Use at most this many puzzles')
+
+    subparsers.add_parser('strategies', parents=[corpus],
+                          help='Compare DFS nodes and time per strategy')
+    subparsers.add_parser('batch', parents=[corpus],
+                          help='Compare per-puzzle solving with solve_batch')
+    restarts = subparsers.add_parser('restarts', parents=[corpus],
+                                     help='Compare solve time tails with and without restarts')
+    restarts.add_argument('--restart_nodes', type=int, default=100,
+                          help='Node cutoff of the first restart (default: 100)')
+    restarts.add_argument('--seed', type=int, default=None,
+                          help='Random seed, printed for reruns if not given')
+    scaling = subparsers.add_parser('scaling',
+                                    help='Solve generated puzzles from 4x4 up to 25x25')
+    scaling.add_argument('-b', '--box_sizes', type=int, nargs='+', default=[2, 3, 4, 5],
+                         help='Box sizes to run (default: 2 3 4 5)')
+    scaling.add_argument('-n', '--num_puzzles', type=int, default=5,
+                         help='Puzzles per size (default: 5)')
+    scaling.add_argument('-d', '--difficulty', type=float, default=0.5,
+                         choices=[0.3, 0.5, 0.7, 0.9], help='Generator difficulty')
+    scaling.add_argument('-t', '--timeout', type=float, default=15.0,
+                         help='Generation time limit per puzzle in seconds')
+    scaling.add_argument('--seed', type=int, default=None, help='Random seed')
+    suite = subparsers.add_parser('suite',
+                                  help='Time every engine on frozen corpora, optionally '
+                                       'against a baseline')
+    suite.add_argument('-c', '--corpora', nargs='*', default=list(SUITE_CORPORA),
+                       choices=SUITE_CORPORA, help='Built-in corpora (default: inkala saved)')
+    suite.add_argument('-f', '--files', nargs='+', default=[],
+                       help='More corpora: puzzle lists (.txt, 81 characters per line), '
+                            'JSON files, corpora or stores, or glob patterns')
+    suite.add_argument('-n', '--num_puzzles', type=int, default=100,
+                       help='Use the first this many puzzles of each corpus (default: 100, '
+                            '0 for all); naive DFS takes ~0.4s per saved extreme puzzle')
+    suite.add_argument('-e', '--engines', nargs='+', default=list(SUITE_ENGINES),
+                       choices=SUITE_ENGINES, help='Engines to run (default: all)')
+    suite.add_argument('--warmup', type=int, default=5,
+                       help='Untimed solves per engine and corpus (default: 5)')
+    suite.add_argument('--repeats', type=int, default=3,
+                       help='Timed solves per puzzle, the fastest counts (default: 3)')
+    suite.add_argument('--max_nodes', type=int, default=200000,
+                       help='Search budget per puzzle of the engines that take one '
+                            '(default: 200000, about 3s of naive DFS)')
+    suite.add_argument('-o', '--output', default=None,
+                       help='Write the run as JSON, to use as a baseline')
+    suite.add_argument('--baseline', default=None,
+                       help='Compare with a run written by --output and fail on regressions')
+    suite.add_argument('--threshold', type=float, default=0.2,
+                       help='Allowed growth of a gated percentile (default: 0.2, i.e. 20%%)')
+
+    args = parser.parse_args()
+
+    if args.command == 'suite':
+        corpora = load_suite_corpora(args.corpora, args.files, args.num_puzzles or None)
+        if not any(corpora.values()):
+            parser.error("No puzzles found")
+        sizes = ', '.join(f'{name} ({len(puzzles)})' for name, puzzles in corpora.items())
+        print(f"\nBenchmark suite: {sizes}, {args.repeats} repeats")
+        print("-" * 50)
+        rows = run_suite(corpora, args.engines, args.warmup, args.repeats, args.max_nodes)
+        print_suite_report(rows)
+        if args.output:
+            run = {'python': platform.python_version(), 'machine': platform.machine(),
+                   'warmup': args.warmup, 'repeats': args.repeats,
+                   'max_nodes': args.max_nodes, 'rows': rows}
+            with open(args.output, 'w') as f:
+                json.dump(run, f, indent=2)
+            print(f"\nRun saved to: {args.output}")
+        if args.baseline:
+            with open(args.baseline) as f:
+                regressions, notes = compare_to_baseline(rows, json.load(f), args.threshold)
+            for note in notes:
+                print(note)
+            if regressions:
+                print(f"\n{len(regressions)} regressions over {args.threshold:.0%} "
+                      f"against {args.baseline}:")
+                for regression in regressions:
+                    print(f"  {regression}")
+                sys.exit(1)
+            print(f"\nNo regressions over {args.threshold:.0%} against {args.baseline}")
+        return
+
+    if args.command == 'scaling':
+        random.seed(args.seed)
+        print(f"\nBenchmarking board sizes {', '.join(f'{b * b}x{b * b}' for b in args.box_sizes)}")
+        print("-" * 50)
+        print_scaling_report(benchmark_scaling(args.box_sizes, args.num_puzzles,
+                                               args.difficulty, args.timeout))
+        return
+
+    puzzles = load_puzzles(args.files, args.num_puzzles)
+    if not puzzles:
+        parser.error("No puzzles found")
+
+    if args.command == 'strategies':
+        print(f"\nBenchmarking strategies on {len(puzzles)} puzzles")
+        print("-" * 50)
+        print_strategy_report(benchmark_strategies(puzzles), len(puzzles))
+
+    elif args.command == 'batch':
+        print(f"\nBenchmarking batch solving on {len(puzzles)} puzzles")
+        print("-" * 50)
+        stats = benchmark_batch(puzzles)
+        for label in ('single', 'batch'):
+            elapsed = stats[f'{label}_time']
+            print(f"{label.capitalize():<8} solved {stats[f'{label}_solved']}/{len(puzzles)} "
+                  f"in {elapsed * 1000:.1f}ms ({len(puzzles) / elapsed:.0f} puzzles/sec)")
+
+    elif args.command == 'restarts':
+        seed = args.seed if args.seed is not None else random.getrandbits(32)
+        print(f"\nBenchmarking restarts on {len(puzzles)} puzzles (seed {seed})")
+        print("-" * 50)
+        print_restart_report(benchmark_restarts(puzzles, seed, args.restart_nodes), len(puzzles))
+
+if __name__ == "__main__":
+    main()
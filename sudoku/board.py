@@ -0,0 +1,244 @@
+"""
+Compact immutable Sudoku board: one byte per cell.
+
+A Board holds the cells of an N²xN² board row-major in a bytes object
+(or a read-only memoryview into a larger buffer, which is kept without
+copying), with 0 for empty cells. Board.parse() accepts everything the
+solvers are handed:
+
+- Board instances, returned as they are
+- strings such as '53..7....6..195...', with '.' or '0' for blanks,
+  '1'-'9' and then 'A'-'P' (any case) for the digits 10-25; whitespace
+  is ignored
+- bytes, bytearray or memoryview holding the cell values, or ASCII text
+  as for strings
+- NumPy arrays of shape (size, size) or (size * size,)
+- lists (or tuples) of rows, or flat lists of the cells
+
+As a sequence a Board behaves like the list of its rows: len(board) is
+the number of rows and board[r][c] reads a cell, so read-only code
+written for List[List[int]] accepts a Board unchanged.
+"""
+from itertools import chain
+from numbers import Integral
+from typing import Any, Iterator, List, Optional, Union
+from .geometry import box_size_of, get_geometry
+
+# Text cell -> value: '0' and '.' are blank, '1'-'9' and 'A'-'P' / 'a'-'p'
+# are 1-25; every other byte maps to 255, which no board accepts
+_TEXT_VALUES = bytearray([255] * 256)
+_TEXT_VALUES[ord('.')] = 0
+for _value in range(10):
+    _TEXT_VALUES[ord('0') + _value] = _value
+for _value in range(10, 26):
+    _TEXT_VALUES[ord('A') + _value - 10] = _value
+    _TEXT_VALUES[ord('a') + _value - 10] = _value
+_TEXT_VALUES = bytes(_TEXT_VALUES)
+
+# Value -> text cell, the inverse for non-blank values
+_VALUE_TEXT = '.123456789ABCDEFGHIJKLMNOP'
+
+# Raw cell buffers never hold a byte this large; larger bytes are text
+_MAX_RAW_VALUE = 25
+
+
+class Board:
+    """
+    Immutable N²xN² board stored as one byte per cell.
+
+    Construct boards with Board.parse() or the from_* constructors, which
+    check the shape and the cell values; Board(cells) trusts its input.
+    validate() checks the givens for conflicts.
+    """
+
+    __slots__ = ('cells', 'box_size', 'size')
+
+    def __init__(self, cells: Union[bytes, memoryview], box_size: Optional[int] = None):
+        """
+        Args:
+            cells: Row-major cell values, 0 for empty cells
+            box_size: Box size, inferred from the number of cells if omitted
+        """
+        if box_size is None:
+            box_size = box_size_of(int(round(len(cells) ** 0.5)))
+        self.cells = cells
+        self.box_size = box_size
+        self.size = box_size * box_size
+
+    @classmethod
+    def parse(cls, board: Any, box_size: Optional[int] = None) -> 'Board':
+        """
+        Board of any supported representation (see the module docstring).
+
+        Args:
+            board: The board to convert
+            box_size: Required box size; by default it follows from the board
+
+        Raises:
+            ValueError: If the shape or the cell values are invalid
+        """
+        if isinstance(board, Board):
+            result = board
+        elif isinstance(board, str):
+            result = cls.from_string(board)
+        elif isinstance(board, (bytes, bytearray, memoryview)):
+            result = cls.from_bytes(board)
+        elif hasattr(board, 'shape') and hasattr(board, 'tobytes'):
+            result = cls.from_array(board)
+        else:
+            result = cls.from_rows(board)
+
+        if box_size is not None and result.box_size != box_size:
+            size = box_size * box_size
+            raise ValueError(f"Input board must be {size}x{size}")
+        return result
+
+    @classmethod
+    def from_string(cls, text: str) -> 'Board':
+        """Board of a string of cells, '.' or '0' for blanks."""
+        try:
+            data = ''.join(text.split()).encode('ascii')
+        except UnicodeEncodeError:
+            raise ValueError("Board strings may only hold '.', digits and letters A-P") from None
+        return cls._from_text(data)
+
+    @classmethod
+    def from_bytes(cls, data: Union[bytes, bytearray, memoryview]) -> 'Board':
+        """
+        Board of a buffer of cell values, or of ASCII text as for strings.
+
+        A read-only memoryview is kept as it is, so slicing records out of
+        a large buffer costs no copy; anything writable is copied.
+        """
+        view = memoryview(data).cast('B') if isinstance(data, memoryview) else data
+        if len(view) and max(view) > _MAX_RAW_VALUE:
+            return cls._from_text(bytes(view).translate(None, b' \t\r\n'))
+        if isinstance(view, bytearray) or (isinstance(view, memoryview) and not view.readonly):
+            view = bytes(view)
+        return cls._checked(view)
+
+    @classmethod
+    def from_array(cls, array: Any) -> 'Board':
+        """Board of a NumPy integer array of shape (size, size) or (size * size,)."""
+        if array.ndim == 2:
+            if array.shape[0] != array.shape[1]:
+                raise ValueError(f"Input board must be square, got shape {array.shape}")
+        elif array.ndim != 1:
+            raise ValueError(f"Input board must be 1 or 2 dimensional, got shape {array.shape}")
+        if array.dtype.kind not in 'iu':
+            raise ValueError("Board values must be integers")
+        if array.size and (array.min() < 0 or array.max() > _MAX_RAW_VALUE):
+            raise ValueError("Board values must be integers from 0 to the board size")
+        return cls._checked(array.astype('uint8').tobytes())
+
+    @classmethod
+    def from_rows(cls, rows: Any) -> 'Board':
+        """Board of a list of rows, such as List[List[int]], or a flat list of cells."""
+        if not isinstance(rows, (list, tuple)):
+            raise ValueError(f"Unsupported board type: {type(rows).__name__}")
+        if rows and all(isinstance(cell, Integral) for cell in rows):
+            try:
+                cells = bytes(rows)
+            except ValueError:
+                raise ValueError("Board values must be integers from 0 to the board size") from None
+            return cls._checked(cells)
+
+        size = box_size_of(len(rows)) ** 2
+        if any(not hasattr(row, '__len__') or len(row) != size for row in rows):
+            raise ValueError(f"Input board must be {size}x{size}")
+        try:
+            # bytes() rejects anything that is not an integer in 0-255
+            cells = bytes(chain.from_iterable(rows))
+        except (TypeError, ValueError):
+            raise ValueError(f"Board values must be integers from 0 to {size}") from None
+        return cls._checked(cells)
+
+    @classmethod
+    def _from_text(cls, data: bytes) -> 'Board':
+        """Board of ASCII cell characters."""
+        cells = data.translate(_TEXT_VALUES)
+        if 255 in cells:
+            raise ValueError("Board strings may only hold '.', digits and letters A-P")
+        return cls._checked(cells)
+
+    @classmethod
+    def _checked(cls, cells: Union[bytes, memoryview]) -> 'Board':
+        """Board of raw cells after checking the cell count and values."""
+        side = int(round(len(cells) ** 0.5))
+        if side * side != len(cells):
+            raise ValueError(f"Board must have a square number of cells, got {len(cells)}")
+        box_size = box_size_of(side)
+        if len(cells) and max(cells) > side:
+            raise ValueError(f"Board values must be integers from 0 to {side}")
+        return cls(cells, box_size)
+
+    def validate(self) -> 'Board':
+        """
+        Check that no digit repeats in a row, column or box.
+
+        One pass over the cells with an occupancy mask per unit.
+
+        Returns:
+            The board itself
+
+        Raises:
+            ValueError: If the givens conflict
+        """
+        geometry = get_geometry(self.box_size)
+        row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        rows, cols, boxes = [0] * self.size, [0] * self.size, [0] * self.size
+        for idx, num in enumerate(self.cells):
+            if num == 0:
+                continue
+            bit = 1 << (num - 1)
+            r, c, b = row_of[idx], col_of[idx], box_of[idx]
+            if (rows[r] | cols[c] | boxes[b]) & bit:
+                raise ValueError("Initial board configuration is invalid")
+            rows[r] |= bit
+            cols[c] |= bit
+            boxes[b] |= bit
+        return self
+
+    @property
+    def clues(self) -> int:
+        """Number of filled cells."""
+        return len(self.cells) - bytes(self.cells).count(0)
+
+    def rows(self) -> List[List[int]]:
+        """The board as a new list of rows."""
+        cells, size = self.cells, self.size
+        return [list(cells[i:i + size]) for i in range(0, len(cells), size)]
+
+    def to_string(self, blank: str = '.') -> str:
+        """Cells as one character each, blank for empty cells."""
+        return ''.join(blank if num == 0 else _VALUE_TEXT[num] for num in self.cells)
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, row: int) -> List[int]:
+        if not -self.size <= row < self.size:
+            raise IndexError("Board row out of range")
+        start = (row % self.size) * self.size
+        return list(self.cells[start:start + self.size])
+
+    def __iter__(self) -> Iterator[List[int]]:
+        return iter(self.rows())
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Board):
+            return NotImplemented
+        return self.box_size == other.box_size and self.cells == other.cells
+
+    def __hash__(self) -> int:
+        return hash(bytes(self.cells))
+
+    def __reduce__(self):
+        # Memoryviews cannot be pickled, so workers receive a bytes copy
+        return (Board, (bytes(self.cells), self.box_size))
+
+    def __str__(self) -> str:
+        return self.to_string()
+
+    def __repr__(self) -> str:
+        return f"Board({self.to_string()!r})"
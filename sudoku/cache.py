@@ -0,0 +1,157 @@
+"""
+Solution cache that also answers isomorphic boards.
+
+Boards that are relabelings, transpositions or row/column permutations of
+each other have the same solution up to the same transformation. Exact
+repeats are answered from an LRU without any canonicalizing. Otherwise
+a cheap orbit fingerprint finds the stored boards that could be
+isomorphic, and only then are canonical forms (sudoku.canonical) compared
+and the stored solution mapped through the inverse transform. A miss
+therefore costs microseconds, not a canonicalization.
+"""
+import dbm
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple, Union
+from .board import Board
+from .canonical import Transform, canonicalize, fingerprint
+
+Grid = List[List[int]]
+
+# Disk keys of the fingerprint index, next to the puzzle -> solution entries
+_INDEX_PREFIX = 'fp:'
+
+
+def _board_key(board: Union[Board, Grid]) -> str:
+    """81-character digit string of a 9x9 board."""
+    if isinstance(board, Board):
+        return board.to_string('0')
+    return ''.join(str(num) for row in board for num in row)
+
+
+def _key_board(key: str) -> Grid:
+    """9x9 board of an 81-character digit string."""
+    return [[int(ch) for ch in key[i:i + 9]] for i in range(0, 81, 9)]
+
+
+def _key_cells(key: str) -> List[int]:
+    """Flat cells of an 81-character digit string."""
+    return [int(ch) for ch in key]
+
+
+class SolutionCache:
+    """
+    LRU of solutions in memory, optionally backed by a dbm file on disk.
+
+    get() and put() take 9x9 boards, as matrices or sudoku.board.Board.
+    A disk-backed cache keeps every solution it is given across runs; only
+    one process should write to the file at a time.
+    """
+
+    def __init__(self, capacity: int = 4096, path: Optional[str] = None):
+        """
+        Args:
+            capacity: Puzzles kept in memory
+            path: dbm file for a persistent cache, None for memory only
+        """
+        self.capacity = capacity
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+
+        # Puzzle -> solution strings, the fingerprint index over them and
+        # the canonical forms computed so far
+        self._entries: 'OrderedDict[str, str]' = OrderedDict()
+        self._index: Dict[str, Set[str]] = {}
+        self._forms: Dict[str, Tuple[str, Transform]] = {}
+        self._disk = dbm.open(path, 'c') if path else None
+
+    def _canonical_form(self, key: str) -> Tuple[str, Transform]:
+        """Canonical form of a puzzle string, computed once per stored puzzle."""
+        form = self._forms.get(key)
+        if form is None:
+            form = canonicalize(_key_cells(key))
+        return form
+
+    def _remember(self, key: str, solution: str, fprint: Optional[str] = None) -> None:
+        """Add an entry to memory, evicting the least recently used one when full."""
+        if key not in self._entries:
+            self._index.setdefault(fprint or fingerprint(_key_cells(key)), set()).add(key)
+        self._entries[key] = solution
+        self._entries.move_to_end(key)
+
+        if len(self._entries) > self.capacity:
+            old, _ = self._entries.popitem(last=False)
+            old_print = fingerprint(_key_cells(old))
+            self._index[old_print].discard(old)
+            if not self._index[old_print]:
+                del self._index[old_print]
+            self._forms.pop(old, None)
+
+    def _load(self, fprint: str) -> None:
+        """Bring stored puzzles with this fingerprint from disk into memory."""
+        if self._disk is None:
+            return
+        listed = self._disk.get(_INDEX_PREFIX + fprint)
+        if listed is None:
+            return
+        for key in listed.decode().split():
+            if key not in self._entries:
+                self._remember(key, self._disk[key].decode(), fprint)
+
+    def get(self, board: Union[Board, Grid]) -> Optional[Grid]:
+        """Solution of board if it or an isomorphic board was stored, else None."""
+        key = _board_key(board)
+        solution = self._entries.get(key)
+        if solution is None and self._disk is not None:
+            value = self._disk.get(key)
+            if value is not None:
+                solution = value.decode()
+                self._remember(key, solution)
+        if solution is not None:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return _key_board(solution)
+
+        fprint = fingerprint(_key_cells(key))
+        self._load(fprint)
+        candidates = self._index.get(fprint)
+        if candidates:
+            canonical, transform = self._canonical_form(key)
+            for other in list(candidates):
+                other_form = self._canonical_form(other)
+                self._forms[other] = other_form
+                if other_form[0] != canonical:
+                    continue
+
+                # Into the shared canonical frame, then back out into ours
+                other_solution = other_form[1].apply(_key_cells(self._entries[other]))
+                solution = ''.join(map(str, transform.invert(other_solution)))
+                self._forms[key] = (canonical, transform)
+                self._remember(key, solution, fprint)
+                self.hits += 1
+                return _key_board(solution)
+
+        self.misses += 1
+        return None
+
+    def put(self, board: Union[Board, Grid], solution: Union[Board, Grid]) -> None:
+        """Store the solution of board."""
+        key = _board_key(board)
+        value = _board_key(solution)
+        fprint = fingerprint(_key_cells(key))
+        self._remember(key, value, fprint)
+
+        if self._disk is not None and key not in self._disk:
+            self._disk[key] = value
+            listed = self._disk.get(_INDEX_PREFIX + fprint)
+            listed = listed.decode() + ' ' + key if listed is not None else key
+            self._disk[_INDEX_PREFIX + fprint] = listed
+
+    def close(self) -> None:
+        """Flush and close the disk store."""
+        if self._disk is not None:
+            self._disk.close()
+            self._disk = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,234 @@
+"""
+Canonical forms of Sudoku boards under the Sudoku symmetry group.
+
+The group is generated by transposition, permutations of the bands, of
+the rows within a band, of the stacks and of the columns within a stack,
+and relabeling of the digits. Boards in the same orbit share a canonical
+form: the lexicographically smallest digit string any transformation can
+reach, with digits relabeled in order of first appearance and empty cells
+(0 / '0') sorting first.
+"""
+from dataclasses import dataclass
+from itertools import permutations
+from operator import itemgetter
+from typing import List, Sequence, Tuple
+from .geometry import NUM_CELLS, SIZE, BOX_SIZE
+
+# Orders of the three units of a band or stack
+_TRIPLE_ORDERS = tuple(permutations(range(BOX_SIZE)))
+
+# Every column order allowed by the group: stacks permuted and columns
+# permuted within each stack. An order is (s0, a0, s1, a1, s2, a2): output
+# stack k takes source stack s_k with its columns in order _TRIPLE_ORDERS[a_k].
+LINE_ORDERS = tuple((s0, a0, s1, a1, s2, a2)
+                    for s0, s1, s2 in _TRIPLE_ORDERS
+                    for a0 in range(6) for a1 in range(6) for a2 in range(6))
+
+
+def line_sequence(order: Tuple[int, ...]) -> Tuple[int, ...]:
+    """Source line of each output position for an entry of LINE_ORDERS."""
+    return tuple(order[2 * k] * BOX_SIZE + _TRIPLE_ORDERS[order[2 * k + 1]][i]
+                 for k in range(BOX_SIZE) for i in range(BOX_SIZE))
+
+
+LINE_SEQUENCES = tuple(line_sequence(order) for order in LINE_ORDERS)
+
+
+@dataclass(frozen=True)
+class Transform:
+    """
+    A symmetry as a cell permutation plus a digit relabeling.
+
+    Output cell i takes source cell cells[i], with digit d written as
+    digits[d] (digits[0] == 0 keeps empty cells empty).
+    """
+    cells: Tuple[int, ...]
+    digits: Tuple[int, ...]
+
+    def apply(self, flat: Sequence[int]) -> List[int]:
+        """Map a flat 81-cell board into the transformed frame."""
+        digits = self.digits
+        return [digits[flat[src]] for src in self.cells]
+
+    def invert(self, flat: Sequence[int]) -> List[int]:
+        """Map a flat 81-cell board from the transformed frame back."""
+        inverse = [0] * (SIZE + 1)
+        for old, new in enumerate(self.digits):
+            inverse[new] = old
+        result = [0] * NUM_CELLS
+        for i, src in enumerate(self.cells):
+            result[src] = inverse[flat[i]]
+        return result
+
+
+def _stack_chunks(mask: int) -> List[List[int]]:
+    """3-bit values of each source stack of a row mask under each column order."""
+    chunks = []
+    for s in range(BOX_SIZE):
+        bits = [(mask >> (SIZE - 1 - (s * BOX_SIZE + i))) & 1 for i in range(BOX_SIZE)]
+        chunks.append([bits[a] << 2 | bits[b] << 1 | bits[c]
+                       for a, b, c in _TRIPLE_ORDERS])
+    return chunks
+
+
+def _min_row_value(mask: int) -> int:
+    """Smallest value a row mask reaches under any column order: empty cells first."""
+    counts = sorted(bin(mask >> (SIZE - BOX_SIZE * (s + 1)) & 7).count('1')
+                    for s in range(BOX_SIZE))
+    return (1 << counts[0]) - 1 << 6 | (1 << counts[1]) - 1 << 3 | (1 << counts[2]) - 1
+
+
+def canonicalize(flat: Sequence[int]) -> Tuple[str, Transform]:
+    """
+    Find the canonical form of a flat 81-cell board.
+
+    Returns:
+        (key, transform): the canonical board as an 81-character digit
+        string, and a Transform with transform.apply(flat) equal to it
+    """
+    # The first output row is relabeled in order of appearance, so only its
+    # clue pattern matters: rows are 9-bit masks with output column 0 as the
+    # most significant bit, and smaller is lexicographically smaller
+    grids, row_masks = {}, {}
+    for transposed in (False, True):
+        if transposed:
+            grid = [flat[c * SIZE + r] for r in range(SIZE) for c in range(SIZE)]
+        else:
+            grid = list(flat)
+        grids[transposed] = grid
+        row_masks[transposed] = [sum(1 << (SIZE - 1 - c) for c in range(SIZE) if grid[r * SIZE + c])
+                                 for r in range(SIZE)]
+
+    # Only rows that can reach the smallest value need every column order
+    best = min(_min_row_value(mask) for masks in row_masks.values() for mask in masks)
+    candidates = []
+    for transposed, grid in grids.items():
+        masks = row_masks[transposed]
+        first_rows = [r for r in _allowed_rows((), masks) if _min_row_value(masks[r]) == best]
+        if not first_rows:
+            continue
+
+        # Column orders differing only in where empty columns go are equivalent
+        empty_columns = 0
+        for c in range(SIZE):
+            if not any(grid[r * SIZE + c] for r in range(SIZE)):
+                empty_columns |= 1 << c
+        orders = range(len(LINE_ORDERS))
+        if empty_columns:
+            seen, orders = set(), []
+            for k, sequence in enumerate(LINE_SEQUENCES):
+                key = tuple(-1 if empty_columns >> c & 1 else c for c in sequence)
+                if key not in seen:
+                    seen.add(key)
+                    orders.append(k)
+
+        for r in first_rows:
+            chunks = _stack_chunks(masks[r])
+            candidates.extend(
+                (transposed, masks, r, LINE_SEQUENCES[k]) for k in orders
+                if chunks[LINE_ORDERS[k][0]][LINE_ORDERS[k][1]] << 6 |
+                chunks[LINE_ORDERS[k][2]][LINE_ORDERS[k][3]] << 3 |
+                chunks[LINE_ORDERS[k][4]][LINE_ORDERS[k][5]] == best)
+
+    # Search states: (transposed, masks, source rows, source columns, labels,
+    # last label used); rows are read through an itemgetter of the columns
+    grid_rows = {t: [tuple(grid[r * SIZE:(r + 1) * SIZE]) for r in range(SIZE)]
+                 for t, grid in grids.items()}
+    states = []
+    for transposed, masks, r, columns in candidates:
+        labels = [0] * (SIZE + 1)
+        label = 0
+        for d in itemgetter(*columns)(grid_rows[transposed][r]):
+            if d:
+                label += 1
+                labels[d] = label
+        states.append((transposed, masks, (r,), itemgetter(*columns), labels, label))
+
+    # Add the remaining rows one at a time, keeping every partial
+    # transformation whose relabeled digits so far are minimal
+    for _ in range(1, SIZE):
+        best = None
+        expanded = []
+        for transposed, masks, rows, pick, labels, label in states:
+            source_rows = grid_rows[transposed]
+            for r in _allowed_rows(rows, masks):
+                values = pick(source_rows[r])
+                row_labels = labels
+                next_label = label
+                for d in values:
+                    if d and not row_labels[d]:
+                        if row_labels is labels:
+                            row_labels = labels[:]
+                        next_label += 1
+                        row_labels[d] = next_label
+                digits = [row_labels[d] for d in values]
+                if best is not None and digits > best:
+                    continue
+                if best is None or digits < best:
+                    best = digits
+                    expanded = []
+                expanded.append((transposed, masks, rows + (r,), pick, row_labels, next_label))
+        states = expanded
+
+    # All survivors give the same board; any of them is the transform
+    transposed, _, rows, pick, labels, label = states[0]
+    source = [r * SIZE + c for r in rows for c in pick(range(SIZE))]
+    if transposed:
+        source = [(i % SIZE) * SIZE + i // SIZE for i in source]
+
+    # Digits missing from the board take the remaining labels
+    labels = labels[:]
+    for d in range(1, SIZE + 1):
+        if not labels[d]:
+            label += 1
+            labels[d] = label
+
+    transform = Transform(tuple(source), tuple(labels))
+    return ''.join(map(str, transform.apply(flat))), transform
+
+
+def _allowed_rows(rows: Tuple[int, ...], masks: List[int]) -> List[int]:
+    """Rows that may come next: the rest of the current band, or any row of a new band."""
+    if len(rows) % BOX_SIZE:
+        band = rows[-1] // BOX_SIZE
+        allowed = [r for r in range(band * BOX_SIZE, band * BOX_SIZE + BOX_SIZE)
+                   if r not in rows]
+    else:
+        used = {r // BOX_SIZE for r in rows}
+        allowed = [r for r in range(SIZE) if r // BOX_SIZE not in used]
+
+    # Empty rows of one band are interchangeable
+    result, empty_bands = [], set()
+    for r in allowed:
+        if not masks[r]:
+            if r // BOX_SIZE in empty_bands:
+                continue
+            empty_bands.add(r // BOX_SIZE)
+        result.append(r)
+    return result
+
+
+def fingerprint(flat: Sequence[int]) -> str:
+    """
+    Cheap invariant of a board's orbit.
+
+    Isomorphic boards always share a fingerprint, so boards with different
+    fingerprints never need canonicalizing to tell them apart. It combines
+    the clue counts of rows and columns grouped by band and stack (sides
+    swapped by transposition are sorted) and the sorted digit frequencies.
+    """
+    row_counts = [0] * SIZE
+    col_counts = [0] * SIZE
+    digit_counts = [0] * (SIZE + 1)
+    for idx, d in enumerate(flat):
+        if d:
+            row_counts[idx // SIZE] += 1
+            col_counts[idx % SIZE] += 1
+            digit_counts[d] += 1
+
+    def side(counts: List[int]) -> Tuple[Tuple[int, ...], ...]:
+        return tuple(sorted(tuple(sorted(counts[b:b + BOX_SIZE]))
+                            for b in range(0, SIZE, BOX_SIZE)))
+
+    sides = sorted((side(row_counts), side(col_counts)))
+    return repr((sides, sorted(digit_counts[1:])))
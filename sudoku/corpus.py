@@ -0,0 +1,610 @@
+"""
+Puzzle corpora on disk, written and read one record at a time.
+
+Two formats hold (puzzle, solution) pairs:
+
+- JSONL: one JSON object per line with the puzzle and the solution as
+  cell strings ('.' for blanks), plus any extra fields. Easy to inspect
+  and to feed to other tools.
+- Binary: a small header (magic, format version, box size) followed by
+  fixed-size records, the puzzle cells then the solution cells at one
+  byte each. Record i sits at a known offset, and reading maps the file
+  into memory, so every Board is a zero-copy view of the file.
+
+Writers consume an iterator of pairs and never hold more than one
+record, so corpora of millions of puzzles stream through flat memory.
+
+The indexed store (format version 2, CorpusStore and StoreWriter) adds to
+every record the clue count, difficulty label, rating, solve stats and a
+hash of the puzzle's canonical form, with secondary indexes by clue count,
+difficulty and canonical hash after the records:
+
+    header          magic, version 2, box size
+    store header    record count, directory offset and length
+    records         puzzle cells, solution cells (zeros if unknown), stats
+    indexes         record numbers per clue count and per difficulty, and
+                    the canonical hashes, sorted, with their record numbers
+    directory       JSON: difficulty names and where each index key lies
+
+Index arrays are little-endian like the headers and are read back as
+memoryviews, so looking up a key never copies or scans the records (on
+big-endian machines each index is byteswapped into a copy on opening).
+"""
+import argparse
+import glob
+import hashlib
+import json
+import math
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import chain
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from .board import Board
+from .canonical import canonicalize
+from .rating import TECHNIQUES, Rating, rate
+
+MAGIC = b'SDKC'
+VERSION = 1
+STORE_VERSION = 2
+
+# Magic, format version, box size
+_HEADER = struct.Struct('<4sHH')
+
+# Store: record count, directory offset, directory length
+_STORE_HEADER = struct.Struct('<QQQ')
+
+# Store record stats after the cells: clues, rating level (-1 unrated),
+# difficulty code, rating nodes, rating score, solve nodes, solve time in
+# seconds and canonical hash (0 when not computed)
+_STATS = struct.Struct('<HbBIdIfQ')
+_NO_DIFFICULTY = 255
+_NO_NODES = 0xFFFFFFFF
+
+# Index arrays are stored little-endian whatever the machine
+_SWAP = sys.byteorder == 'big'
+
+Pair = Tuple[Board, Board]
+
+
+def record_size(box_size: int) -> int:
+    """Bytes per binary record: the puzzle and the solution cells."""
+    return 2 * box_size ** 4
+
+
+def write_jsonl(path: str, pairs: Iterable[Pair],
+                extra: Optional[Dict[str, Any]] = None) -> int:
+    """
+    Write (puzzle, solution) pairs as JSON lines.
+
+    Args:
+        path: Output file, overwritten
+        pairs: Boards, or anything Board.parse accepts
+        extra: Fields added to every line, such as the difficulty
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open(path, 'w', encoding='utf-8') as f:
+        for puzzle, solution in pairs:
+            entry = {'puzzle': Board.parse(puzzle).to_string(),
+                     'solution': Board.parse(solution).to_string()}
+            if extra:
+                entry.update(extra)
+            f.write(json.dumps(entry) + '\n')
+            count += 1
+    return count
+
+
+def read_jsonl(path: str) -> Iterator[Pair]:
+    """Yield the (puzzle, solution) Boards of a JSONL corpus."""
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            if line.strip():
+                entry = json.loads(line)
+                yield Board.from_string(entry['puzzle']), Board.from_string(entry['solution'])
+
+
+def write_binary(path: str, pairs: Iterable[Pair], box_size: int = 3) -> int:
+    """
+    Write (puzzle, solution) pairs as fixed-size binary records.
+
+    Args:
+        path: Output file, overwritten
+        pairs: Boards, or anything Board.parse accepts, all of box_size
+        box_size: Box size of every board
+
+    Returns:
+        Number of records written
+    """
+    count = 0
+    with open(path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, VERSION, box_size))
+        for puzzle, solution in pairs:
+            f.write(Board.parse(puzzle, box_size).cells)
+            f.write(Board.parse(solution, box_size).cells)
+            count += 1
+    return count
+
+
+def read_binary(path: str) -> Iterator[Pair]:
+    """
+    Yield the (puzzle, solution) Boards of a binary corpus.
+
+    The Boards are views of the memory-mapped file: they stay valid while
+    referenced and cost no copy until pickled or converted. Indexed stores
+    are read too; their solution is None where it is unknown.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(_HEADER.size)
+        if len(header) < _HEADER.size:
+            raise ValueError(f"{path} is not a puzzle corpus")
+        magic, version, box_size = _HEADER.unpack(header)
+        if magic != MAGIC:
+            raise ValueError(f"{path} is not a puzzle corpus")
+        if version == STORE_VERSION:
+            yield from ((record.puzzle, record.solution) for record in CorpusStore(path))
+            return
+        if version != VERSION:
+            raise ValueError(f"Unsupported corpus version {version}")
+        size = f.seek(0, 2)
+        if size == _HEADER.size:
+            return
+        data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+
+    cells = box_size ** 4
+    # A record cut short by an interrupted writer is ignored
+    for offset in range(_HEADER.size, size - record_size(box_size) + 1, record_size(box_size)):
+        yield (Board(data[offset:offset + cells], box_size),
+               Board(data[offset + cells:offset + 2 * cells], box_size))
+
+
+def write_corpus(path: str, pairs: Iterable[Pair], box_size: int = 3,
+                 extra: Optional[Dict[str, Any]] = None) -> int:
+    """Write a JSONL corpus if path ends in .jsonl, else a binary one; returns the record count."""
+    if path.endswith('.jsonl'):
+        return write_jsonl(path, pairs, extra)
+    return write_binary(path, pairs, box_size)
+
+
+def read_corpus(path: str) -> Iterator[Pair]:
+    """Yield the (puzzle, solution) Boards of a JSONL or binary corpus, by file extension."""
+    if path.endswith('.jsonl'):
+        return read_jsonl(path)
+    return read_binary(path)
+
+
+def canonical_hash(puzzle: Any) -> int:
+    """
+    64-bit hash of the canonical form of a 9x9 puzzle, never 0.
+
+    Isomorphic puzzles share it. Computing it canonicalizes the puzzle,
+    which takes milliseconds.
+    """
+    form = canonicalize(Board.parse(puzzle, 3).cells)[0]
+    digest = hashlib.blake2b(form.encode(), digest_size=8).digest()
+    return int.from_bytes(digest, 'little') or 1
+
+
+@dataclass(frozen=True)
+class Record:
+    """
+    One puzzle of an indexed store.
+
+    solution is None when unknown, rating None when unrated, nodes and
+    solve_time None when no solve was recorded and canonical 0 when the
+    canonical hash was not computed.
+    """
+    puzzle: Board
+    solution: Optional[Board]
+    clues: int
+    difficulty: Optional[str]
+    rating: Optional[Rating]
+    nodes: Optional[int]
+    solve_time: Optional[float]
+    canonical: int
+
+
+def _read_store_header(f, path: str) -> Tuple[int, int, int, int]:
+    """Box size, record count, directory offset and length of an open store."""
+    header = f.read(_HEADER.size + _STORE_HEADER.size)
+    if len(header) < _HEADER.size:
+        raise ValueError(f"{path} is not a puzzle corpus")
+    magic, version, box_size = _HEADER.unpack_from(header)
+    if magic != MAGIC:
+        raise ValueError(f"{path} is not a puzzle corpus")
+    if version != STORE_VERSION:
+        raise ValueError(f"{path} is not an indexed store (corpus version {version})")
+    return (box_size,) + _STORE_HEADER.unpack_from(header, _HEADER.size)
+
+
+class CorpusStore:
+    """
+    Indexed store of puzzles, memory-mapped and read-only.
+
+    Opening a store, reading record i and looking up the record numbers of
+    a clue count or difficulty take constant time whatever its size;
+    records are views of the file until converted. A canonical hash lookup
+    is a binary search. The file stays mapped while the store or any Board
+    read from it is referenced.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self.box_size, self._count, offset, length = _read_store_header(f, path)
+            self._data = memoryview(mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ))
+        self._cells = self.box_size ** 4
+        self._record_size = record_size(self.box_size) + _STATS.size
+        self._start = _HEADER.size + _STORE_HEADER.size
+
+        if length:
+            directory = json.loads(bytes(self._data[offset:offset + length]))
+        else:
+            # The writer was interrupted: its whole records are readable,
+            # without indexes or difficulty names
+            self._count = (len(self._data) - self._start) // self._record_size
+            directory = {'difficulties': [], 'clues': {}, 'difficulty': {}, 'canonical': [0, 0]}
+        self._difficulties: List[str] = directory['difficulties']
+        self._by_clues = {int(key): self._ids(*entry) for key, entry in directory['clues'].items()}
+        self._by_difficulty = {key: self._ids(*entry) for key, entry in directory['difficulty'].items()}
+        offset, count = directory['canonical']
+        self._hashes = self._index(offset, count, 'Q')
+        self._hash_ids = self._ids(offset + 8 * count, count)
+
+    def _index(self, offset: int, count: int, typecode: str) -> Sequence[int]:
+        """Index array at offset, a view of the file on little-endian machines."""
+        view = self._data[offset:offset + array(typecode).itemsize * count].cast(typecode)
+        if not _SWAP:
+            return view
+        values = array(typecode, view)
+        values.byteswap()
+        return values
+
+    def _ids(self, offset: int, count: int) -> Sequence[int]:
+        """Record numbers of one index entry."""
+        return self._index(offset, count, 'I')
+
+    def __len__(self) -> int:
+        return self._count
+
+    def _offset(self, index: int) -> int:
+        """File offset of record index, counting from the end if negative."""
+        if not -self._count <= index < self._count:
+            raise IndexError("Store record out of range")
+        return self._start + (index % self._count) * self._record_size
+
+    def puzzle(self, index: int) -> Board:
+        """Puzzle of record index, a view of the file."""
+        offset = self._offset(index)
+        return Board(self._data[offset:offset + self._cells], self.box_size)
+
+    def solution(self, index: int) -> Optional[Board]:
+        """Solution of record index, None if unknown."""
+        offset = self._offset(index) + self._cells
+        cells = self._data[offset:offset + self._cells]
+        return Board(cells, self.box_size) if cells[0] else None
+
+    def __getitem__(self, index: int) -> Record:
+        offset = self._offset(index)
+        clues, level, code, rating_nodes, score, nodes, solve_time, canonical = \
+            _STATS.unpack_from(self._data, offset + 2 * self._cells)
+        return Record(
+            self.puzzle(index), self.solution(index), clues,
+            self._difficulties[code] if code < len(self._difficulties) else None,
+            None if level < 0 else Rating(TECHNIQUES[level], level, rating_nodes, score),
+            None if nodes == _NO_NODES else nodes,
+            None if math.isnan(solve_time) else solve_time,
+            canonical
+        )
+
+    def __iter__(self) -> Iterator[Record]:
+        for index in range(self._count):
+            yield self[index]
+
+    def select(self, indexes: Iterable[int]) -> Iterator[Record]:
+        """Yield the records of the given record numbers, such as an index lookup."""
+        for index in indexes:
+            yield self[index]
+
+    def clue_counts(self) -> Dict[int, int]:
+        """Number of records per clue count."""
+        return {clues: len(ids) for clues, ids in sorted(self._by_clues.items())}
+
+    def difficulties(self) -> Dict[str, int]:
+        """Number of records per difficulty label."""
+        return {name: len(ids) for name, ids in self._by_difficulty.items()}
+
+    def by_clues(self, clues: int) -> Sequence[int]:
+        """Record numbers of the puzzles with this many clues, ascending."""
+        return self._by_clues.get(clues, ())
+
+    def by_difficulty(self, difficulty: str) -> Sequence[int]:
+        """Record numbers of the puzzles with this difficulty label, ascending."""
+        return self._by_difficulty.get(difficulty, ())
+
+    def distinct(self) -> int:
+        """Number of distinct puzzles up to isomorphism among the hashed ones."""
+        return len(set(self._hashes))
+
+    def by_canonical(self, puzzle: Union[int, Any]) -> List[int]:
+        """
+        Record numbers of the puzzles isomorphic to puzzle.
+
+        Takes a canonical hash or a 9x9 puzzle to hash. Puzzles stored
+        without a hash are never found.
+        """
+        key = puzzle if isinstance(puzzle, int) else canonical_hash(puzzle)
+        low = bisect_left(self._hashes, key)
+        return sorted(self._hash_ids[low:bisect_right(self._hashes, key, low)])
+
+
+class StoreWriter:
+    """
+    Write an indexed store one record at a time.
+
+    Use it as a context manager, or call close(): the indexes are written
+    on close. Records are streamed to disk, and only the index entries
+    (a dozen bytes per record) are held in memory. Appending rewrites the
+    indexes, so stores opened on the file before must be reopened.
+    """
+
+    def __init__(self, path: str, box_size: int = 3, append: bool = False,
+                 canonical: Optional[bool] = None):
+        """
+        Args:
+            path: Store file, overwritten unless appending
+            box_size: Box size of every board
+            append: Add to the store at path if it exists
+            canonical: Hash the canonical form of every puzzle for the
+                canonical index (milliseconds per puzzle); by default
+                for 9x9 boards, the only size it supports
+        """
+        self.path = path
+        self.box_size = box_size
+        self.canonical = box_size == 3 if canonical is None else canonical
+        if self.canonical and box_size != 3:
+            raise ValueError("Canonical hashes need 9x9 boards")
+        self.count = 0
+        self._difficulties: List[str] = []
+        self._by_clues: Dict[int, array] = {}
+        self._by_difficulty: Dict[str, array] = {}
+        self._hashes: List[Tuple[int, int]] = []
+
+        if append and os.path.exists(path):
+            self._file = open(path, 'r+b')
+            self._load_indexes()
+        else:
+            self._file = open(path, 'wb')
+            self._file.write(_HEADER.pack(MAGIC, STORE_VERSION, box_size))
+            self._file.write(_STORE_HEADER.pack(0, 0, 0))
+
+    def _load_indexes(self) -> None:
+        """Read the indexes of the open store and truncate them, to rewrite on close."""
+        f = self._file
+        box_size, self.count, offset, length = _read_store_header(f, self.path)
+        if box_size != self.box_size:
+            raise ValueError(f"{self.path} holds {box_size ** 2}x{box_size ** 2} boards")
+        if not length and f.seek(0, 2) > _HEADER.size + _STORE_HEADER.size:
+            raise ValueError(f"{self.path} was not closed by its writer and has no indexes")
+        if length:
+            f.seek(offset)
+            directory = json.loads(f.read(length))
+            self._difficulties = directory['difficulties']
+
+            def ids(offset: int, count: int) -> array:
+                f.seek(offset)
+                values = array('I')
+                values.frombytes(f.read(4 * count))
+                if _SWAP:
+                    values.byteswap()
+                return values
+
+            self._by_clues = {int(key): ids(*entry) for key, entry in directory['clues'].items()}
+            self._by_difficulty = {key: ids(*entry) for key, entry in directory['difficulty'].items()}
+            offset, count = directory['canonical']
+            hashes = array('Q')
+            f.seek(offset)
+            hashes.frombytes(f.read(8 * count))
+            if _SWAP:
+                hashes.byteswap()
+            self._hashes = list(zip(hashes, ids(offset + 8 * count, count)))
+        f.seek(_HEADER.size + _STORE_HEADER.size
+               + self.count * (record_size(box_size) + _STATS.size))
+        f.truncate()
+
+    def add(self, puzzle: Any, solution: Any = None, difficulty: Optional[str] = None,
+            rating: Optional[Rating] = None, nodes: Optional[int] = None,
+            solve_time: Optional[float] = None) -> int:
+        """
+        Append one record; returns its record number.
+
+        Args:
+            puzzle: The puzzle, as anything Board.parse accepts
+            solution: Its solution, None if unknown
+            difficulty: Label to index the record by, such as 'extreme'
+            rating: sudoku.rating.Rating of the puzzle
+            nodes: Search nodes of the recorded solve
+            solve_time: Seconds of the recorded solve
+        """
+        puzzle = Board.parse(puzzle, self.box_size)
+        cells = bytes(puzzle.cells)
+        if solution is None:
+            solution_cells = bytes(len(cells))
+        else:
+            solution_cells = bytes(Board.parse(solution, self.box_size).cells)
+        clues = len(cells) - cells.count(0)
+
+        code = _NO_DIFFICULTY
+        if difficulty is not None:
+            if difficulty not in self._difficulties:
+                if len(self._difficulties) == _NO_DIFFICULTY:
+                    raise ValueError(f"A store holds at most {_NO_DIFFICULTY} difficulties")
+                self._difficulties.append(difficulty)
+            code = self._difficulties.index(difficulty)
+        canonical = canonical_hash(puzzle) if self.canonical else 0
+
+        self._file.write(cells)
+        self._file.write(solution_cells)
+        self._file.write(_STATS.pack(
+            clues,
+            -1 if rating is None else rating.level,
+            code,
+            0 if rating is None else min(rating.nodes, _NO_NODES - 1),
+            math.nan if rating is None else rating.score,
+            _NO_NODES if nodes is None else min(nodes, _NO_NODES - 1),
+            math.nan if solve_time is None else solve_time,
+            canonical
+        ))
+
+        index = self.count
+        self.count += 1
+        self._by_clues.setdefault(clues, array('I')).append(index)
+        if difficulty is not None:
+            self._by_difficulty.setdefault(difficulty, array('I')).append(index)
+        if canonical:
+            self._hashes.append((canonical, index))
+        return index
+
+    def close(self) -> None:
+        """Write the indexes and the directory, and close the file."""
+        f = self._file
+        if f.closed:
+            return
+
+        def write_array(values: array) -> None:
+            if _SWAP:
+                values = array(values.typecode, values)
+                values.byteswap()
+            f.write(values.tobytes())
+
+        def write_ids(ids: array) -> List[int]:
+            entry = [f.tell(), len(ids)]
+            write_array(ids)
+            return entry
+
+        # Keep the arrays aligned for memoryview casts
+        f.write(bytes(-f.tell() % 8))
+        self._hashes.sort()
+        hashes_at = f.tell()
+        write_array(array('Q', (key for key, _ in self._hashes)))
+        write_array(array('I', (index for _, index in self._hashes)))
+        directory = {
+            'difficulties': self._difficulties,
+            'canonical': [hashes_at, len(self._hashes)],
+            'clues': {str(clues): write_ids(ids) for clues, ids in sorted(self._by_clues.items())},
+            'difficulty': {name: write_ids(ids) for name, ids in self._by_difficulty.items()},
+        }
+        data = json.dumps(directory).encode()
+        offset = f.tell()
+        f.write(data)
+        f.seek(_HEADER.size)
+        f.write(_STORE_HEADER.pack(self.count, offset, len(data)))
+        f.close()
+
+    def __enter__(self) -> 'StoreWriter':
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def import_json(paths: Sequence[str], path: str, append: bool = False,
+                rated: bool = False, canonical: Optional[bool] = None) -> int:
+    """
+    Import puzzle files into an indexed store.
+
+    Reads the JSON files written by SudokuTester.save_puzzles, with their
+    difficulty, solutions and solve stats, and JSONL or binary corpora.
+
+    Args:
+        paths: Files or glob patterns, imported in sorted order
+        path: Store file
+        append: Add to the store at path if it exists
+        rated: Rate every 9x9 puzzle (see sudoku.rating); an extreme
+            puzzle takes about 0.1s
+        canonical: Hash canonical forms (see StoreWriter)
+
+    Returns:
+        Number of records imported
+    """
+    filenames = [name for pattern in paths for name in sorted(glob.glob(pattern))]
+    writer = None
+    count = 0
+    try:
+        for filename in filenames:
+            if filename.endswith('.json'):
+                with open(filename) as f:
+                    data = json.load(f)
+                metadata = data.get('metadata', {})
+                difficulty = metadata.get('difficulty')
+                box_size = metadata.get('box_size', 3)
+                entries = ((entry['puzzle'], entry.get('solution'), entry.get('solve_attempts'),
+                            entry.get('solve_time_ms')) for entry in data['puzzles'])
+            else:
+                difficulty = None
+                pairs = read_corpus(filename)
+                first = next(pairs, None)
+                if first is None:
+                    continue
+                box_size = first[0].box_size
+                entries = ((puzzle, solution, None, None)
+                           for puzzle, solution in chain([first], pairs))
+
+            if writer is None:
+                writer = StoreWriter(path, box_size, append, canonical)
+            elif box_size != writer.box_size:
+                raise ValueError(f"{filename} holds {box_size ** 2}x{box_size ** 2} boards")
+            for puzzle, solution, nodes, solve_ms in entries:
+                rating = rate(puzzle) if rated and box_size == 3 and solution else None
+                writer.add(puzzle, solution, difficulty, rating, nodes,
+                           None if solve_ms is None else solve_ms / 1000)
+                count += 1
+    finally:
+        if writer is not None:
+            writer.close()
+    return count
+
+
+def main():
+    """Command line interface: build and inspect indexed stores."""
+    parser = argparse.ArgumentParser(description='Indexed Sudoku puzzle stores')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    importer = commands.add_parser('import', help='Import puzzle files into a store')
+    importer.add_argument('store', help='Store file')
+    importer.add_argument('files', nargs='+',
+                          help='JSON files of the tester, JSONL or binary corpora, or glob patterns')
+    importer.add_argument('--append', action='store_true', help='Add to an existing store')
+    importer.add_argument('--rate', action='store_true', help='Rate every 9x9 puzzle')
+    importer.add_argument('--no-canonical', dest='canonical', action='store_false', default=None,
+                          help='Skip the canonical hashes, about 10ms per puzzle')
+
+    info = commands.add_parser('info', help='Print the index sizes of a store')
+    info.add_argument('store', help='Store file')
+    args = parser.parse_args()
+
+    if args.command == 'import':
+        count = import_json(args.files, args.store, args.append, args.rate, args.canonical)
+        print(f"Imported {count} puzzles into {args.store}")
+        return
+
+    store = CorpusStore(args.store)
+    size = store.box_size ** 2
+    unique = store.distinct()
+    print(f"{args.store}: {len(store)} {size}x{size} puzzles, "
+          f"{unique} distinct up to isomorphism" if unique else
+          f"{args.store}: {len(store)} {size}x{size} puzzles")
+    print("By difficulty: " + ", ".join(f"{name} {count}"
+                                        for name, count in store.difficulties().items()))
+    print("By clues: " + ", ".join(f"{clues} {count}"
+                                   for clues, count in store.clue_counts().items()))
+
+
+if __name__ == "__main__":
+    main()
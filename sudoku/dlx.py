@@ -0,0 +1,273 @@
+import time
+from typing import Dict, Iterator, List, Optional, Tuple
+from .geometry import NUM_CELLS, SIZE, STANDARD, Geometry, get_geometry
+
+# Exact cover formulation: one row per (cell, digit) candidate and one column
+# per constraint. Row id = cell * size + (digit - 1); the four columns of a row
+# are "cell is filled", "row has digit", "column has digit", "box has digit".
+# Sizes of the standard 9x9 matrix:
+NUM_ROWS = NUM_CELLS * SIZE
+NUM_COLUMNS = 4 * NUM_CELLS
+
+
+def row_columns(row_id: int, geometry: Geometry = STANDARD) -> Tuple[int, int, int, int]:
+    """Constraint columns covered by a (cell, digit) row."""
+    size, num_cells = geometry.size, geometry.num_cells
+    idx, digit = divmod(row_id, size)
+    return (idx,
+            num_cells + geometry.row_of[idx] * size + digit,
+            2 * num_cells + geometry.col_of[idx] * size + digit,
+            3 * num_cells + geometry.box_of[idx] * size + digit)
+
+
+class ExactCoverMatrix:
+    """
+    Dancing Links (Algorithm X) over the full Sudoku matrix: 729 x 324 for
+    9x9 boards, size³ x 4·size² in general.
+
+    The matrix is built once. A search covers the rows of the given clues,
+    searches, then uncovers everything again, so one instance is reused
+    across any number of puzzles without rebuilding. Nodes live in flat
+    lists: index 0 is the root, 1..4·size² are column headers.
+    """
+
+    def __init__(self, box_size: int = 3):
+        """Build the node lists for every (cell, digit) candidate row."""
+        self.geometry = geometry = get_geometry(box_size)
+        num_rows = geometry.num_cells * geometry.size
+        num_columns = 4 * geometry.num_cells
+        header_count = num_columns + 1
+        self.left = [i - 1 for i in range(header_count)]
+        self.right = [i + 1 for i in range(header_count)]
+        self.left[0], self.right[num_columns] = num_columns, 0
+        self.up = list(range(header_count))
+        self.down = list(range(header_count))
+        self.column = list(range(header_count))
+        self.row_of_node = [-1] * header_count
+        self.size = [0] * header_count
+
+        # Progress of the current or last search
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.forced = 0
+        self.complete = True
+        self._searching = False
+
+        # First node of every row, so clues can be selected directly
+        self.row_head = []
+        for row_id in range(num_rows):
+            first = len(self.column)
+            self.row_head.append(first)
+            for k, col in enumerate(row_columns(row_id, geometry)):
+                node = first + k
+                col += 1  # Header indices start at 1
+                self.left.append(first + (k - 1) % 4)
+                self.right.append(first + (k + 1) % 4)
+                self.column.append(col)
+                self.row_of_node.append(row_id)
+                # Append at the bottom of the column
+                self.up.append(self.up[col])
+                self.down.append(col)
+                self.down[self.up[col]] = node
+                self.up[col] = node
+                self.size[col] += 1
+
+    @property
+    def busy(self) -> bool:
+        """True while a search holds the matrix."""
+        return self._searching
+
+    def _cover(self, col: int) -> None:
+        """Remove a column and every row that intersects it."""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        right[left[col]] = right[col]
+        left[right[col]] = left[col]
+        i = down[col]
+        while i != col:
+            j = right[i]
+            while j != i:
+                down[up[j]] = down[j]
+                up[down[j]] = up[j]
+                size[column[j]] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, col: int) -> None:
+        """Undo _cover in exactly the reverse order."""
+        left, right, up, down = self.left, self.right, self.up, self.down
+        column, size = self.column, self.size
+        i = up[col]
+        while i != col:
+            j = left[i]
+            while j != i:
+                size[column[j]] += 1
+                down[up[j]] = j
+                up[down[j]] = j
+                j = left[j]
+            i = up[i]
+        right[left[col]] = col
+        left[right[col]] = col
+
+    def _select(self, node: int) -> None:
+        """Cover the other columns of the row holding node."""
+        j = self.right[node]
+        while j != node:
+            self._cover(self.column[j])
+            j = self.right[j]
+
+    def _unselect(self, node: int) -> None:
+        """Undo _select."""
+        j = self.left[node]
+        while j != node:
+            self._uncover(self.column[j])
+            j = self.left[j]
+
+    def solve(self, cells: List[int], limit: int = 1, max_nodes: Optional[int] = None,
+              stop_at: Optional[float] = None) -> Tuple[List[List[int]], int, bool]:
+        """
+        Find up to limit solutions of a flat row-major board (0 = empty).
+
+        Args:
+            cells: Row-major board values
+            limit: Stop after this many solutions
+            max_nodes: Give up after this many search nodes
+            stop_at: Give up once time.perf_counter() passes this value
+
+        Returns:
+            (solutions, nodes, complete): solutions as flat lists,
+            the number of search nodes, and False if a budget ran out
+            before the search finished
+        """
+        solutions = []
+        search = self.search(cells, max_nodes, stop_at)
+        for solution in search:
+            solutions.append(solution)
+            if len(solutions) >= limit:
+                break
+        search.close()
+        return solutions, self.nodes, self.complete
+
+    def search(self, cells: List[int], max_nodes: Optional[int] = None,
+               stop_at: Optional[float] = None) -> Iterator[List[int]]:
+        """
+        Yield the solutions of a flat row-major board (0 = empty) one at a time.
+
+        The node count so far is kept in self.nodes, along with the rows
+        taken back (self.backtracks), the deepest level reached
+        (self.max_depth) and the rows chosen from a column with no
+        alternative (self.forced). self.complete turns False if a budget ran
+        out before the search finished. The matrix is
+        restored when the generator finishes or is closed; only one search
+        can run on a matrix at a time.
+        """
+        if self._searching:
+            raise RuntimeError("Another search is still running on this matrix")
+        self._searching = True
+        self.nodes = 0
+        self.backtracks = 0
+        self.max_depth = 0
+        self.forced = 0
+        self.complete = True
+        num_digits = self.geometry.size
+        given = []   # Clue rows covered before the search
+        chosen = []  # Rows picked by the search, one per level
+
+        try:
+            # Cover the givens; a clue whose column is already gone conflicts
+            for idx, num in enumerate(cells):
+                if num:
+                    node = self.row_head[idx * num_digits + num - 1]
+                    if any(self.left[self.right[col + 1]] != col + 1
+                           for col in row_columns(idx * num_digits + num - 1, self.geometry)):
+                        return
+                    self._cover(self.column[node])
+                    self._select(node)
+                    given.append(node)
+
+            right, down, size, column = self.right, self.down, self.size, self.column
+            forward = True
+            while True:
+                if forward:
+                    self.nodes += 1
+                    if (max_nodes is not None and self.nodes > max_nodes) or \
+                       (stop_at is not None and time.perf_counter() > stop_at):
+                        self.nodes -= 1
+                        self.complete = False
+                        return
+
+                    if right[0] == 0:
+                        # Every constraint covered: report the solution
+                        solution = cells[:]
+                        for node in chosen:
+                            idx, digit = divmod(self.row_of_node[node], num_digits)
+                            solution[idx] = digit + 1
+                        yield solution
+                        forward = False
+                    else:
+                        # Choose the column with the fewest rows left
+                        col, best = right[0], size[right[0]]
+                        j = right[col]
+                        while j != 0 and best > 1:
+                            if size[j] < best:
+                                col, best = j, size[j]
+                            j = right[j]
+                        self._cover(col)
+                        node = down[col]
+                        if node == col:
+                            self._uncover(col)
+                            forward = False
+                        else:
+                            chosen.append(node)
+                            self._select(node)
+                            if best == 1:
+                                self.forced += 1
+                            if len(chosen) > self.max_depth:
+                                self.max_depth = len(chosen)
+                            continue
+
+                # Backtrack to the next row of the deepest open column
+                while chosen:
+                    node = chosen.pop()
+                    self._unselect(node)
+                    self.backtracks += 1
+                    col = column[node]
+                    node = down[node]
+                    if node != col:
+                        chosen.append(node)
+                        self._select(node)
+                        forward = True
+                        break
+                    self._uncover(col)
+                if not forward:
+                    return
+        finally:
+            # Leave the matrix exactly as built for the next search
+            while chosen:
+                node = chosen.pop()
+                self._unselect(node)
+                self._uncover(self.column[node])
+            while given:
+                node = given.pop()
+                self._unselect(node)
+                self._uncover(self.column[node])
+            self._searching = False
+
+
+_matrices: Dict[int, ExactCoverMatrix] = {}
+
+
+def get_matrix(box_size: int = 3) -> ExactCoverMatrix:
+    """
+    Shared matrix per board size, built on first use and reused by every solve.
+
+    While a search still holds the shared matrix, such as an enumeration
+    that was not run to the end, the caller gets a private matrix instead.
+    """
+    matrix = _matrices.get(box_size)
+    if matrix is None:
+        matrix = _matrices[box_size] = ExactCoverMatrix(box_size)
+    elif matrix.busy:
+        return ExactCoverMatrix(box_size)
+    return matrix
@@ -1,8 +1,19 @@
+import argparse
 import random
 import time
-from typing import List, Tuple, Optional
-from copy import deepcopy
-from .solver import SudokuSolver
+from itertools import chain
+from typing import Any, Dict, Iterator, List, Tuple, Optional
+from .board import Board
+from .solver import SOLVED, UNSOLVABLE, SudokuSolver
+from .rating import BANDS, SEARCH, Rating, RatingCache, rate
+from . import corpus, parallel
+
+# Outcomes of SudokuGenerator.check_uniqueness; puzzles without any
+# solution are reported as solver.UNSOLVABLE
+UNIQUE = 'unique'
+MULTIPLE = 'multiple'
+UNKNOWN = 'unknown'
+
 
 class SudokuGenerator:
     """Generate random Sudoku puzzles with varying difficulty."""
@@ -33,132 +44,527 @@ class SudokuGenerator:
     ]
 
     @staticmethod
-    def has_unique_solution(puzzle: List[List[int]], time_limit: float = 0.1) -> bool:
-        """Check if puzzle has exactly one solution within time limit."""
-        start_time = time.time()
-        
-        # First solution
-        board_copy = [row[:] for row in puzzle]
-        solver = SudokuSolver(board_copy)
-        if not solver.solve():
-            return False
-            
-        # Quick check for second solution
-        board_copy = [row[:] for row in puzzle]
-        solver = SudokuSolver(board_copy)
-        
-        def find_empty() -> Optional[Tuple[int, int]]:
-            """Find an empty cell."""
-            for i in range(9):
-                for j in range(9):
-                    if board_copy[i][j] == 0:
-                        return (i, j)
-            return None
-        
-        # Use stack instead of recursion
-        stack = []
-        empty = find_empty()
-        if empty:
-            row, col = empty
-            for num in range(1, 10):
-                if solver.is_valid(num, (row, col)):
-                    stack.append((row, col, num, 1))  # 1 means first try
-        
-        while stack:
-            if time.time() - start_time > time_limit:
-                return False
-                
-            row, col, num, state = stack.pop()
-            
-            if state == 1:  # First try of this number
-                board_copy[row][col] = num
-                empty = find_empty()
-                
-                if not empty:  # Found second solution
-                    return False
-                    
-                next_row, next_col = empty if empty else (-1, -1)
-                # Push backtrack state
-                stack.append((row, col, num, 2))  # 2 means need to backtrack
-                
-                # Push next empty cell possibilities
-                if empty:
-                    for next_num in range(1, 10):
-                        if solver.is_valid(next_num, (next_row, next_col)):
-                            stack.append((next_row, next_col, next_num, 1))
-                            
-            else:  # Backtrack
-                board_copy[row][col] = 0
-                
-        return True
+    def check_uniqueness(puzzle: Any, max_nodes: Optional[int] = None,
+                         time_limit: Optional[float] = None) -> str:
+        """
+        Whether puzzle has exactly one solution, within a search budget.
+
+        Counts solutions up to the second, so a puzzle with several is
+        settled as soon as two are found.
+
+        Args:
+            puzzle: A matrix, sudoku.board.Board or anything Board.parse accepts
+            max_nodes: Give up after visiting this many search nodes
+            time_limit: Give up after this many seconds
+
+        Returns:
+            UNIQUE, MULTIPLE, UNSOLVABLE (also for conflicting givens), or
+            UNKNOWN if the budget ran out before the answer was proven
+        """
+        try:
+            solver = SudokuSolver(puzzle)
+        except ValueError:
+            return UNSOLVABLE
+        count = solver.count_solutions(2, max_nodes, time_limit)
+        if count == 2:
+            return MULTIPLE
+        if solver.result.budget_exceeded:
+            return UNKNOWN
+        return UNIQUE if count == 1 else UNSOLVABLE
+
+    @staticmethod
+    def has_unique_solution(puzzle: Any, time_limit: float = 0.1) -> Optional[bool]:
+        """
+        Check if puzzle (a matrix or a sudoku.board.Board) has exactly one solution within time limit.
+
+        Returns None, not False, when the time limit runs out before the
+        answer is known.
+        """
+        status = SudokuGenerator.check_uniqueness(puzzle, time_limit=time_limit)
+        return None if status == UNKNOWN else status == UNIQUE
+
+    # Cells removed from a 9x9 board per difficulty; other sizes remove
+    # the same share of cells
+    HOLES = {
+        0.3: 30,  # easy - remove 30 numbers
+        0.5: 40,  # medium - remove 40 numbers
+        0.7: 50,  # hard - remove 50 numbers
+        0.9: 55   # extreme - remove 55 numbers
+    }
+
+    # How solved_board() draws a grid: shuffle the base pattern, or search
+    SOLVED_BOARD_METHODS = ('pattern', 'search')
+
+    @staticmethod
+    def solved_board(box_size: int = 3, method: str = 'pattern',
+                     rng: Optional[random.Random] = None) -> Optional[List[List[int]]]:
+        """
+        Generate a completely solved Sudoku board with box_size x box_size boxes.
+
+        'pattern' (default) fills the cells of a fixed base pattern through
+        random band, stack, row and column permutations, digit relabeling
+        and transposition: one pass over the cells, no search, and never
+        fails. Every grid those transformations reach from the base is
+        equally likely, but they reach only a small share of all grids.
+        'search' completes randomly filled diagonal boxes with a randomized
+        DFS, which can produce any grid, when that matters more than speed.
+
+        Args:
+            box_size: 3 for 9x9 boards, 2 for 4x4, 4 for 16x16, 5 for 25x25
+            method: 'pattern' or 'search'
+            rng: Random number generator, the random module by default
+
+        Returns:
+            The board, or None if the search found no solution
+        """
+        if method not in SudokuGenerator.SOLVED_BOARD_METHODS:
+            raise ValueError(f"method must be one of {SudokuGenerator.SOLVED_BOARD_METHODS}")
+        rng = rng or random
+        if method == 'search':
+            return SudokuGenerator._search_solved_board(box_size, rng)
+
+        size = box_size * box_size
+
+        def shuffled(values):
+            values = list(values)
+            rng.shuffle(values)
+            return values
+
+        def line_order():
+            # Bands (stacks) in random order, lines within each in random order
+            return [band * box_size + line for band in shuffled(range(box_size))
+                    for line in shuffled(range(box_size))]
+
+        rows, cols = line_order(), line_order()
+        if rng.random() < 0.5:
+            rows, cols = cols, rows  # Transposition swaps the roles of rows and columns
+        digits = shuffled(range(1, size + 1))
+
+        # Base pattern: row r is the digit sequence shifted by box_size per
+        # row of a band and by one per band, which is a valid grid
+        return [[digits[(box_size * (r % box_size) + r // box_size + c) % size] for c in cols]
+                for r in rows]
 
     @staticmethod
-    def _generate_solved_board() -> Optional[List[List[int]]]:
-        """Generate a completely solved Sudoku board."""
+    def _search_solved_board(box_size: int, rng: Any) -> Optional[List[List[int]]]:
+        """Solved board of a randomized DFS from randomly filled diagonal boxes."""
+        size = box_size * box_size
+
         def fill_diagonal_boxes():
-            for i in range(0, 9, 3):
-                nums = list(range(1, 10))
-                random.shuffle(nums)
-                for r in range(3):
-                    for c in range(3):
-                        board[i + r][i + c] = nums[r * 3 + c]
-
-        board = [[0] * 9 for _ in range(9)]
-        fill_diagonal_boxes()  # Fill diagonal 3x3 boxes (independent)
-        
-        solver = SudokuSolver(board)
-        if solver.solve():
-            return solver.board
+            for i in range(0, size, box_size):
+                nums = list(range(1, size + 1))
+                rng.shuffle(nums)
+                for r in range(box_size):
+                    for c in range(box_size):
+                        board[i + r][i + c] = nums[r * box_size + c]
+
+        # Not every filling of the diagonal boxes completes (on 4x4 boards
+        # many do not), so draw a few before giving up
+        for _ in range(10):
+            board = [[0] * size for _ in range(size)]
+            fill_diagonal_boxes()  # Fill diagonal boxes (independent)
+
+            solver = SudokuSolver(board, value_order='random', seed=rng.getrandbits(32))
+            if solver.solve():
+                return solver.board
         return None
 
     @staticmethod
-    def generate_puzzle(difficulty: float = 0.5, timeout: float = 15.0) -> Tuple[List[List[int]], List[List[int]]]:
-        """Generate a random solvable Sudoku puzzle."""
-        start_time = time.time()
+    def generate_puzzle(difficulty: float = 0.5, timeout: float = 15.0,
+                        box_size: int = 3, as_board: bool = False,
+                        max_nodes: Optional[int] = None,
+                        grid_method: str = 'pattern',
+                        rng: Optional[random.Random] = None) -> Tuple[Any, Any]:
+        """
+        Generate a random Sudoku puzzle with a unique solution.
+
+        A clue is removed only once a search proves that the puzzle without
+        it has no solution other than the known one. The check runs on one
+        solver for the whole puzzle: removing or restoring a clue updates
+        its candidates in place, and the search excludes the removed digit,
+        so it stops at the first alternative solution or proves there is
+        none without enumerating the known one. Clues whose check runs out
+        of budget are kept.
+
+        Args:
+            difficulty: 0.3, 0.5, 0.7 or 0.9 for easy to extreme
+            timeout: Stop removing clues after this many seconds
+            box_size: 3 for 9x9 boards, 2 for 4x4, 4 for 16x16, 5 for 25x25
+            as_board: Return sudoku.board.Board instances instead of matrices
+            max_nodes: Search node budget of each uniqueness check
+            grid_method: How the solution is drawn, see solved_board()
+            rng: Random number generator, the random module by default
+
+        Returns:
+            (puzzle, solution), or (None, None) if no solved board was found
+        """
+        stop_at = time.perf_counter() + timeout
+        size = box_size * box_size
+        rng = rng or random
         
         # Generate initial solved board
-        solution = SudokuGenerator._generate_solved_board()
+        solution = SudokuGenerator.solved_board(box_size, grid_method, rng)
         if not solution:
             return None, None
             
         # Define number of cells to remove based on difficulty
-        holes = {
-            0.3: 30,  # easy - remove 30 numbers
-            0.5: 40,  # medium - remove 40 numbers
-            0.7: 50,  # hard - remove 50 numbers
-            0.9: 55   # extreme - remove 55 numbers
-        }.get(difficulty, 40)
+        holes = round(SudokuGenerator.HOLES.get(difficulty, 40) * size * size / 81)
+        
+        # Remove numbers until we reach our target, run out of cells or time
+        puzzle = Board(bytes(chain.from_iterable(solution)), box_size)
+        if holes:
+            for removed, puzzle in enumerate(SudokuGenerator.remove_clues(
+                    solution, box_size, rng, stop_at - time.perf_counter(), max_nodes), 1):
+                if removed >= holes:
+                    break
+
+        if as_board:
+            return puzzle, Board.parse(solution)
+        return puzzle.rows(), solution
+
+    @staticmethod
+    def remove_clues(solution: List[List[int]], box_size: int = 3, rng: Any = None,
+                     timeout: Optional[float] = None,
+                     max_nodes: Optional[int] = None) -> Iterator[Board]:
+        """
+        Remove the clues of a solved board in random order, yielding the
+        puzzle after every removal that keeps its solution unique.
+
+        Every cell is tried once, so running to the end leaves a minimal
+        puzzle: a clue that was needed stays needed as more clues go.
+
+        Args:
+            solution: The solved board as a matrix
+            box_size: Box size of the board
+            rng: Random number generator, the random module by default
+            timeout: Stop after this many seconds
+            max_nodes: Search node budget of each uniqueness check; clues
+                whose check runs out are kept
+        """
+        size = box_size * box_size
+        rng = rng or random
+        stop_at = None if timeout is None else time.perf_counter() + timeout
         
-        # Create empty board
-        puzzle = [row[:] for row in solution]
+        # The solver's givens are the puzzle as clues are removed
+        solver = SudokuSolver(Board(bytes(chain.from_iterable(solution)), box_size))
         
         # Get positions of cells we can try to remove
-        cells = [(i, j) for i in range(9) for j in range(9)]
-        random.shuffle(cells)
+        cells = list(range(size * size))
+        rng.shuffle(cells)
         
-        # Remove numbers until we reach our target or run out of cells
-        removed = 0
-        for i, j in cells:
-            if removed >= holes:
-                break
-            
-            # Remember current value
-            temp = puzzle[i][j]
-            puzzle[i][j] = 0
+        for _ in SudokuGenerator._strip(solver, cells, stop_at, max_nodes):
+            yield solver.givens
+
+    @staticmethod
+    def _strip(solver: SudokuSolver, cells: List[int], stop_at: Optional[float],
+               max_nodes: Optional[int] = None,
+               witnesses: Optional[Dict[int, List[int]]] = None) -> Iterator[int]:
+        """
+        Try removing the clue of each of cells from the solver's givens,
+        yielding every cell whose removal keeps the solution unique.
+
+        For every clue that has to stay, witnesses (if given) receives the
+        other solution found without it, as flat cells. Stops early once
+        time.perf_counter() passes stop_at.
+        """
+        for idx in cells:
+            remaining = None if stop_at is None else stop_at - time.perf_counter()
+            if remaining is not None and remaining <= 0:
+                return
             
-            # Check if puzzle is still valid with this number removed
-            board_copy = [row[:] for row in puzzle]
-            solver = SudokuSolver(board_copy)
+            num = solver.givens.cells[idx]
+            if not num:
+                continue
+            solver.set_given(idx, 0)
             
-            if solver.solve():
-                # Verify this is still the only solution
-                board_copy = [row[:] for row in puzzle]
-                solver2 = SudokuSolver(board_copy)
-                if solver2.solve():
-                    removed += 1
+            # Keep the removal only if no solution puts another digit here
+            if solver.solve_excluding(idx, num, max_nodes, remaining).status == UNSOLVABLE:
+                yield idx
+                continue
+
+            # Another solution exists, or the check ran out of budget
+            if witnesses is not None and solver.alternative is not None:
+                witnesses[idx] = solver.alternative
+            solver.set_given(idx, num)
+
+    @staticmethod
+    def generate_minimal(max_clues: Optional[int] = None, timeout: float = 15.0,
+                         as_board: bool = False, rng: Optional[random.Random] = None,
+                         solution: Optional[List[List[int]]] = None,
+                         max_nodes: Optional[int] = None) -> Tuple[Any, Any]:
+        """
+        Generate a minimal 9x9 puzzle: unique, and no clue can be removed.
+
+        One pass of remove_clues over every cell gives a minimal puzzle,
+        typically with 22-26 clues. With max_clues it then descends by
+        local search: drop two clues a and b, add one clue x so that the
+        solution is unique again, and strip any clue that became
+        redundant. Every check is incremental. The solver's candidates
+        are edited in place, and a second solution must differ from the
+        known one at a or b (the rest is a unique puzzle), so only those
+        two branches are searched. Every other solution found also narrows
+        x down to the cells where it differs from the known one.
+
+        Args:
+            max_clues: Keep descending until the puzzle has at most this
+                many clues; 22 takes under a second on average, 21 a
+                couple of seconds and 20 a few
+            timeout: Time limit of the whole generation
+            as_board: Return sudoku.board.Board instances instead of matrices
+            rng: Random number generator, the random module by default
+            solution: Solved board to use instead of a fresh one
+            max_nodes: Search node budget of each uniqueness check
+
+        Returns:
+            (puzzle, solution), or (None, None) if max_clues was not
+            reached in time
+        """
+        stop_at = time.perf_counter() + timeout
+        rng = rng or random
+        fixed = solution is not None
+        while time.perf_counter() < stop_at:
+            if not fixed:
+                solution = SudokuGenerator.solved_board(3, rng=rng)
+            solver = SudokuGenerator._descend(bytes(chain.from_iterable(solution)), max_clues,
+                                              rng, stop_at, max_nodes)
+            if solver is not None:
+                puzzle = solver.givens
+                if as_board:
+                    return puzzle, Board.parse(solution)
+                return puzzle.rows(), solution
+        return None, None
+
+    @staticmethod
+    def _descend(flat: bytes, max_clues: Optional[int], rng: random.Random,
+                 stop_at: float, max_nodes: Optional[int] = None,
+                 patience: int = 200) -> Optional[SudokuSolver]:
+        """
+        Strip a solution to a minimal puzzle and descend to max_clues.
+
+        Returns the solver holding the puzzle as givens, or None when
+        patience pairs in a row failed to swap or the time is up.
+        """
+        solver = SudokuSolver(Board(flat, 3))
+        cells = list(range(len(flat)))
+        rng.shuffle(cells)
+        # Other solutions of the puzzle without each clue, found by the
+        # strip; with fewer clues they remain solutions
+        witnesses: Dict[int, List[int]] = {}
+        for _ in SudokuGenerator._strip(solver, cells, stop_at, max_nodes, witnesses):
+            pass
+
+        def unique_without(a: int, b: int) -> Optional[bool]:
+            # Whether the givens, lacking clues a and b, still have one
+            # solution; None when a check ran out of budget
+            for idx in (a, b):
+                remaining = stop_at - time.perf_counter()
+                if remaining <= 0:
+                    return None
+                status = solver.solve_excluding(idx, flat[idx], max_nodes, remaining).status
+                if status != UNSOLVABLE:
+                    return False if status == SOLVED else None
+            return True
+
+        clues = [idx for idx in cells if solver.givens.cells[idx]]
+        failures = 0
+        while max_clues is not None and len(clues) > max_clues:
+            if time.perf_counter() >= stop_at or failures >= patience:
+                return None
+            a, b = rng.sample(clues, 2)
+            solver.set_given(a, 0)
+            solver.set_given(b, 0)
+
+            # Only a cell where some other solution differs can restore
+            # uniqueness. The strip found solutions that differ at a and
+            # at b, so the puzzle is known not to be unique without them.
+            swapped = False
+            if a in witnesses and b in witnesses:
+                alternatives = [witnesses[a], witnesses[b]]
+            elif unique_without(a, b) is False:
+                alternatives = [solver.alternative]
+                # A solution that differs at b narrows the cells further
+                if solver.solve_excluding(b, flat[b], max_nodes, stop_at - time.perf_counter()):
+                    alternatives.append(solver.alternative)
+            else:
+                alternatives = None
+            if alternatives is not None:
+                others = [idx for idx, num in enumerate(alternatives[0])
+                          if num != flat[idx] and idx not in (a, b)]
+                rng.shuffle(others)
+                for x in others:
+                    # The clue must rule out every other solution seen so far
+                    if any(alternative[x] == flat[x] for alternative in alternatives):
+                        continue
+                    solver.set_given(x, flat[x])
+                    unique = unique_without(a, b)
+                    if unique:
+                        swapped = True
+                        break
+                    solver.set_given(x, 0)
+                    if unique is False:
+                        alternatives.append(solver.alternative)
+            if not swapped:
+                solver.set_given(a, flat[a])
+                solver.set_given(b, flat[b])
+                failures += 1
+                continue
+
+            # The new clue may have made others redundant
+            failures = 0
+            clues = [idx for idx in range(len(flat)) if solver.givens.cells[idx]]
+            rng.shuffle(clues)
+            witnesses.clear()  # Found with clues that are no longer all there
+            for _ in SudokuGenerator._strip(solver, clues, stop_at, max_nodes, witnesses):
+                pass
+            clues = [idx for idx in clues if solver.givens.cells[idx]]
+        return solver
+
+    @staticmethod
+    def generate_rated(band: Any = 'hard', difficulty: Optional[float] = None,
+                       max_tries: int = 100, timeout: float = 15.0, as_board: bool = False,
+                       rng: Optional[random.Random] = None,
+                       cache: Optional[RatingCache] = None) -> Tuple[Any, Any, Optional[Rating]]:
+        """
+        Generate a 9x9 puzzle whose rating falls in a difficulty band.
+
+        Clues are removed down to the difficulty's hole count, then the
+        puzzle is rated after every further removal: below the band it
+        keeps digging, inside it is returned, and above it (or out of
+        clues) a fresh grid is drawn. Ratings only search once the
+        technique ladder is stuck, and not at all for bands below
+        sudoku.rating.SEARCH, so rejected candidates cost little.
+
+        Args:
+            band: Name in sudoku.rating.BANDS or a (min_score, max_score) pair
+            difficulty: Hole count to start rating at (see HOLES); by
+                default 30 for naked-single bands and 40 otherwise
+            max_tries: Solved grids to draw before giving up
+            timeout: Time limit per grid
+            as_board: Return sudoku.board.Board instances instead of matrices
+            rng: Random number generator, the random module by default
+            cache: RatingCache shared between calls
+
+        Returns:
+            (puzzle, solution, rating), or (None, None, None) if no puzzle
+            in the band was found
+        """
+        low, high = BANDS[band] if isinstance(band, str) else band
+        max_level = None if high >= SEARCH else int(high)
+        if difficulty is None:
+            difficulty = 0.3 if high < 1 else 0.5
+        holes = SudokuGenerator.HOLES.get(difficulty, 40)
+        rng = rng or random
+
+        for _ in range(max_tries):
+            solution = SudokuGenerator.solved_board(3, rng=rng)
+            for removed, puzzle in enumerate(SudokuGenerator.remove_clues(
+                    solution, 3, rng, timeout), 1):
+                if removed < holes:
                     continue
-            
-            # If we get here, removing this number created problems
-            puzzle[i][j] = temp
-            
-        return puzzle, solution
\ No newline at end of file
+                rating = rate(puzzle, max_level, cache)
+                if rating is None or rating.score > high:
+                    break  # Removing more clues rarely makes a puzzle easier
+                if rating.score >= low:
+                    if as_board:
+                        return puzzle, Board.parse(solution), rating
+                    return puzzle.rows(), solution, rating
+        return None, None, None
+
+    @staticmethod
+    def generate_many(n: int, difficulty: float = 0.5, workers: Optional[int] = None,
+                      seed: Optional[int] = None, box_size: int = 3, timeout: float = 15.0,
+                      chunksize: int = 64,
+                      max_clues: Optional[int] = None) -> Iterator[Tuple[Board, Board]]:
+        """
+        Generate n puzzles on a process pool, yielding (puzzle, solution) Boards in order.
+
+        Puzzle i is drawn from its own random stream seeded by (seed, i),
+        so a seed reproduces the same puzzles for any number of workers
+        (unless the generation timeout cuts a puzzle short). Workers take
+        chunks of consecutive puzzles, and only a few chunks per worker are
+        in flight at a time, so any n streams through flat memory.
+
+        Args:
+            n: Number of puzzles
+            difficulty: 0.3, 0.5, 0.7 or 0.9 for easy to extreme
+            workers: Number of processes, default one per core; 1
+                generates in this process
+            seed: Seed of the run, drawn at random if not given
+            box_size: 3 for 9x9 boards, 2 for 4x4, 4 for 16x16, 5 for 25x25
+            timeout: Generation time limit per puzzle
+            chunksize: Puzzles sent to a worker at a time
+            max_clues: Generate minimal 9x9 puzzles with at most this many
+                clues instead (see generate_minimal); difficulty is then
+                ignored and puzzles not found in time are skipped
+        """
+        if seed is None:
+            seed = random.getrandbits(32)
+        if workers is None:
+            workers = parallel.default_workers()
+        tasks = ((start, min(chunksize, n - start), seed, difficulty, box_size, timeout, max_clues)
+                 for start in range(0, n, chunksize))
+        if workers <= 1:
+            chunks = map(_generate_chunk, tasks)
+        else:
+            chunks = parallel.pool_stream(_generate_chunk, tasks, workers, box_size)
+        for chunk in chunks:
+            yield from chunk
+
+
+def _puzzle_rng(seed: int, index: int) -> random.Random:
+    """Random stream of puzzle index of a generate_many run."""
+    return random.Random(f'{seed}:{index}')
+
+
+def _generate_chunk(task: Tuple[int, int, int, float, int, float, Optional[int]]
+                    ) -> List[Tuple[Board, Board]]:
+    """Generate the (start, count, seed, difficulty, box_size, timeout, max_clues) puzzles of a chunk."""
+    start, count, seed, difficulty, box_size, timeout, max_clues = task
+    if max_clues is None:
+        return [SudokuGenerator.generate_puzzle(difficulty, timeout, box_size, as_board=True,
+                                                rng=_puzzle_rng(seed, index))
+                for index in range(start, start + count)]
+    pairs = (SudokuGenerator.generate_minimal(max_clues, timeout, as_board=True,
+                                              rng=_puzzle_rng(seed, index))
+             for index in range(start, start + count))
+    return [pair for pair in pairs if pair[0] is not None]
+
+
+def main():
+    """Command line interface: generate a puzzle corpus."""
+    parser = argparse.ArgumentParser(description='Sudoku Puzzle Generator')
+    parser.add_argument('-n', '--num_puzzles', type=int, default=1000,
+                        help='Number of puzzles (default: 1000)')
+    parser.add_argument('-d', '--difficulty', type=float, default=0.5,
+                        choices=[0.3, 0.5, 0.7, 0.9], help='Generator difficulty')
+    parser.add_argument('-b', '--box_size', type=int, default=3,
+                        help='Box size: 2 (4x4), 3 (9x9, default), 4 (16x16) or 5 (25x25)')
+    parser.add_argument('-w', '--workers', type=int, default=0,
+                        help='Processes (default: 0, one per core)')
+    parser.add_argument('-t', '--timeout', type=float, default=15.0,
+                        help='Generation time limit per puzzle in seconds')
+    parser.add_argument('--seed', type=int, default=None,
+                        help='Random seed, printed for reruns if not given')
+    parser.add_argument('--minimal', type=int, default=None, metavar='MAX_CLUES',
+                        help='Generate minimal 9x9 puzzles with at most MAX_CLUES clues '
+                             '(81 for any minimal puzzle; 22 takes seconds)')
+    parser.add_argument('-o', '--output', required=True,
+                        help='Output file: JSON lines if it ends in .jsonl, else a binary corpus')
+    args = parser.parse_args()
+    if args.minimal is not None and args.box_size != 3:
+        parser.error("--minimal needs 9x9 boards")
+
+    seed = args.seed if args.seed is not None else random.getrandbits(32)
+    start_time = time.perf_counter()
+    pairs = SudokuGenerator.generate_many(args.num_puzzles, args.difficulty,
+                                          args.workers or None, seed, args.box_size, args.timeout,
+                                          max_clues=args.minimal)
+    extra = {'difficulty': args.difficulty} if args.minimal is None else {'max_clues': args.minimal}
+    count = corpus.write_corpus(args.output, pairs, args.box_size, extra=extra)
+    elapsed = time.perf_counter() - start_time
+    print(f"Wrote {count} puzzles to {args.output} in {elapsed:.1f}s "
+          f"({count / elapsed:.0f} puzzles/sec, seed {seed})")
+
+
+if __name__ == "__main__":
+    main()
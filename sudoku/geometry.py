@@ -0,0 +1,137 @@
+"""
+Precomputed geometry of Sudoku boards.
+
+Cells are indexed in row-major order (index = row * size + col). Units
+are numbered rows first, then columns, then boxes: 0-8, 9-17 and 18-26 on
+the standard 9x9 board. Candidate sets are masks with digit d stored as
+bit (d - 1). All tables are tuples built once per board size, so solvers
+can iterate them in hot paths without allocating.
+
+The module-level constants describe the standard 9x9 board; get_geometry()
+gives the same tables for any N²xN² board with NxN boxes.
+"""
+from typing import Callable, Dict, Tuple
+
+# Mask-indexed lookup tables are tabulated up to this many digits
+# (2**16 entries); larger boards compute entries on demand
+MAX_TABULATED_SIZE = 16
+
+
+class _MaskTable:
+    """Mask-indexed table computed on demand, for sizes too large to tabulate."""
+
+    def __init__(self, func: Callable[[int], object]):
+        self._func = func
+
+    def __getitem__(self, mask: int):
+        return self._func(mask)
+
+
+class Geometry:
+    """
+    Geometry tables of an N²xN² board with NxN boxes.
+
+    Attributes mirror the module-level constants of the 9x9 board in lower
+    case: size, box_size, num_cells, row_of, col_of, box_of, units,
+    cell_units, peers, full_mask, popcount, lowest_digit, mask_digits,
+    plus unit_bits / all_units, the unit ids of each cell as a bitset.
+    """
+
+    def __init__(self, box_size: int):
+        if box_size < 2:
+            raise ValueError("Box size must be at least 2")
+        size = box_size * box_size
+        num_cells = size * size
+        self.box_size = box_size
+        self.size = size
+        self.num_cells = num_cells
+
+        # Row, column and box of every cell
+        self.row_of = tuple(i // size for i in range(num_cells))
+        self.col_of = tuple(i % size for i in range(num_cells))
+        self.box_of = tuple((self.row_of[i] // box_size) * box_size + self.col_of[i] // box_size
+                            for i in range(num_cells))
+
+        # Cells of the units: rows, then columns, then boxes
+        boxes = [[] for _ in range(size)]
+        for i in range(num_cells):
+            boxes[self.box_of[i]].append(i)
+        self.units = (
+            tuple(tuple(r * size + c for c in range(size)) for r in range(size)) +
+            tuple(tuple(r * size + c for r in range(size)) for c in range(size)) +
+            tuple(tuple(box) for box in boxes)
+        )
+
+        # Unit ids (row, column, box) of every cell
+        self.cell_units = tuple((self.row_of[i], size + self.col_of[i], 2 * size + self.box_of[i])
+                                for i in range(num_cells))
+
+        # The cells sharing a unit with every cell, in ascending order
+        self.peers = tuple(
+            tuple(sorted({p for u in self.cell_units[i] for p in self.units[u]} - {i}))
+            for i in range(num_cells)
+        )
+
+        # Bitset of the three unit ids of every cell, and of all units
+        self.unit_bits = tuple((1 << r) | (1 << c) | (1 << b) for r, c, b in self.cell_units)
+        self.all_units = (1 << len(self.units)) - 1
+
+        # Lookup tables indexed by candidate mask
+        self.full_mask = (1 << size) - 1
+        digits = range(1, size + 1)
+        if size <= MAX_TABULATED_SIZE:
+            self.popcount = tuple(bin(m).count("1") for m in range(self.full_mask + 1))
+            self.lowest_digit = tuple((m & -m).bit_length() for m in range(self.full_mask + 1))
+            self.mask_digits = tuple(tuple(d for d in digits if m & (1 << (d - 1)))
+                                     for m in range(self.full_mask + 1))
+        else:
+            self.popcount = _MaskTable(lambda m: bin(m).count("1"))
+            self.lowest_digit = _MaskTable(lambda m: (m & -m).bit_length())
+            self.mask_digits = _MaskTable(
+                lambda m: tuple(d for d in digits if m & (1 << (d - 1))))
+
+
+_geometries: Dict[int, Geometry] = {}
+
+
+def get_geometry(box_size: int = 3) -> Geometry:
+    """Shared geometry of boards with box_size x box_size boxes, built on first use."""
+    geometry = _geometries.get(box_size)
+    if geometry is None:
+        geometry = _geometries[box_size] = Geometry(box_size)
+    return geometry
+
+
+def box_size_of(size: int) -> int:
+    """Box size of a board with size rows, ValueError if size is not a square."""
+    box_size = int(round(size ** 0.5))
+    if box_size < 2 or box_size * box_size != size:
+        raise ValueError(f"Board size must be a square of at least 4, got {size}")
+    return box_size
+
+
+STANDARD = get_geometry(3)
+
+SIZE = STANDARD.size
+BOX_SIZE = STANDARD.box_size
+NUM_CELLS = STANDARD.num_cells
+
+# Row, column and box of every cell
+ROW_OF = STANDARD.row_of
+COL_OF = STANDARD.col_of
+BOX_OF = STANDARD.box_of
+
+# Cells of the 27 units: rows, then columns, then boxes
+UNITS: Tuple[Tuple[int, ...], ...] = STANDARD.units
+
+# Unit ids (row, column, box) of every cell
+CELL_UNITS = STANDARD.cell_units
+
+# The 20 cells sharing a unit with every cell, in ascending order
+PEERS = STANDARD.peers
+
+# Lookup tables indexed by candidate mask
+FULL_MASK = STANDARD.full_mask
+POPCOUNT = STANDARD.popcount
+LOWEST_DIGIT = STANDARD.lowest_digit
+MASK_DIGITS = STANDARD.mask_digits
@@ -0,0 +1,117 @@
+"""
+Process pools for solving many puzzles on every core.
+
+Each worker builds the geometry tables (and the Dancing Links matrix when
+that engine is used) once, in the pool initializer, instead of once per
+task. Tasks are submitted in chunks to keep the pickling overhead per
+puzzle low, and results come back in submission order.
+"""
+import multiprocessing
+import os
+import random
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+from .board import Board
+from .geometry import get_geometry
+from .dlx import get_matrix
+from .solver import SudokuSolver, SolveResult
+
+Grid = List[List[int]]
+
+
+def init_worker(box_size: int = 3, engine: str = 'dfs') -> None:
+    """Build the solver tables of a worker process once and reseed its RNG."""
+    get_geometry(box_size)
+    if engine == 'dlx':
+        get_matrix(box_size)
+    # Forked workers start with the parent's RNG state and would all
+    # draw the same puzzles
+    random.seed()
+
+
+def default_workers() -> int:
+    """One worker per core."""
+    return os.cpu_count() or 1
+
+
+def pool_map(func: Callable[[Any], Any], tasks: Iterable[Any], workers: int,
+             box_size: int = 3, engine: str = 'dfs',
+             chunksize: Optional[int] = None) -> Iterator[Any]:
+    """
+    Yield func(task) for every task, in order, computed by a process pool.
+
+    Args:
+        func: Module-level function, so it can be sent to the workers
+        tasks: Arguments of func, one per call
+        workers: Number of processes
+        box_size: Board size whose tables the workers prepare
+        engine: Solver engine whose tables the workers prepare
+        chunksize: Tasks sent to a worker at a time; by default each
+            worker gets about four chunks
+    """
+    tasks = list(tasks)
+    if chunksize is None:
+        chunksize = max(1, len(tasks) // (workers * 4))
+    with multiprocessing.Pool(workers, init_worker, (box_size, engine)) as pool:
+        yield from pool.imap(func, tasks, chunksize)
+
+
+def pool_stream(func: Callable[[Any], Any], tasks: Iterable[Any], workers: int,
+                box_size: int = 3, engine: str = 'dfs',
+                max_pending: Optional[int] = None) -> Iterator[Any]:
+    """
+    Yield func(task) for every task, in order, with bounded memory.
+
+    Unlike pool_map, tasks are drawn lazily and at most max_pending
+    (default two per worker) are submitted but not yet yielded, so an
+    endless task stream and a slow consumer both keep memory flat.
+    """
+    if max_pending is None:
+        max_pending = workers * 2
+    with multiprocessing.Pool(workers, init_worker, (box_size, engine)) as pool:
+        pending = deque()
+        for task in tasks:
+            pending.append(pool.apply_async(func, (task,)))
+            if len(pending) >= max_pending:
+                yield pending.popleft().get()
+        while pending:
+            yield pending.popleft().get()
+
+
+def solve_task(task: Tuple[Any, Dict[str, Any]]) -> Tuple[Optional[Grid], SolveResult]:
+    """Solve one (puzzle, solver_args) task: the solved board or None, and the result."""
+    puzzle, solver_args = task
+    solver = SudokuSolver(puzzle, **solver_args)
+    result = solver.solve()
+    return (solver.board if result else None), result
+
+
+def solve_many(puzzles: List[Any], workers: Optional[int] = None,
+               chunksize: Optional[int] = None,
+               **solver_args) -> List[Tuple[Optional[Grid], SolveResult]]:
+    """
+    Solve puzzles of one size on a process pool.
+
+    Args:
+        puzzles: Boards with 0 for empty cells, all of the same size, as
+            matrices or anything sudoku.board.Board.parse accepts
+        workers: Number of processes, default one per core; 1 solves in
+            this process without a pool
+        chunksize: Puzzles sent to a worker at a time
+        **solver_args: Passed to SudokuSolver, except a cache, which
+            cannot be shared between processes
+
+    Returns:
+        (solution, result) per puzzle in input order, with solution None
+        where the puzzle was not solved
+    """
+    if solver_args.get('cache') is not None:
+        raise ValueError("A SolutionCache cannot be shared with worker processes")
+    if workers is None:
+        workers = default_workers()
+    tasks = [(puzzle, solver_args) for puzzle in puzzles]
+    if workers <= 1 or len(tasks) <= 1:
+        return [solve_task(task) for task in tasks]
+
+    return list(pool_map(solve_task, tasks, workers, Board.parse(puzzles[0]).box_size,
+                         solver_args.get('engine', 'dfs'), chunksize))
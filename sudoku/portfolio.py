@@ -0,0 +1,143 @@
+"""
+Portfolio solving: race several solver configurations, first answer wins.
+
+Search time on hard puzzles is heavy-tailed, and which configuration
+gets lucky differs from puzzle to puzzle. solve_portfolio() first gives
+the default DFS a small node budget in-process, which settles most
+puzzles before any process is started. If that runs out, every
+configuration of the portfolio is started in its own process. The first
+one to prove an answer (a solution or unsolvability) wins and the others
+are terminated. The result names the winner, so wins can be tallied per
+difficulty band to tune the portfolio.
+"""
+import multiprocessing
+import queue
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from .board import Board
+from .dlx import get_matrix
+from .solver import BUDGET_EXCEEDED, SOLVED, UNSOLVABLE, SudokuSolver, SolveResult
+
+Grid = List[List[int]]
+
+# Configurations raced by default: (name, SudokuSolver arguments)
+DEFAULT_PORTFOLIO: Tuple[Tuple[str, Dict[str, Any]], ...] = (
+    ('dfs', {}),
+    ('dfs_descending', {'value_order': 'descending'}),
+    ('dfs_restarts', {'restarts': 'luby'}),
+    ('dlx', {'engine': 'dlx'}),
+)
+
+# Seconds between checks for racers that died without reporting
+POLL_INTERVAL = 0.1
+
+
+@dataclass
+class PortfolioResult:
+    """
+    Outcome of solve_portfolio().
+
+    Truthy only when the puzzle was solved. winner is the name of the
+    configuration that answered first ('dfs' when the in-process head
+    start settled the puzzle), or None if nothing answered in time.
+    """
+    status: str
+    winner: Optional[str]
+    solution: Optional[Grid]
+    result: Optional[SolveResult]
+    elapsed: float
+    raced: bool
+    seeds: Dict[str, int] = field(default_factory=dict)
+
+    @property
+    def solved(self) -> bool:
+        return self.status == SOLVED
+
+    def __bool__(self) -> bool:
+        return self.solved
+
+
+def _run_config(name: str, solver_args: Dict[str, Any], board: Board, seed: int,
+                deadline: Optional[float], results: 'multiprocessing.Queue') -> None:
+    """Process target: solve with one configuration and report (name, status, solution, result)."""
+    solver = SudokuSolver(board, **{'seed': seed, **solver_args})
+    result = solver.solve(deadline=deadline)
+    results.put((name, result.status, solver.board if result else None, result))
+
+
+def solve_portfolio(board: Any, configs: Sequence[Tuple[str, Dict[str, Any]]] = DEFAULT_PORTFOLIO,
+                    timeout: Optional[float] = None, seed: Optional[int] = None,
+                    head_start: int = 200) -> PortfolioResult:
+    """
+    Solve a board by racing solver configurations in parallel processes.
+
+    Args:
+        board: Anything sudoku.board.Board.parse accepts
+        configs: (name, SudokuSolver arguments) pairs
+        timeout: Give up after this many seconds
+        seed: Seed of the randomized configurations; each gets its own
+            seed derived from it, recorded in PortfolioResult.seeds
+        head_start: Nodes the default DFS gets in this process before the
+            race is started; 0 races right away
+
+    Returns:
+        PortfolioResult naming the configuration that answered first
+    """
+    board = Board.parse(board).validate()
+    start_time = time.perf_counter()
+
+    if head_start:
+        solver = SudokuSolver(board)
+        result = solver.solve(max_nodes=head_start, deadline=timeout)
+        if result.status != BUDGET_EXCEEDED:
+            return PortfolioResult(result.status, 'dfs', solver.board if result else None,
+                                   result, time.perf_counter() - start_time, False)
+
+    rng = random.Random(seed)
+    seeds = {name: rng.getrandbits(32) for name, _ in configs}
+    if any(args.get('engine') == 'dlx' for _, args in configs):
+        get_matrix(board.box_size)  # Built once here and inherited by forked racers
+
+    results = multiprocessing.Queue()
+    racers = [multiprocessing.Process(target=_run_config, daemon=True,
+                                      args=(name, args, board, seeds[name], timeout, results))
+              for name, args in configs]
+    for racer in racers:
+        racer.start()
+
+    # The first proven answer wins; racers that only ran out of time do not
+    outcome = PortfolioResult(BUDGET_EXCEEDED, None, None, None, 0.0, True, seeds)
+    try:
+        reported = 0
+        exited = False
+        while reported < len(racers):
+            remaining = None if timeout is None else timeout - (time.perf_counter() - start_time)
+            if remaining is not None and remaining <= 0:
+                break
+            try:
+                name, status, solution, result = results.get(
+                    timeout=POLL_INTERVAL if remaining is None else min(remaining, POLL_INTERVAL))
+            except queue.Empty:
+                if exited:
+                    break
+                # A racer that died without reporting (killed, or an
+                # exception) never will. Once all are gone, one more read
+                # picks up answers sent just before exiting.
+                exited = all(racer.exitcode is not None for racer in racers)
+                continue
+            reported += 1
+            if status in (SOLVED, UNSOLVABLE):
+                outcome = PortfolioResult(status, name, solution, result, 0.0, True, seeds)
+                break
+    finally:
+        for racer in racers:
+            if racer.is_alive():
+                racer.terminate()
+        for racer in racers:
+            racer.join()
+        results.close()
+
+    outcome.elapsed = time.perf_counter() - start_time
+    return outcome
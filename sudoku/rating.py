@@ -0,0 +1,218 @@
+"""
+Difficulty ratings from a ladder of solving techniques.
+
+A puzzle is solved by always applying the easiest technique that makes
+progress: naked singles, hidden singles, then the strategies of
+sudoku.strategies in their pipeline order. Its rating is the hardest
+technique that was needed. A puzzle the ladder cannot finish needs
+search, and the DFS nodes of the full strategy pipeline add to its score:
+
+    score = level                     solved by the ladder
+    score = SEARCH + log2(nodes)      needs search
+
+where level is the index of the hardest technique in TECHNIQUES. Scores
+are comparable across puzzles and bands are ranges of scores (BANDS).
+
+Ratings do not change under the Sudoku symmetries (apart from the search
+effort, which depends slightly on the orientation), so RatingCache answers
+isomorphic puzzles too: a fingerprint filters the stored puzzles, and only
+boards that share one are canonicalized and compared.
+"""
+import math
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Set, Tuple
+from .board import Board
+from .canonical import canonicalize, fingerprint
+from .geometry import FULL_MASK, LOWEST_DIGIT, MASK_DIGITS, NUM_CELLS, PEERS, POPCOUNT, UNITS
+from .solver import UNSOLVABLE, SudokuSolver
+from .strategies import STRATEGIES, build_pipeline
+
+# The ladder, easiest first; 'search' stands for everything beyond it
+TECHNIQUES: Tuple[str, ...] = ('naked_single', 'hidden_single') + tuple(STRATEGIES) + ('search',)
+SEARCH = len(TECHNIQUES) - 1
+
+# Score ranges (inclusive) of the named difficulty bands
+BANDS: Dict[str, Tuple[float, float]] = {
+    'easy': (0, 0),                    # naked singles only
+    'medium': (1, 1),                  # hidden singles
+    'hard': (2, SEARCH - 1),           # locked candidates and subsets
+    'extreme': (SEARCH, math.inf),     # needs search
+}
+
+
+@dataclass(frozen=True)
+class Rating:
+    """
+    Difficulty of a puzzle.
+
+    technique is the hardest technique needed, level its index in
+    TECHNIQUES, nodes the DFS nodes when search was needed (else 0) and
+    score the number bands are defined on.
+    """
+    technique: str
+    level: int
+    nodes: int
+    score: float
+
+
+def _climb(cells: List[int], max_level: Optional[int] = None) -> int:
+    """
+    Solve flat cells in place with the technique ladder.
+
+    Returns the level of the hardest technique used, SEARCH if the ladder
+    got stuck, or the first level above max_level that was needed.
+    """
+    masks = [0] * NUM_CELLS
+    for idx in range(NUM_CELLS):
+        if not cells[idx]:
+            used = 0
+            for peer in PEERS[idx]:
+                if cells[peer]:
+                    used |= 1 << (cells[peer] - 1)
+            masks[idx] = FULL_MASK & ~used
+
+    def place(idx: int, num: int) -> None:
+        cells[idx] = num
+        masks[idx] = 0
+        clear = ~(1 << (num - 1))
+        for peer in PEERS[idx]:
+            masks[peer] &= clear
+
+    def remove(idx: int, bits: int) -> bool:
+        if not masks[idx] & bits:
+            return False
+        masks[idx] &= ~bits
+        return True
+
+    pipeline = build_pipeline(STRATEGIES)
+    level = 0
+    while True:
+        # Naked singles, all at once
+        singles = [idx for idx in range(NUM_CELLS) if POPCOUNT[masks[idx]] == 1]
+        if singles:
+            for idx in singles:
+                if masks[idx]:  # Not emptied by another single just placed
+                    place(idx, LOWEST_DIGIT[masks[idx]])
+            continue
+        if 0 not in cells:
+            return level
+
+        # Hidden singles: digits with one place left in a unit
+        found = False
+        for unit in UNITS:
+            once = twice = 0
+            for idx in unit:
+                twice |= once & masks[idx]
+                once |= masks[idx]
+            for num in MASK_DIGITS[once & ~twice]:
+                bit = 1 << (num - 1)
+                for idx in unit:
+                    if masks[idx] & bit:
+                        place(idx, num)
+                        found = True
+                        break
+        if found:
+            level = max(level, 1)
+            continue
+
+        # The strategies, cheapest first, until one makes progress
+        for next_level, strategy in enumerate(pipeline, 2):
+            if max_level is not None and next_level > max_level:
+                return next_level
+            if strategy.apply(masks, remove):
+                level = max(level, next_level)
+                break
+        else:
+            return SEARCH
+
+
+class RatingCache:
+    """
+    Ratings of puzzles and of the puzzles isomorphic to them, in memory.
+
+    Exact repeats are a dictionary lookup. Otherwise only stored puzzles
+    with the same orbit fingerprint are canonicalized and compared, so a
+    miss costs microseconds.
+    """
+
+    def __init__(self):
+        self.hits = 0
+        self.misses = 0
+        self._ratings: Dict[str, Rating] = {}
+        self._index: Dict[str, Set[str]] = {}
+        self._forms: Dict[str, str] = {}
+
+    def _canonical_key(self, key: str) -> str:
+        """Canonical form of a stored puzzle string, computed once."""
+        form = self._forms.get(key)
+        if form is None:
+            form = self._forms[key] = canonicalize([int(ch) for ch in key])[0]
+        return form
+
+    def get(self, board: Board) -> Optional[Rating]:
+        """Rating of board if it or an isomorphic board was stored, else None."""
+        key = board.to_string('0')
+        rating = self._ratings.get(key)
+        if rating is None:
+            candidates = self._index.get(fingerprint(board.cells))
+            if candidates:
+                canonical = self._canonical_key(key)
+                for other in candidates:
+                    if self._canonical_key(other) == canonical:
+                        rating = self._ratings[other]
+                        self.put(board, rating)
+                        break
+        if rating is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return rating
+
+    def put(self, board: Board, rating: Rating) -> None:
+        """Store the rating of board."""
+        key = board.to_string('0')
+        if key not in self._ratings:
+            self._index.setdefault(fingerprint(board.cells), set()).add(key)
+        self._ratings[key] = rating
+
+    def __len__(self) -> int:
+        return len(self._ratings)
+
+
+def rate(puzzle: Any, max_level: Optional[int] = None,
+         cache: Optional[RatingCache] = None) -> Optional[Rating]:
+    """
+    Rate a 9x9 puzzle by the technique ladder.
+
+    Args:
+        puzzle: A matrix, sudoku.board.Board or anything Board.parse accepts
+        max_level: Give up, returning None, as soon as a technique above
+            this level would be needed; below SEARCH this skips the search
+            of puzzles that are too hard anyway
+        cache: RatingCache consulted first and filled with new ratings
+
+    Raises:
+        ValueError: If the puzzle is not a 9x9 board or has no solution
+    """
+    board = Board.parse(puzzle, 3).validate()
+    if cache is not None:
+        rating = cache.get(board)
+        if rating is not None:
+            return rating if max_level is None or rating.level <= max_level else None
+
+    level = _climb(list(board.cells), max_level)
+    if max_level is not None and level > max_level:
+        return None
+    nodes = 0
+    score = float(level)
+    if level == SEARCH:
+        result = SudokuSolver(board, strategies=list(STRATEGIES)).solve()
+        if result.status == UNSOLVABLE:
+            raise ValueError("Puzzle has no solution")
+        nodes = result.nodes
+        score = SEARCH + math.log2(nodes)
+
+    rating = Rating(TECHNIQUES[level], level, nodes, score)
+    if cache is not None:
+        cache.put(board, rating)
+    return rating
@@ -1,316 +1,1085 @@
-from typing import List, Tuple, Optional, Set
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterator, List, Tuple, Optional, Set, Sequence, Union
+import random
 import time
-import copy
+from .board import Board
+from .geometry import BOX_SIZE, get_geometry
+from .strategies import Strategy, build_pipeline
+from .dlx import get_matrix
+from .cache import SolutionCache
+
+# Search outcomes reported in SolveResult.status
+SOLVED = 'solved'
+UNSOLVABLE = 'unsolvable'
+BUDGET_EXCEEDED = 'budget_exceeded'
+
+# Phases timed by a profiling solver, in SolveResult.phase_ns
+PHASES = ('validate', 'init_candidates', 'propagate', 'branch')
+
+# Growth of the node cutoff per restart on the geometric schedule
+RESTART_GROWTH = 1.5
+
+
+def luby(i: int) -> int:
+    """i-th term (from 1) of the Luby sequence 1, 1, 2, 1, 1, 2, 4, 1, 1, 2, ..."""
+    while True:
+        k = (i + 1).bit_length() - 1
+        if (1 << k) - 1 == i:
+            return 1 << (k - 1)
+        i -= (1 << k) - 1
+
+
+@dataclass
+class SolveResult:
+    """
+    Outcome of a SudokuSolver.solve() call.
+
+    Truthy only when the puzzle was solved, so it can be used wherever the
+    boolean returned by earlier versions of solve() was expected.
+
+    nodes, solve_time (seconds, from time.perf_counter) and strategy_hits
+    are always filled in. backtracks, max_depth, propagation_steps and
+    phase_ns (nanoseconds per entry of PHASES) are only measured by a
+    solver created with profile=True and are None otherwise. restarts is
+    set when restarting is enabled, seed whenever the search is randomized.
+    """
+    status: str
+    nodes: int
+    solve_time: float
+    cached: bool = False
+    backtracks: Optional[int] = None
+    max_depth: Optional[int] = None
+    propagation_steps: Optional[int] = None
+    strategy_hits: Dict[str, int] = field(default_factory=dict)
+    phase_ns: Optional[Dict[str, int]] = None
+    restarts: Optional[int] = None
+    seed: Optional[int] = None
+
+    @property
+    def solved(self) -> bool:
+        return self.status == SOLVED
+
+    @property
+    def budget_exceeded(self) -> bool:
+        return self.status == BUDGET_EXCEEDED
+
+    def __bool__(self) -> bool:
+        return self.solved
+
 
 class SudokuSolver:
     """
     Advanced Sudoku solver with multiple heuristic strategies.
-    
+
     Implements the following strategies:
     1. Candidate Reduction: Remove invalid candidates after each assignment
     2. Uniqueness in Unit: If a number can only go in one place in a unit
-    3. Hidden Pairs: If two cells in a unit share the same two candidates exclusively
-    4. Naked Pairs: If two cells in a unit contain only the same two candidates
+
+    Further strategies from sudoku.strategies (naked/hidden pairs and
+    triples, pointing pairs, box/line reduction) can be enabled as an
+    ordered pipeline that runs whenever 1 and 2 are stuck.
+
+    With engine='dlx' the board is instead solved as an exact cover
+    problem by Dancing Links (sudoku.dlx).
+
+    Given a sudoku.cache.SolutionCache, solve() looks the board up first
+    and stores every new solution it finds.
+
+    Internally the board is kept as bitboards: one candidate mask per cell
+    plus occupancy masks per row, column and box, so candidate checks are
+    single AND operations instead of unit scans.
+
+    Any N²xN² board works (4x4, 9x9, 16x16, 25x25, ...); the size follows
+    from the board passed in. The strategy pipeline and the cache are
+    for 9x9 boards only.
+
+    With profile=True every search also counts backtracks, depth and
+    propagation steps and times each phase with time.perf_counter_ns; see
+    SolveResult. Without it the search loop skips all of that.
     """
-    
-    def __init__(self, board: List[List[int]]):
-        """Initialize solver with a board."""
-        self.size = 9
-        self.box_size = 3
+
+    # How DFS undoes work on backtrack: replay an undo log of assignments and
+    # eliminations, or restore full copies of the grid and masks. Both modes
+    # explore the same tree. It is not the tree of the original set-based
+    # solver: that one overwrote a cell when a batch of hidden singles gave it
+    # two digits, where this is a contradiction, and the propagation worklist
+    # finds dead ends without a branch. Some puzzles therefore take fewer
+    # nodes (10184 instead of 10268 on sudoku_extreme_20241214_222211.json).
+    SEARCH_MODES = ('trail', 'snapshot')
+
+    # Search backends: heuristic DFS over the bitboards or Dancing Links
+    ENGINES = ('dfs', 'dlx')
+
+    # How DFS breaks ties between the cells with the fewest candidates:
+    # first in row-major order, most empty peers, or fullest unit
+    CELL_ORDERS = ('mrv', 'mrv_degree', 'mrv_unit')
+
+    # Order in which DFS tries the candidates of the branching cell; 'lcv'
+    # tries first the digit left in the fewest peer candidates, 'frequency'
+    # the digit already placed most often
+    VALUE_ORDERS = ('ascending', 'descending', 'random', 'lcv', 'frequency')
+
+    # Node cutoff schedules of randomized restarts
+    RESTART_SCHEDULES = ('luby', 'geometric')
+
+    def __init__(self, board: Any, search_mode: str = 'trail',
+                 strategies: Sequence[Union[str, Strategy]] = (), engine: str = 'dfs',
+                 cache: Optional[SolutionCache] = None, profile: bool = False,
+                 value_order: str = 'ascending', seed: Optional[int] = None,
+                 restarts: Optional[str] = None, restart_nodes: int = 100,
+                 cell_order: str = 'mrv'):
+        """
+        Initialize solver with a board.
+
+        Args:
+            board: N²xN² board with values 0-N² (0 for empty cells),
+                usually 9x9: a sudoku.board.Board or anything Board.parse
+                accepts, such as a matrix or an 81-character string
+            search_mode: 'trail' (default) undoes each backtrack from an undo
+                log, 'snapshot' copies the whole state at every node
+            strategies: Names from sudoku.strategies.STRATEGIES or Strategy
+                instances, tried in order after the single candidate rules
+            engine: 'dfs' (default) or 'dlx' for the exact cover search,
+                which ignores search_mode and strategies
+            cache: SolutionCache consulted by solve() before searching
+            profile: Collect the detailed counters and phase timings of
+                SolveResult
+            value_order: Order of the candidates tried at a DFS branch:
+                'ascending' (default), 'descending', 'random', 'lcv' or
+                'frequency' (see VALUE_ORDERS)
+            seed: Seed of the randomized search; drawn at random and
+                recorded in SolveResult.seed if not given
+            restarts: 'luby' or 'geometric' to let solve() restart the DFS
+                whenever a node cutoff on that schedule runs out. Restarts
+                break MRV ties at random and, unless another value_order is
+                given, try the values in random order. Counting and
+                enumerating solutions never restart.
+            restart_nodes: Node cutoff of the first restart (the unit of
+                the Luby schedule)
+            cell_order: Tie-break between the cells with the fewest
+                candidates: 'mrv' (default), 'mrv_degree' or 'mrv_unit'
+                (see CELL_ORDERS)
+        """
+        if search_mode not in self.SEARCH_MODES:
+            raise ValueError(f"search_mode must be one of {self.SEARCH_MODES}")
+        if engine not in self.ENGINES:
+            raise ValueError(f"engine must be one of {self.ENGINES}")
+        if value_order not in self.VALUE_ORDERS:
+            raise ValueError(f"value_order must be one of {self.VALUE_ORDERS}")
+        if cell_order not in self.CELL_ORDERS:
+            raise ValueError(f"cell_order must be one of {self.CELL_ORDERS}")
+        if restarts is not None:
+            if restarts not in self.RESTART_SCHEDULES:
+                raise ValueError(f"restarts must be one of {self.RESTART_SCHEDULES}")
+            if engine != 'dfs':
+                raise ValueError("Restarts need the dfs engine")
+            if value_order == 'ascending':
+                value_order = 'random'
+
+        # Parse and validate the input board; the size follows from it:
+        # 4x4, 9x9, 16x16, 25x25, ...
+        start = time.perf_counter_ns() if profile else 0
+        givens = Board.parse(board).validate()
+        validate_ns = time.perf_counter_ns() - start if profile else 0
+
+        self.box_size = givens.box_size
+        self.size = givens.size
+        self.geometry = get_geometry(self.box_size)
+        if self.box_size != BOX_SIZE and (strategies or cache is not None):
+            raise ValueError("Strategies and the solution cache need a 9x9 board")
+
         self.solve_time = None
         self.attempts = 0
-        
-        # Validate input board
-        self.validate_input(board)
-        
-        # Create deep copies of the board
-        self.initial_board = [row[:] for row in board]
-        self.board = [row[:] for row in board]
-        
-        # Initialize candidates for each cell
-        self.candidates = [[set() for _ in range(9)] for _ in range(9)]
+        self.result = None
+        self.alternative = None
+        self.search_mode = search_mode
+        self.engine = engine
+        self.strategies = build_pipeline(strategies)
+        self.strategy_stats = {}
+        self.cache = cache
+        self.profile = profile
+        self.backtracks = None
+        self.max_depth = None
+        self.propagation_steps = None
+        self.phase_ns = None
+        self.value_order = value_order
+        self.cell_order = cell_order
+        self.restarts = restarts
+        self.restart_nodes = restart_nodes
+        self.restart_count = None
+
+        # One seeded generator drives every random choice, so a recorded
+        # seed replays the same search
+        self.seed = None
+        self._rng = None
+        if value_order == 'random' or restarts is not None:
+            self.seed = seed if seed is not None else random.getrandbits(32)
+            self._rng = random.Random(self.seed)
+
+        # Keep the givens and a flat working grid
+        self.givens = givens
+        self._cells = list(givens.cells)
+
+        # Candidate masks per cell and occupancy masks per unit
+        self._masks = [0] * self.geometry.num_cells
+        self._rows = [0] * self.size
+        self._cols = [0] * self.size
+        self._boxes = [0] * self.size
+        start = time.perf_counter_ns() if profile else 0
         self.initialize_candidates()
+        init_ns = time.perf_counter_ns() - start if profile else 0
+
+        # Setup phases, reported with every search of this solver
+        self._setup_ns = {'validate': validate_ns, 'init_candidates': init_ns}
+
+        # Undo log of (idx, old_mask) eliminations and (~idx, num) assignments
+        self._trail = [] if search_mode == 'trail' else None
 
-    def validate_input(self, board: List[List[int]]) -> None:
+        # Propagation worklist: cells left with at most one candidate and a
+        # bitset of units whose candidates changed since they were checked
+        self._queue = []
+        self._dirty = 0
+
+    @property
+    def initial_board(self) -> List[List[int]]:
+        """The givens as a size x size matrix."""
+        return self.givens.rows()
+
+    @property
+    def board(self) -> List[List[int]]:
+        """Current board state as a size x size matrix."""
+        cells, size = self._cells, self.size
+        return [cells[i:i + size] for i in range(0, len(cells), size)]
+
+    @property
+    def candidates(self) -> List[List[Set[int]]]:
+        """Candidates of each cell as a size x size matrix of sets."""
+        masks, size = self._masks, self.size
+        mask_digits = self.geometry.mask_digits
+        return [[set(mask_digits[masks[r * size + c]]) for c in range(size)]
+                for r in range(size)]
+
+    def validate_input(self, board: Any) -> None:
         """Validate input board format and values."""
-        if len(board) != self.size or any(len(row) != self.size for row in board):
-            raise ValueError(f"Input board must be {self.size}x{self.size}")
-            
-        for row in board:
-            if not all(isinstance(x, int) and 0 <= x <= self.size for x in row):
-                raise ValueError(f"Board values must be integers from 0 to {self.size}")
-        
-        # Validate initial configuration
-        for i in range(self.size):
-            for j in range(self.size):
-                if board[i][j] != 0 and not self.is_valid(board[i][j], (i, j), board):
-                    raise ValueError("Initial board configuration is invalid")
+        Board.parse(board, self.box_size).validate()
 
     def validate_solution(self) -> bool:
         """Validate if current board state is a valid solution."""
-        if any(0 in row for row in self.board):
+        cells = self._cells
+        if 0 in cells:
             return False
-            
-        # Check rows, columns and boxes
-        for i in range(self.size):
-            row = set(self.board[i])
-            col = set(self.board[j][i] for j in range(self.size))
-            if len(row) != 9 or len(col) != 9:
+
+        # Each unit must cover every digit
+        full_mask = self.geometry.full_mask
+        for unit in self.geometry.units:
+            seen = 0
+            for idx in unit:
+                seen |= 1 << (cells[idx] - 1)
+            if seen != full_mask:
                 return False
-        
-        for box_row in range(0, 9, 3):
-            for box_col in range(0, 9, 3):
-                box = set()
-                for i in range(box_row, box_row + 3):
-                    for j in range(box_col, box_col + 3):
-                        box.add(self.board[i][j])
-                if len(box) != 9:
-                    return False
-        
+
         # Check against initial constraints
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.initial_board[i][j] != 0:
-                    if self.board[i][j] != self.initial_board[i][j]:
-                        return False
-        
+        for num, given in zip(cells, self.givens.cells):
+            if given != 0 and num != given:
+                return False
+
         return True
-        
+
     def get_box_start(self, pos: Tuple[int, int]) -> Tuple[int, int]:
         """Get top-left position of the box containing pos."""
-        row, col = pos
-        return (row // 3 * 3, col // 3 * 3)
+        box_size = self.box_size
+        return (pos[0] // box_size * box_size, pos[1] // box_size * box_size)
 
     def is_valid(self, num: int, pos: Tuple[int, int], board: Optional[List[List[int]]] = None) -> bool:
         """Check if number is valid in given position."""
-        current_board = board if board is not None else self.board
         row, col = pos
-        
-        # Check row and column
-        for i in range(self.size):
-            if (current_board[row][i] == num and i != col) or \
-               (current_board[i][col] == num and i != row):
-                return False
-        
-        # Check box
-        box_row, box_col = self.get_box_start(pos)
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if current_board[i][j] == num and (i, j) != pos:
+        size = self.size
+
+        if board is not None:
+            # Explicit board: scan the peers of the cell
+            for peer in self.geometry.peers[row * size + col]:
+                if board[peer // size][peer % size] == num:
                     return False
-                    
-        return True
-        
+            return True
+
+        # Own board: a single lookup in the occupancy masks
+        idx = row * size + col
+        if self._cells[idx] == num:
+            return True
+        used = self._rows[row] | self._cols[col] | self._boxes[self.geometry.box_of[idx]]
+        return not used & (1 << (num - 1))
+
     def initialize_candidates(self):
         """Initialize all possible candidates for each empty cell."""
-        # First fill all empty cells with all possibilities
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    self.candidates[i][j] = set(range(1, 10))
-                else:
-                    self.candidates[i][j].clear()
-                    
-        # Remove candidates based on existing numbers
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] != 0:
-                    self.update_candidates((i, j), self.board[i][j])
-                    
+        cells = self._cells
+        geometry = self.geometry
+        row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        rows, cols, boxes = [0] * self.size, [0] * self.size, [0] * self.size
+
+        # Collect occupancy masks from the placed numbers
+        for idx, num in enumerate(cells):
+            if num:
+                bit = 1 << (num - 1)
+                rows[row_of[idx]] |= bit
+                cols[col_of[idx]] |= bit
+                boxes[box_of[idx]] |= bit
+
+        # Empty cells keep every digit not used by their units
+        self._rows, self._cols, self._boxes = rows, cols, boxes
+        full_mask = geometry.full_mask
+        self._masks = [
+            0 if cells[idx] else
+            full_mask & ~(rows[row_of[idx]] | cols[col_of[idx]] | boxes[box_of[idx]])
+            for idx in range(geometry.num_cells)
+        ]
+
     def update_candidates(self, pos: Tuple[int, int], num: int):
         """Remove a number from candidates in affected cells."""
-        row, col = pos
-            
-        # Remove from row, column and box
-        for i in range(self.size):
-            # Row
-            if self.board[row][i] == 0:
-                self.candidates[row][i].discard(num)
-            # Column    
-            if self.board[i][col] == 0:
-                self.candidates[i][col].discard(num)
-                
-        # Remove from box
-        box_row, box_col = self.get_box_start(pos)
-        for i in range(box_row, box_row + 3):
-            for j in range(box_col, box_col + 3):
-                if self.board[i][j] == 0:
-                    self.candidates[i][j].discard(num)
-                    
+        self._eliminate(pos[0] * self.size + pos[1], 1 << (num - 1))
+
+    def _eliminate(self, idx: int, bit: int) -> None:
+        """
+        Remove a digit bit from the peers of cell idx.
+
+        Every change is logged on the trail and fed to the propagation
+        worklist: peers left with at most one candidate are queued and the
+        units of every touched peer are marked dirty.
+        """
+        masks = self._masks
+        trail = self._trail
+        queue = self._queue
+        dirty = self._dirty
+        geometry = self.geometry
+        popcount, unit_bits = geometry.popcount, geometry.unit_bits
+
+        # Filled cells hold an empty mask, so no occupancy check is needed
+        for peer in geometry.peers[idx]:
+            mask = masks[peer]
+            if mask & bit:
+                masks[peer] = mask ^ bit
+                if trail is not None:
+                    trail.append((peer, mask))
+                if popcount[mask] <= 2:
+                    queue.append(peer)
+                dirty |= unit_bits[peer]
+        self._dirty = dirty
+
+    def _remove(self, idx: int, bits: int) -> bool:
+        """Remove candidate bits from cell idx, True if any were present."""
+        mask = self._masks[idx]
+        if not mask & bits:
+            return False
+        self._masks[idx] = mask & ~bits
+        if self._trail is not None:
+            self._trail.append((idx, mask))
+        if self.geometry.popcount[mask & ~bits] <= 1:
+            self._queue.append(idx)
+        self._dirty |= self.geometry.unit_bits[idx]
+        return True
+
+    def _place(self, idx: int, num: int) -> None:
+        """Place num in cell idx and update occupancy and candidate masks."""
+        bit = 1 << (num - 1)
+        if self._trail is not None:
+            self._trail.append((~idx, num))
+            self._trail.append((idx, self._masks[idx]))
+        geometry = self.geometry
+        self._cells[idx] = num
+        self._masks[idx] = 0
+        self._rows[geometry.row_of[idx]] |= bit
+        self._cols[geometry.col_of[idx]] |= bit
+        self._boxes[geometry.box_of[idx]] |= bit
+        self._dirty |= geometry.unit_bits[idx]
+        self._eliminate(idx, bit)
+
     def find_single_candidates(self) -> List[Tuple[Tuple[int, int], int]]:
         """Find cells that have only one candidate (Strategy I)."""
-        singles = []
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0 and len(self.candidates[i][j]) == 1:
-                    num = next(iter(self.candidates[i][j]))
-                    singles.append(((i, j), num))
-        return singles
-        
+        size, geometry = self.size, self.geometry
+        return [((idx // size, idx % size), geometry.lowest_digit[mask])
+                for idx, mask in enumerate(self._masks) if geometry.popcount[mask] == 1]
+
     def find_unique_candidates(self) -> List[Tuple[Tuple[int, int], int]]:
         """Find numbers that can only go in one place in a unit (Strategy II)."""
         unique = []
-        
+        masks = self._masks
+        size = self.size
+
         # Check rows, columns and boxes
-        for unit_type in ['row', 'col', 'box']:
-            for idx in range(self.size):
-                positions = []
-                if unit_type == 'row':
-                    positions = [(idx, j) for j in range(self.size)]
-                elif unit_type == 'col':
-                    positions = [(i, idx) for i in range(self.size)]
-                else:  # box
-                    box_row, box_col = (idx // 3) * 3, (idx % 3) * 3
-                    positions = [(box_row + i, box_col + j) 
-                               for i in range(3) for j in range(3)]
-                
-                for num in range(1, self.size + 1):
-                    valid_positions = []
-                    for pos in positions:
-                        if (self.board[pos[0]][pos[1]] == 0 and 
-                            num in self.candidates[pos[0]][pos[1]]):
-                            valid_positions.append(pos)
-                    if len(valid_positions) == 1:
-                        unique.append((valid_positions[0], num))
-                        
+        for unit in self.geometry.units:
+            # Digits seen at least once / at least twice in this unit
+            once = twice = 0
+            for idx in unit:
+                twice |= once & masks[idx]
+                once |= masks[idx]
+
+            for num in self.geometry.mask_digits[once & ~twice]:
+                bit = 1 << (num - 1)
+                for idx in unit:
+                    if masks[idx] & bit:
+                        unique.append(((idx // size, idx % size), num))
+                        break
+
         return unique
 
     def print_board(self, board: List[List[int]]) -> None:
         """Pretty print the Sudoku board."""
+        box_size, size = self.box_size, self.size
+        width = len(str(size))
         for i in range(len(board)):
-            if i % 3 == 0 and i != 0:
-                print("- - - - - - - - - - - -")
+            if i % box_size == 0 and i != 0:
+                print("- " * ((width + 1) * size // 2 + box_size))
             for j in range(len(board[0])):
-                if j % 3 == 0 and j != 0:
+                if j % box_size == 0 and j != 0:
                     print("|", end=" ")
-                if j == 8:
-                    print(board[i][j])
+                if j == size - 1:
+                    print(str(board[i][j]).rjust(width))
                 else:
-                    print(str(board[i][j]) + " ", end="")
+                    print(str(board[i][j]).rjust(width) + " ", end="")
         print()
-        
-    def solve(self, verbose: bool = False) -> bool:
+
+    def solve(self, verbose: bool = False, max_nodes: Optional[int] = None,
+              deadline: Optional[float] = None) -> 'SolveResult':
         """
         Solve the Sudoku using DFS with heuristic strategies.
-        
+
         Args:
             verbose (bool): Whether to print the boards and detailed information
-            
+            max_nodes (int): Give up after visiting this many search nodes
+            deadline (float): Give up after this many seconds
+
         Returns:
-            bool: True if solved successfully, False otherwise
+            SolveResult: Outcome of the search, truthy only if the board was
+            solved. When a limit is hit the status is BUDGET_EXCEEDED and the
+            board is left as it was before the call.
         """
         if verbose:
             print("Initial board:")
             self.print_board(self.initial_board)
-            
-        start_time = time.time()
-        self.attempts = 0
-        result = self._solve_dfs()
-        self.solve_time = time.time() - start_time
-        
+
+        start_time = time.perf_counter()
+        self._reset_stats()
+        solution = self.cache.get(self.givens) if self.cache is not None else None
+        if solution is not None:
+            self._cells = [num for row in solution for num in row]
+            self.initialize_candidates()
+            status = SOLVED
+        else:
+            if self.restarts is not None:
+                status = self._search_with_restarts(max_nodes, deadline)
+            else:
+                search = self._search(max_nodes, deadline)
+                status = next(search, UNSOLVABLE)
+                search.close()
+            if status == SOLVED and self.cache is not None:
+                self.cache.put(self.givens, self.board)
+        self.solve_time = time.perf_counter() - start_time
+        self.result = self._make_result(status, solution is not None)
+
         if verbose:
-            if result and self.validate_solution():
+            if self.result.cached:
+                print("\nSolution found in cache!")
+                print(f"Time: {self.solve_time*1000:.2f}ms")
+                print("\nSolution:")
+                self.print_board(self.board)
+            elif self.result:
                 print("\nSolution found!")
                 print(f"Attempts: {self.attempts}")
+                if self.restart_count is not None:
+                    print(f"Restarts: {self.restart_count} (seed {self.seed})")
                 print(f"Time: {self.solve_time*1000:.2f}ms")
+                self._print_profile()
                 print("\nSolution:")
                 self.print_board(self.board)
+            elif status == BUDGET_EXCEEDED:
+                print("\nSearch budget exceeded!")
+                print(f"Attempts: {self.attempts}")
+                print(f"Time: {self.solve_time*1000:.2f}ms")
+                self._print_profile()
             else:
                 print("\nNo solution exists or invalid solution!")
                 print(f"Attempts: {self.attempts}")
                 print(f"Time: {self.solve_time*1000:.2f}ms")
-                
-        return result and self.validate_solution()
-        
-    def _solve_dfs(self) -> bool:
-        """DFS implementation with heuristic strategies."""
-        self.attempts += 1
-        
-        # Save current state
-        old_board = [row[:] for row in self.board]
-        old_candidates = copy.deepcopy(self.candidates)
-        
-        # Apply strategies
-        made_progress = True
-        while made_progress:
-            made_progress = False
-            
+                self._print_profile()
+
+        return self.result
+
+    def count_solutions(self, limit: int = 2, max_nodes: Optional[int] = None,
+                        deadline: Optional[float] = None) -> int:
+        """
+        Count the solutions of the board, stopping as soon as limit are found.
+
+        With the default limit of 2 this is the uniqueness check: 0 means
+        unsolvable, 1 unique and 2 several solutions. If a budget runs out
+        first, self.result.budget_exceeded is set and the count is only a
+        lower bound. The board is left holding the givens.
+
+        Args:
+            limit (int): Stop counting at this many solutions
+            max_nodes (int): Give up after visiting this many search nodes
+            deadline (float): Give up after this many seconds
+        """
+        count = 0
+        status = UNSOLVABLE
+        start_time = time.perf_counter()
+        self._reset_stats()
+        self._reset_board()  # A solve() may have left its solution on the board
+        search = self._search(max_nodes, deadline)
+        try:
+            for status in search:
+                if status == BUDGET_EXCEEDED:
+                    break
+                count += 1
+                if count >= limit:
+                    break
+        finally:
+            search.close()
+            self._reset_board()
+            self.solve_time = time.perf_counter() - start_time
+            self.result = self._make_result(status)
+        return count
+
+    def iter_solutions(self, max_nodes: Optional[int] = None,
+                       deadline: Optional[float] = None) -> Iterator[List[List[int]]]:
+        """
+        Yield every solution of the board as a 9x9 matrix, one at a time.
+
+        The search resumes where it left off on each step, so taking only
+        the first few solutions costs no more than finding them. Once the
+        generator is exhausted or closed, self.result holds the outcome and
+        the board is left holding the givens.
+
+        Args:
+            max_nodes (int): Give up after visiting this many search nodes
+            deadline (float): Give up after this many seconds
+        """
+        status = UNSOLVABLE
+        start_time = time.perf_counter()
+        self._reset_stats()
+        self._reset_board()  # A solve() may have left its solution on the board
+        search = self._search(max_nodes, deadline)
+        try:
+            for status in search:
+                if status == BUDGET_EXCEEDED:
+                    break
+                yield self.board
+        finally:
+            search.close()
+            self._reset_board()
+            self.solve_time = time.perf_counter() - start_time
+            self.result = self._make_result(status)
+
+    def set_given(self, idx: int, num: int) -> None:
+        """
+        Change the given of cell idx to num, 0 to empty the cell.
+
+        Only the occupancy masks and the candidates of the cell and its
+        peers are recomputed, so trying many small edits of a puzzle costs
+        far less than a new solver per edit. The board must hold the
+        givens (no solve() since the last edit) and num must not conflict
+        with them.
+        """
+        geometry = self.geometry
+        cells, masks = self._cells, self._masks
+        rows, cols, boxes = self._rows, self._cols, self._boxes
+        row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+        row, col, box = row_of[idx], col_of[idx], box_of[idx]
+
+        old = cells[idx]
+        if old:
+            clear = ~(1 << (old - 1))
+            rows[row] &= clear
+            cols[col] &= clear
+            boxes[box] &= clear
+        if num:
+            bit = 1 << (num - 1)
+            rows[row] |= bit
+            cols[col] |= bit
+            boxes[box] |= bit
+        cells[idx] = num
+
+        givens = bytearray(self.givens.cells)
+        givens[idx] = num
+        self.givens = Board(bytes(givens), self.box_size)
+
+        full_mask = geometry.full_mask
+        for cell in (idx,) + geometry.peers[idx]:
+            masks[cell] = 0 if cells[cell] else \
+                full_mask & ~(rows[row_of[cell]] | cols[col_of[cell]] | boxes[box_of[cell]])
+
+    def solve_excluding(self, idx: int, num: int, max_nodes: Optional[int] = None,
+                        deadline: Optional[float] = None) -> 'SolveResult':
+        """
+        Search for a solution that does not put num in cell idx.
+
+        With num taken from a known solution, SOLVED proves a second
+        solution and UNSOLVABLE proves the known one unique, after finding
+        only one solution at most. The solution found is kept in
+        self.alternative as flat cells (None otherwise). Always runs the
+        DFS engine and leaves the board holding the givens.
+        """
+        start_time = time.perf_counter()
+        self._reset_stats()
+        self.alternative = None
+        if self._cells != list(self.givens.cells):
+            self._reset_board()  # Left solved by solve()
+        state = self._save_state()
+        self._remove(idx, 1 << (num - 1))
+        search = self._search_dfs(max_nodes, deadline)
+        try:
+            status = next(search, UNSOLVABLE)
+            if status == SOLVED:
+                self.alternative = self._cells[:]
+        finally:
+            search.close()
+            self._restore_state(state)
+        self.solve_time = time.perf_counter() - start_time
+        self.result = self._make_result(status)
+        return self.result
+
+    def _reset_stats(self) -> None:
+        """Zero the counters of a new search."""
+        self.attempts = 0
+        self.restart_count = None
+        self.strategy_stats = {strategy.name: {'calls': 0, 'hits': 0, 'eliminations': 0, 'time': 0.0}
+                               for strategy in self.strategies}
+        if self.profile:
+            self.backtracks = 0
+            self.max_depth = 0
+            self.propagation_steps = 0
+            self.phase_ns = dict.fromkeys(PHASES, 0)
+            self.phase_ns.update(self._setup_ns)
+
+    def _make_result(self, status: str, cached: bool = False) -> SolveResult:
+        """SolveResult of the last search from the counters."""
+        return SolveResult(
+            status, self.attempts, self.solve_time, cached,
+            backtracks=self.backtracks,
+            max_depth=self.max_depth,
+            propagation_steps=self.propagation_steps,
+            strategy_hits={name: stats['hits'] for name, stats in self.strategy_stats.items()},
+            phase_ns=dict(self.phase_ns) if self.phase_ns is not None else None,
+            restarts=self.restart_count,
+            seed=self.seed
+        )
+
+    def _print_profile(self) -> None:
+        """Print the profiling counters of the last search, if collected."""
+        if not self.profile:
+            return
+        print(f"Backtracks: {self.backtracks}, max depth: {self.max_depth}, "
+              f"propagation steps: {self.propagation_steps}")
+        print("Phases: " + ", ".join(f"{phase} {ns / 1e6:.2f}ms"
+                                     for phase, ns in self.phase_ns.items()))
+
+    def _reset_board(self) -> None:
+        """Put the board back to the givens."""
+        self._cells = list(self.givens.cells)
+        self.initialize_candidates()
+        if self._trail is not None:
+            self._trail.clear()
+        self._queue.clear()
+        self._dirty = 0
+
+    def _save_state(self):
+        """Checkpoint the search state: a trail mark or a full snapshot."""
+        if self._trail is not None:
+            return len(self._trail)
+        return (self._cells[:], self._masks[:], self._rows[:],
+                self._cols[:], self._boxes[:])
+
+    def _restore_state(self, state) -> None:
+        """Roll the search state back to a checkpoint from _save_state."""
+        self._queue.clear()
+        self._dirty = 0
+
+        if self._trail is None:
+            self._cells, self._masks, self._rows, self._cols, self._boxes = state
+            return
+
+        # Unwind the trail down to the mark, newest entry first
+        trail, cells, masks = self._trail, self._cells, self._masks
+        geometry = self.geometry
+        while len(trail) > state:
+            key, value = trail.pop()
+            if key >= 0:
+                masks[key] = value
+            else:
+                idx = ~key
+                clear = ~(1 << (value - 1))
+                cells[idx] = 0
+                self._rows[geometry.row_of[idx]] &= clear
+                self._cols[geometry.col_of[idx]] &= clear
+                self._boxes[geometry.box_of[idx]] &= clear
+
+    def _propagate(self) -> bool:
+        """
+        Apply the strategies until no progress, False on a contradiction.
+
+        Only cells and units touched by an elimination since the last call
+        are examined: queued cells are checked for single candidates
+        (Strategy I), dirty units for unique candidates (Strategy II).
+        """
+        cells, masks, queue = self._cells, self._masks, self._queue
+        geometry, size = self.geometry, self.size
+        units, full_mask = geometry.units, geometry.full_mask
+        lowest_digit, mask_digits = geometry.lowest_digit, geometry.mask_digits
+
+        while True:
             # Strategy I: Single candidates
-            singles = self.find_single_candidates()
-            for pos, num in singles:
-                if self.is_valid(num, pos):
-                    self.board[pos[0]][pos[1]] = num
-                    self.update_candidates(pos, num)
-                    made_progress = True
-                else:
-                    # Invalid state reached, restore and return
-                    self.board = old_board
-                    self.candidates = old_candidates
+            while queue:
+                idx = queue.pop()
+                if cells[idx]:
+                    continue
+                if not masks[idx]:  # No valid candidates, invalid state
                     return False
-                
-            # Strategy II: Unique candidates
-            if not made_progress:
-                uniques = self.find_unique_candidates()
-                for pos, num in uniques:
-                    if self.is_valid(num, pos):
-                        self.board[pos[0]][pos[1]] = num
-                        self.update_candidates(pos, num)
-                        made_progress = True
-                    else:
-                        # Invalid state reached, restore and return
-                        self.board = old_board
-                        self.candidates = old_candidates
-                        return False
-        
-        # Find cell with minimum candidates
-        min_candidates = 10
-        min_pos = None
-        
-        for i in range(self.size):
-            for j in range(self.size):
-                if self.board[i][j] == 0:
-                    num_candidates = len(self.candidates[i][j])
-                    if num_candidates == 0:  # No valid candidates, invalid state
-                        self.board = old_board
-                        self.candidates = old_candidates
-                        return False
-                    if num_candidates < min_candidates:
-                        min_candidates = num_candidates
-                        min_pos = (i, j)
-                        
-        if min_pos is None:
-            return self.validate_solution()
-            
-        row, col = min_pos
-        candidates = sorted(list(self.candidates[row][col]))  # Sort for deterministic behavior
-        
-        # Try each candidate
-        for num in candidates:
-            if self.is_valid(num, (row, col)):
-                # Save state before trying this number
-                curr_board = [row[:] for row in self.board]
-                curr_candidates = copy.deepcopy(self.candidates)
-                
-                # Try this number
-                self.board[row][col] = num
-                self.update_candidates((row, col), num)
-                
-                if self._solve_dfs():
+                self._place(idx, lowest_digit[masks[idx]])
+
+            if not self._dirty:
+                # Fall back to the strategy pipeline once the singles are stuck
+                if not self._apply_strategies():
                     return True
-                    
-                # Restore state after failed attempt
-                self.board = curr_board
-                self.candidates = curr_candidates
-            
-        # No valid solution found with any candidate
-        self.board = old_board
-        self.candidates = old_candidates
+                continue
+
+            # Strategy II: Unique candidates in the lowest dirty unit
+            low = self._dirty & -self._dirty
+            self._dirty ^= low
+            unit_id = low.bit_length() - 1
+            unit = units[unit_id]
+
+            # Digits seen at least once / at least twice in this unit
+            once = twice = 0
+            for idx in unit:
+                twice |= once & masks[idx]
+                once |= masks[idx]
+
+            if unit_id < size:
+                used = self._rows[unit_id]
+            elif unit_id < 2 * size:
+                used = self._cols[unit_id - size]
+            else:
+                used = self._boxes[unit_id - 2 * size]
+            if once | used != full_mask:  # Some digit has no place left
+                return False
+
+            for num in mask_digits[once & ~twice]:
+                bit = 1 << (num - 1)
+                for idx in unit:
+                    if masks[idx] & bit:
+                        self._place(idx, num)
+                        break
+                else:
+                    # Taken away by a placement made for another digit
+                    return False
+
+    def _apply_strategies(self) -> bool:
+        """Run the strategy pipeline until one strategy makes progress."""
+        profile = self.profile
+        for strategy in self.strategies:
+            start = time.perf_counter() if profile else 0.0
+            changed = strategy.apply(self._masks, self._remove)
+            stats = self.strategy_stats[strategy.name]
+            stats['calls'] += 1
+            if profile:
+                stats['time'] += time.perf_counter() - start
+            if changed:
+                stats['hits'] += 1
+                stats['eliminations'] += changed
+                return True
         return False
-    
+
+    def _order_values(self, idx: int, candidates: Tuple[int, ...]) -> Tuple[int, ...]:
+        """Candidates of branching cell idx in the configured value order."""
+        order = self.value_order
+        if order == 'descending':
+            return candidates[::-1]
+        if order == 'random':
+            return tuple(self._rng.sample(candidates, len(candidates)))
+        if order == 'lcv':
+            # Filled peers have empty masks, so only open cells count
+            masks = self._masks
+            peers = self.geometry.peers[idx]
+            return tuple(sorted(candidates, key=lambda num: sum(
+                (masks[peer] >> (num - 1)) & 1 for peer in peers)))
+        # Frequency: a digit's row occupancy bits count its placements
+        rows = self._rows
+        return tuple(sorted(candidates, key=lambda num: -sum(
+            (row >> (num - 1)) & 1 for row in rows)))
+
+    def _select_cell(self) -> Optional[int]:
+        """
+        Find the empty cell with minimum candidates.
+
+        Returns the cell index, -1 if the board is full, or None if some
+        empty cell has no candidates left.
+        """
+        min_candidates = self.size + 1
+        min_idx = -1
+        cells, masks = self._cells, self._masks
+        popcount = self.geometry.popcount
+
+        for idx in range(len(cells)):
+            if cells[idx] == 0:
+                num_candidates = popcount[masks[idx]]
+                if num_candidates == 0:  # No valid candidates, invalid state
+                    return None
+                if num_candidates < min_candidates:
+                    min_candidates = num_candidates
+                    min_idx = idx
+        return min_idx
+
+    def _select_cell_random(self) -> Optional[int]:
+        """_select_cell() breaking ties between the minimum cells uniformly at random."""
+        min_candidates = self.size + 1
+        min_idx = -1
+        ties = 0
+        cells, masks = self._cells, self._masks
+        popcount = self.geometry.popcount
+        randrange = self._rng.randrange
+
+        for idx in range(len(cells)):
+            if cells[idx] == 0:
+                num_candidates = popcount[masks[idx]]
+                if num_candidates == 0:
+                    return None
+                if num_candidates < min_candidates:
+                    min_candidates = num_candidates
+                    min_idx = idx
+                    ties = 1
+                elif num_candidates == min_candidates:
+                    # Reservoir sampling keeps each tied cell with equal odds
+                    ties += 1
+                    if randrange(ties) == 0:
+                        min_idx = idx
+        return min_idx
+
+    def _select_cell_ranked(self) -> Optional[int]:
+        """_select_cell() breaking ties between the minimum cells by cell_order."""
+        min_candidates = self.size + 1
+        tied = []
+        cells, masks = self._cells, self._masks
+        popcount = self.geometry.popcount
+
+        for idx in range(len(cells)):
+            if cells[idx] == 0:
+                num_candidates = popcount[masks[idx]]
+                if num_candidates == 0:
+                    return None
+                if num_candidates < min_candidates:
+                    min_candidates = num_candidates
+                    tied = [idx]
+                elif num_candidates == min_candidates:
+                    tied.append(idx)
+        if len(tied) <= 1:
+            return tied[0] if tied else -1
+
+        geometry = self.geometry
+        if self.cell_order == 'mrv_degree':
+            # Most empty peers: the choice constrains the most open cells
+            peers = geometry.peers
+            scores = [sum(1 for peer in peers[idx] if not cells[peer]) for idx in tied]
+        else:
+            # Fewest empty cells in the cell's fullest row, column or box
+            rows, cols, boxes = self._rows, self._cols, self._boxes
+            row_of, col_of, box_of = geometry.row_of, geometry.col_of, geometry.box_of
+            scores = [max(popcount[rows[row_of[idx]]], popcount[cols[col_of[idx]]],
+                          popcount[boxes[box_of[idx]]]) for idx in tied]
+        best = max(scores)
+        tied = [idx for idx, score in zip(tied, scores) if score == best]
+        # Restarts break the remaining ties at random
+        return tied[0] if self.restarts is None else self._rng.choice(tied)
+
+    def _restart_node_limit(self, restart: int) -> int:
+        """Node cutoff of the given restart (from 0) on the configured schedule."""
+        if self.restarts == 'luby':
+            return self.restart_nodes * luby(restart + 1)
+        return int(self.restart_nodes * RESTART_GROWTH ** restart)
+
+    def _search_with_restarts(self, max_nodes: Optional[int] = None,
+                              deadline: Optional[float] = None) -> str:
+        """
+        Randomized DFS for the first solution, restarted from the givens
+        whenever the node cutoff of the current run is used up.
+
+        Every run continues the same random stream, so it explores a
+        different tree, and the cutoffs grow without bound, so the search
+        stays complete. Returns the status of the last run.
+        """
+        stop_at = None if deadline is None else time.perf_counter() + deadline
+        self.restart_count = 0
+        while True:
+            limit = self.attempts + self._restart_node_limit(self.restart_count)
+            if max_nodes is not None:
+                limit = min(limit, max_nodes)
+            remaining = None if stop_at is None else stop_at - time.perf_counter()
+            search = self._search_dfs(limit, remaining)
+            status = next(search, UNSOLVABLE)
+            search.close()
+            if status != BUDGET_EXCEEDED or limit == max_nodes or \
+               (stop_at is not None and time.perf_counter() > stop_at):
+                return status
+            self.restart_count += 1
+
+    def _search(self, max_nodes: Optional[int] = None,
+                deadline: Optional[float] = None) -> Iterator[str]:
+        """
+        Run the configured engine as a generator of search outcomes.
+
+        SOLVED is yielded with the board filled in for every solution, and
+        resuming the generator continues with the next one. BUDGET_EXCEEDED
+        is yielded once, with the board as it was, when a limit is hit.
+        Running out of solutions simply ends the generator.
+        """
+        if self.engine == 'dlx':
+            return self._search_dlx(max_nodes, deadline)
+        return self._search_dfs(max_nodes, deadline)
+
+    def _search_dfs(self, max_nodes: Optional[int] = None,
+                    deadline: Optional[float] = None) -> Iterator[str]:
+        """
+        Iterative DFS implementation with heuristic strategies.
+
+        Search nodes live on an explicit stack of frames
+        [node_state, cell, candidates, next_index, child_state] instead of
+        Python frames, so the node and time budgets can be checked between
+        any two nodes, the search unwound in one step, and suspended at a
+        solution to be resumed for the next.
+        """
+        stop_at = None if deadline is None else time.perf_counter() + deadline
+        root_state = self._save_state()
+        profile = self.profile
+        ascending = self.value_order == 'ascending'
+        if self.cell_order != 'mrv':
+            select_cell = self._select_cell_ranked
+        elif self.restarts is not None:
+            select_cell = self._select_cell_random
+        else:
+            select_cell = self._select_cell
+        clock = time.perf_counter_ns
+
+        # Every cell and unit needs checking once at the root
+        popcount = self.geometry.popcount
+        self._queue[:] = [idx for idx, num in enumerate(self._cells)
+                          if not num and popcount[self._masks[idx]] <= 1]
+        self._dirty = self.geometry.all_units
+        stack = []
+        descend = True
+
+        while True:
+            if descend:
+                # Enter a new node
+                self.attempts += 1
+                if (max_nodes is not None and self.attempts > max_nodes) or \
+                   (stop_at is not None and time.perf_counter() > stop_at):
+                    self.attempts -= 1
+                    self._restore_state(root_state)
+                    yield BUDGET_EXCEEDED
+                    return
+
+                node_state = self._save_state()
+                if profile:
+                    empty = self._cells.count(0)
+                    start = clock()
+                    consistent = self._propagate()
+                    middle = clock()
+                    idx = select_cell() if consistent else None
+                    self.phase_ns['propagate'] += middle - start
+                    self.phase_ns['branch'] += clock() - middle
+                    self.propagation_steps += empty - self._cells.count(0)
+                else:
+                    idx = select_cell() if self._propagate() else None
+
+                if idx == -1:
+                    start = clock() if profile else 0
+                    valid = self.validate_solution()
+                    if profile:
+                        self.phase_ns['validate'] += clock() - start
+                    if valid:
+                        # Resuming treats the solution as a dead end
+                        yield SOLVED
+                    idx = None
+
+                start = clock() if profile else 0
+                if idx is None:
+                    # Invalid state reached, restore and backtrack
+                    self._restore_state(node_state)
+                else:
+                    # Candidates are tried in ascending order unless configured otherwise
+                    candidates = self.geometry.mask_digits[self._masks[idx]]
+                    if not ascending:
+                        candidates = self._order_values(idx, candidates)
+                    stack.append([node_state, idx, candidates, 0, None])
+                    if profile and len(stack) > self.max_depth:
+                        self.max_depth = len(stack)
+
+            # Move to the next untried candidate, backtracking exhausted nodes
+            descend = False
+            while stack:
+                frame = stack[-1]
+                if frame[4] is not None:
+                    # Restore state after failed attempt
+                    self._restore_state(frame[4])
+                    frame[4] = None
+                    if profile:
+                        self.backtracks += 1
+
+                node_state, idx, candidates, next_index, _ = frame
+                if next_index < len(candidates):
+                    frame[3] = next_index + 1
+                    frame[4] = self._save_state()
+                    self._place(idx, candidates[next_index])
+                    descend = True
+                    break
+
+                # No valid solution found with any candidate
+                self._restore_state(node_state)
+                stack.pop()
+            if profile:
+                self.phase_ns['branch'] += clock() - start
+
+            if not descend:
+                return
+
+    def _search_dlx(self, max_nodes: Optional[int] = None,
+                    deadline: Optional[float] = None) -> Iterator[str]:
+        """
+        Search with the shared Dancing Links matrix, counting its nodes as attempts.
+
+        When profiling, time spent in the matrix counts as branching and the
+        forced choices (constraints left with a single row) as propagation.
+        """
+        stop_at = None if deadline is None else time.perf_counter() + deadline
+        matrix = get_matrix(self.box_size)
+        givens = self._cells[:]
+        search = matrix.search(givens, max_nodes, stop_at)
+        profile = self.profile
+        clock = time.perf_counter_ns
+        try:
+            while True:
+                start = clock() if profile else 0
+                solution = next(search, None)
+                self.attempts = matrix.nodes
+                if profile:
+                    self.phase_ns['branch'] += clock() - start
+                    self.backtracks = matrix.backtracks
+                    self.max_depth = matrix.max_depth
+                    self.propagation_steps = matrix.forced
+                if solution is None:
+                    break
+                self._cells = solution
+                self.initialize_candidates()
+                yield SOLVED
+            if not matrix.complete:
+                self._cells = givens
+                self.initialize_candidates()
+                yield BUDGET_EXCEEDED
+        finally:
+            # Releases the matrix for the next search
+            search.close()
+
     def get_solve_time(self) -> float:
         """Get the time taken to solve."""
         return self.solve_time
-        
+
     def get_attempts(self) -> int:
         """Get the number of attempts made during solving."""
-        return self.attempts
\ No newline at end of file
+        return self.attempts
@@ -1,5 +1,13 @@
-from typing import List, Tuple, Optional
+from typing import Any, List, Tuple, Optional
 import time
+from .board import Board
+from .geometry import ROW_OF, COL_OF, UNITS, PEERS
+from .solver import BUDGET_EXCEEDED, PHASES, SOLVED, UNSOLVABLE, SolveResult
+
+
+class _BudgetExceeded(Exception):
+    """Unwinds the recursive search when the node budget runs out."""
+
 
 class SudokuSolver:
     """
@@ -10,12 +18,15 @@ class SudokuSolver:
     Space Complexity: O(n*n) for the recursion stack
     """
     
-    def __init__(self, board: List[List[int]]):
+    def __init__(self, board: Any, profile: bool = False):
         """
         Initialize solver with a board.
         
         Args:
-            board: 9x9 matrix with values 0-9 (0 for empty cells)
+            board: 9x9 board with values 0-9 (0 for empty cells), as a
+                matrix or anything sudoku.board.Board.parse accepts
+            profile: Count backtracks and depth and time each phase, as
+                in sudoku.solver.SolveResult
         Raises:
             ValueError: If board dimensions or values are invalid
         """
@@ -24,35 +35,25 @@ class SudokuSolver:
         self.box_size = 3
         self.solve_time = None
         self.attempts = 0
+        self.profile = profile
+        self.backtracks = None
+        self.max_depth = None
+        self.phase_ns = None
+        self.result = None
+        self._max_nodes = None
         
         # Validate input after attributes are initialized
-        self.validate_input(board)
+        start = time.perf_counter_ns() if profile else 0
+        givens = Board.parse(board, self.box_size).validate()
+        self._validate_ns = time.perf_counter_ns() - start if profile else 0
         
-        # Create copies to preserve original board
-        self.initial_board = [row[:] for row in board]
-        self.board = [row[:] for row in board]
+        # Separate matrices for the givens and the search
+        self.initial_board = givens.rows()
+        self.board = givens.rows()
         
-    def validate_input(self, board: List[List[int]]) -> None:
-        """Validate input board format and values."""
-        # Check dimensions
-        if len(board) != self.size or any(len(row) != self.size for row in board):
-            raise ValueError(f"Input board must be {self.size}x{self.size}")
-            
-        # Check values
-        for row in board:
-            if not all(isinstance(x, int) and 0 <= x <= self.size for x in row):
-                raise ValueError(f"Board values must be integers from 0 to {self.size}")
-                
-        # Optionally check if initial board is valid
-        for i in range(self.size):
-            for j in range(self.size):
-                if board[i][j] != 0:
-                    temp = board[i][j]
-                    board[i][j] = 0
-                    if not self.is_valid(temp, (i, j), board):
-                        board[i][j] = temp
-                        raise ValueError("Initial board configuration is invalid")
-                    board[i][j] = temp
+    def validate_input(self, board: Any) -> None:
+        """Validate input board format and values in one pass over the cells."""
+        Board.parse(board, self.box_size).validate()
 
     def validate_solution(self) -> bool:
         """Validate if current board state is a valid solution."""
@@ -60,26 +61,10 @@ class SudokuSolver:
         if any(0 in row for row in self.board):
             return False
             
-        # Check rows
-        for row in self.board:
-            if len(set(row)) != 9:
-                return False
-                
-        # Check columns
-        for j in range(9):
-            col = [self.board[i][j] for i in range(9)]
-            if len(set(col)) != 9:
+        # Check rows, columns and boxes
+        for unit in UNITS:
+            if len({self.board[ROW_OF[idx]][COL_OF[idx]] for idx in unit}) != 9:
                 return False
-                
-        # Check boxes
-        for box_row in range(0, 9, 3):
-            for box_col in range(0, 9, 3):
-                box = []
-                for i in range(box_row, box_row + 3):
-                    for j in range(box_col, box_col + 3):
-                        box.append(self.board[i][j])
-                if len(set(box)) != 9:
-                    return False
                     
         # Check matches initial constraints
         for i in range(9):
@@ -102,24 +87,10 @@ class SudokuSolver:
         current_board = board if board is not None else self.board
         row, col = pos
         
-        # Check row
-        for x in range(self.size):
-            if current_board[row][x] == num and col != x:
-                return False
-            
-        # Check column
-        for x in range(self.size):
-            if current_board[x][col] == num and row != x:
+        # Check row, column and box through the peer table
+        for peer in PEERS[row * self.size + col]:
+            if current_board[ROW_OF[peer]][COL_OF[peer]] == num:
                 return False
-            
-        # Check box
-        box_x = (row // self.box_size) * self.box_size
-        box_y = (col // self.box_size) * self.box_size
-        
-        for i in range(box_x, box_x + self.box_size):
-            for j in range(box_y, box_y + self.box_size):
-                if current_board[i][j] == num and (i,j) != (row,col):
-                    return False
                 
         return True
         
@@ -145,42 +116,79 @@ class SudokuSolver:
                     print(str(board[i][j]) + " ", end="")
         print()
     
-    def solve(self, verbose: bool = False) -> bool:
+    def solve(self, verbose: bool = False, max_nodes: Optional[int] = None) -> SolveResult:
         """
         Solve the Sudoku using DFS.
         
         Args:
             verbose (bool): Whether to print the boards and detailed information
+            max_nodes (int): Give up after visiting this many search nodes;
+                the status is then BUDGET_EXCEEDED and the board holds the givens
             
         Returns:
-            bool: True if solved successfully, False otherwise
+            SolveResult: Truthy if solved successfully, falsy otherwise.
+            This solver has no propagation or candidate setup, so those
+            phases stay at zero when profiling.
         """
         if verbose:
             print("Initial board:")
             self.print_board(self.initial_board)
 
-        start_time = time.time()
+        start_time = time.perf_counter()
         self.attempts = 0  # Reset attempt counter
-        result = self._solve_dfs()
-        self.solve_time = time.time() - start_time
+        self._max_nodes = max_nodes
+        status = UNSOLVABLE
+        try:
+            if self.profile:
+                self.backtracks = 0
+                self.max_depth = 0
+                self.phase_ns = dict.fromkeys(PHASES, 0)
+                self.phase_ns['validate'] = self._validate_ns
+                start = time.perf_counter_ns()
+                result = self._solve_dfs()
+                middle = time.perf_counter_ns()
+                result = result and self.validate_solution()
+                self.phase_ns['branch'] += middle - start
+                self.phase_ns['validate'] += time.perf_counter_ns() - middle
+            else:
+                result = self._solve_dfs() and self.validate_solution()
+            if result:
+                status = SOLVED
+        except _BudgetExceeded:
+            result = False
+            status = BUDGET_EXCEEDED
+            self.board = [row[:] for row in self.initial_board]
+        self.solve_time = time.perf_counter() - start_time
+        self.result = SolveResult(status, self.attempts, self.solve_time,
+                                  backtracks=self.backtracks, max_depth=self.max_depth,
+                                  propagation_steps=0 if self.profile else None,
+                                  phase_ns=self.phase_ns)
 
         if verbose:
-            if result and self.validate_solution():
+            if result:
                 print("\nSolution found!")
                 print(f"Attempts: {self.attempts}")
                 print(f"Time: {self.solve_time*1000:.2f}ms")
                 print("\nSolution:")
                 self.print_board(self.board)
+            elif status == BUDGET_EXCEEDED:
+                print("\nGave up: node budget exceeded")
+                print(f"Attempts: {self.attempts}")
+                print(f"Time: {self.solve_time*1000:.2f}ms")
             else:
                 print("\nNo solution exists or invalid solution!")
                 print(f"Attempts: {self.attempts}")
                 print(f"Time: {self.solve_time*1000:.2f}ms")
         
-        return result and self.validate_solution()
+        return self.result
         
-    def _solve_dfs(self) -> bool:
+    def _solve_dfs(self, depth: int = 0) -> bool:
         """DFS implementation for solving Sudoku."""
         self.attempts += 1  # Increment attempt counter
+        if self._max_nodes is not None and self.attempts > self._max_nodes:
+            raise _BudgetExceeded
+        if self.profile and depth > self.max_depth:
+            self.max_depth = depth
         
         empty = self.find_empty()
         if not empty:
@@ -191,10 +199,12 @@ class SudokuSolver:
             if self.is_valid(num, (row, col)):
                 self.board[row][col] = num
                 
-                if self._solve_dfs():
+                if self._solve_dfs(depth + 1):
                     return True
                     
                 self.board[row][col] = 0
+                if self.profile:
+                    self.backtracks += 1
                 
         return False
     
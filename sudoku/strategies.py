@@ -0,0 +1,175 @@
+from itertools import combinations
+from typing import Callable, Dict, List, Sequence, Union
+from .geometry import UNITS, FULL_MASK, POPCOUNT, MASK_DIGITS
+
+# Intersections of lines and boxes: SEGMENTS[line][k] holds the three cells
+# the line shares with the k-th box it crosses
+ROW_SEGMENTS = tuple(tuple(UNITS[r][k * 3:k * 3 + 3] for k in range(3)) for r in range(9))
+COL_SEGMENTS = tuple(tuple(UNITS[9 + c][k * 3:k * 3 + 3] for k in range(3)) for c in range(9))
+
+# Callback used by strategies to drop candidate bits from a cell.
+# Returns True if the cell lost at least one candidate.
+Remove = Callable[[int, int], bool]
+
+
+def _union(masks: List[int], cells: Sequence[int]) -> int:
+    """Union of the candidate masks of some cells."""
+    union = 0
+    for idx in cells:
+        union |= masks[idx]
+    return union
+
+
+class Strategy:
+    """
+    Base class for candidate elimination strategies.
+
+    A strategy inspects the 81 candidate masks of a board (0 for filled
+    cells) and removes candidates through the callback it is given, so it
+    never needs to know how the solver stores or undoes its state.
+    """
+
+    name = 'strategy'
+
+    def apply(self, masks: List[int], remove: Remove) -> int:
+        """Eliminate candidates and return the number of cells changed."""
+        raise NotImplementedError
+
+
+class NakedSubset(Strategy):
+    """
+    Naked pairs/triples: if k cells of a unit hold only k candidates
+    between them, those candidates can be removed from the rest of the unit.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.name = {2: 'naked_pairs', 3: 'naked_triples'}.get(size, f'naked_{size}')
+
+    def apply(self, masks: List[int], remove: Remove) -> int:
+        changed = 0
+        for unit in UNITS:
+            cells = [idx for idx in unit if 2 <= POPCOUNT[masks[idx]] <= self.size]
+            for subset in combinations(cells, self.size):
+                digits = 0
+                for idx in subset:
+                    digits |= masks[idx]
+                if POPCOUNT[digits] != self.size:
+                    continue
+                for idx in unit:
+                    if idx not in subset and masks[idx] & digits:
+                        changed += remove(idx, digits)
+        return changed
+
+
+class HiddenSubset(Strategy):
+    """
+    Hidden pairs/triples: if k digits of a unit fit only in the same k
+    cells, every other candidate can be removed from those cells.
+    """
+
+    def __init__(self, size: int):
+        self.size = size
+        self.name = {2: 'hidden_pairs', 3: 'hidden_triples'}.get(size, f'hidden_{size}')
+
+    def apply(self, masks: List[int], remove: Remove) -> int:
+        changed = 0
+        for unit in UNITS:
+            # Positions (bits over the unit's cells) of each digit
+            places = [0] * 9
+            for pos, idx in enumerate(unit):
+                for digit in MASK_DIGITS[masks[idx]]:
+                    places[digit - 1] |= 1 << pos
+
+            digits = [d for d in range(9) if 2 <= POPCOUNT[places[d]] <= self.size]
+            for subset in combinations(digits, self.size):
+                cells = digit_bits = 0
+                for digit in subset:
+                    cells |= places[digit]
+                    digit_bits |= 1 << digit
+                if POPCOUNT[cells] != self.size:
+                    continue
+                for pos, idx in enumerate(unit):
+                    if cells >> pos & 1 and masks[idx] & ~digit_bits:
+                        changed += remove(idx, FULL_MASK & ~digit_bits)
+        return changed
+
+
+class PointingPairs(Strategy):
+    """
+    Pointing pairs/triples: if a digit's places in a box all lie on one
+    row or column, it can be removed from that line outside the box.
+    """
+
+    name = 'pointing_pairs'
+
+    def apply(self, masks: List[int], remove: Remove) -> int:
+        changed = 0
+        for segments in (ROW_SEGMENTS, COL_SEGMENTS):
+            for band in range(0, 9, 3):
+                for stack in range(3):
+                    # The box's three segments along this direction
+                    lines = range(band, band + 3)
+                    unions = [_union(masks, segments[line][stack]) for line in lines]
+                    for i, line in enumerate(lines):
+                        confined = unions[i] & ~(unions[i - 1] | unions[i - 2])
+                        if not confined:
+                            continue
+                        for other in range(3):
+                            if other != stack:
+                                for idx in segments[line][other]:
+                                    if masks[idx] & confined:
+                                        changed += remove(idx, confined)
+        return changed
+
+
+class BoxLineReduction(Strategy):
+    """
+    Box/line reduction: if a digit's places in a row or column all lie in
+    one box, it can be removed from the rest of that box.
+    """
+
+    name = 'box_line_reduction'
+
+    def apply(self, masks: List[int], remove: Remove) -> int:
+        changed = 0
+        for segments in (ROW_SEGMENTS, COL_SEGMENTS):
+            for line in range(9):
+                unions = [_union(masks, segment) for segment in segments[line]]
+                for stack in range(3):
+                    confined = unions[stack] & ~(unions[stack - 1] | unions[stack - 2])
+                    if not confined:
+                        continue
+                    band = line // 3 * 3
+                    for other in range(band, band + 3):
+                        if other != line:
+                            for idx in segments[other][stack]:
+                                if masks[idx] & confined:
+                                    changed += remove(idx, confined)
+        return changed
+
+
+# Strategies selectable by name, in the default order of the pipeline:
+# cheapest first, so the expensive ones run only when the others are stuck
+STRATEGIES: Dict[str, Callable[[], Strategy]] = {
+    'pointing_pairs': PointingPairs,
+    'box_line_reduction': BoxLineReduction,
+    'naked_pairs': lambda: NakedSubset(2),
+    'hidden_pairs': lambda: HiddenSubset(2),
+    'naked_triples': lambda: NakedSubset(3),
+    'hidden_triples': lambda: HiddenSubset(3),
+}
+
+
+def build_pipeline(strategies: Sequence[Union[str, Strategy]]) -> List[Strategy]:
+    """Turn strategy names and/or instances into an ordered pipeline."""
+    pipeline = []
+    for strategy in strategies:
+        if isinstance(strategy, Strategy):
+            pipeline.append(strategy)
+        elif strategy in STRATEGIES:
+            pipeline.append(STRATEGIES[strategy]())
+        else:
+            raise ValueError(f"Unknown strategy: {strategy!r} "
+                             f"(choose from {', '.join(STRATEGIES)})")
+    return pipeline
@@ -1,11 +1,105 @@
 import argparse
 import json
 import os
+import random
 import time
-from typing import List, Dict, Any, Tuple
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
-from .solver import SudokuSolver
+from .board import Board
+from .solver import PHASES, SolveResult, SudokuSolver
+from .benchmark import PUZZLE_DIR, load_puzzles
 from .generator import SudokuGenerator
+from .cache import SolutionCache
+from .corpus import StoreWriter
+from .parallel import default_workers, pool_map
+from .portfolio import solve_portfolio
+
+
+def _profile_of(result: SolveResult) -> Dict[str, Any]:
+    """Profiling counters of one SolveResult, None when it was not profiled."""
+    if result.phase_ns is None:
+        return None
+    return {
+        'backtracks': result.backtracks,
+        'max_depth': result.max_depth,
+        'propagation_steps': result.propagation_steps,
+        'strategy_hits': result.strategy_hits,
+        'phase_ns': result.phase_ns
+    }
+
+
+def _solve_puzzle(puzzle: Any, cache: SolutionCache = None, profile: bool = False,
+                  portfolio: bool = False, verbose: bool = False) -> Dict[str, Any]:
+    """Solve one puzzle with SudokuSolver or the portfolio: the solve fields of a result."""
+    if portfolio:
+        outcome = solve_portfolio(puzzle)
+        if verbose:
+            print(f"Portfolio winner: {outcome.winner} "
+                  f"({'raced' if outcome.raced else 'head start'})")
+        result = outcome.result
+        if result is None:  # Nothing answered in time
+            result = SolveResult(outcome.status, 0, outcome.elapsed)
+        return {
+            'board': outcome.solution,
+            'solved': result,
+            'time': outcome.elapsed,
+            'attempts': result.nodes,
+            'profile': None,
+            'winner': outcome.winner
+        }
+
+    solver = SudokuSolver(puzzle, cache=cache, profile=profile)
+    solved = solver.solve(verbose=verbose)
+    return {
+        'board': solver.board if solved else None,
+        'solved': solved,
+        'time': solver.get_solve_time(),
+        'attempts': solver.get_attempts(),
+        'profile': _profile_of(solved),
+        'winner': None
+    }
+
+
+def _solve_task(task: Tuple[Any, bool, bool]) -> Dict[str, Any]:
+    """Solve one (puzzle, profile, portfolio) task in a worker process."""
+    puzzle, profile, portfolio = task
+    return _solve_puzzle(puzzle, None, profile, portfolio)
+
+
+def compare_heuristics(puzzles: List[Any]) -> List[Dict[str, Any]]:
+    """
+    Solve every puzzle with each deterministic cell and value ordering.
+
+    Returns one row per (cell_order, value_order) pair with the number of
+    puzzles solved, the total DFS nodes and the total solve time, fastest
+    first.
+    """
+    value_orders = [order for order in SudokuSolver.VALUE_ORDERS if order != 'random']
+    rows = []
+    for cell_order in SudokuSolver.CELL_ORDERS:
+        for value_order in value_orders:
+            solved = nodes = 0
+            total_time = 0.0
+            for puzzle in puzzles:
+                result = SudokuSolver(puzzle, cell_order=cell_order, value_order=value_order).solve()
+                solved += result.solved
+                nodes += result.nodes
+                total_time += result.solve_time
+            rows.append({'cell_order': cell_order, 'value_order': value_order,
+                         'solved': solved, 'nodes': nodes, 'time': total_time})
+    return sorted(rows, key=lambda row: row['time'])
+
+
+def print_heuristic_report(rows: List[Dict[str, Any]], count: int) -> None:
+    """Print the heuristic comparison, fastest configuration first."""
+    print(f"{'Cell order':<14}{'Value order':<14}{'Solved':>10}{'Nodes':>10}"
+          f"{'Avg nodes':>11}{'Time (ms)':>12}{'Avg ms':>9}")
+    print("-" * 80)
+    for row in rows:
+        print(f"{row['cell_order']:<14}{row['value_order']:<14}{row['solved']:>5}/{count:<4}"
+              f"{row['nodes']:>10}{row['nodes'] / count:>11.2f}{row['time'] * 1000:>12.1f}"
+              f"{row['time'] / count * 1000:>9.3f}")
+
 
 class SudokuTester:
     """Test Sudoku solver performance and save results."""
@@ -18,7 +112,10 @@ class SudokuTester:
         'extreme': 0.9  # Remove ~55 numbers
     }
 
-    def __init__(self, num_puzzles: int = 10, difficulty: str = 'medium', save_dir: str = None):
+    def __init__(self, num_puzzles: int = 10, difficulty: str = 'medium', save_dir: str = None,
+                 cache: SolutionCache = None, box_size: int = 3, profile: bool = False,
+                 workers: int = 1, portfolio: bool = False, seed: Optional[int] = None,
+                 puzzles: Optional[List[Any]] = None):
         """
         Initialize tester.
         
@@ -26,13 +123,43 @@ class SudokuTester:
             num_puzzles (int): Number of puzzles to test
             difficulty (str): Difficulty level ('easy', 'medium', 'hard', 'extreme')
             save_dir (str): Directory to save generated puzzles, relative to sudoku package
+            cache (SolutionCache): Consulted before solving each puzzle
+            box_size (int): Box size of the random puzzles (3 for 9x9, 4 for 16x16, ...)
+            profile (bool): Record backtracks, depth and per-phase times of every solve
+            workers (int): Generate and solve the random puzzles on this many
+                processes; the cache is only used with a single worker
+            portfolio (bool): Solve by racing the configurations of
+                sudoku.portfolio and record the winners; runs alone, without
+                workers, cache or profiling
+            seed (int): Seed of the random puzzles, drawn at random if not
+                given; the same seed generates the same puzzles for any
+                number of workers
+            puzzles (list): Replay these puzzles instead of generating
+                random ones; num_puzzles and box_size follow from them, and
+                the run is labelled 'replay' instead of a difficulty
         """
+        if puzzles is not None:
+            difficulty = 'replay'
+            num_puzzles = len(puzzles)
+            box_size = Board.parse(puzzles[0]).box_size
         self.num_puzzles = num_puzzles
         self.difficulty = difficulty
+        self.cache = cache
+        self.box_size = box_size
+        self.profile = profile
+        self.workers = workers
+        self.portfolio = portfolio
+        self.puzzles = puzzles
+        self.seed = None if puzzles is not None else \
+            seed if seed is not None else random.getrandbits(32)
+        if workers > 1 and cache is not None:
+            raise ValueError("A solution cache cannot be shared with worker processes")
+        if portfolio and (workers > 1 or cache is not None or profile):
+            raise ValueError("Portfolio solving starts its own processes and cannot be "
+                             "combined with workers, a cache or profiling")
         
         # Set default save directory within sudoku package
         if save_dir is None:
-            import os.path
             package_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
             self.save_dir = os.path.join(package_dir, 'sudoku', 'puzzles')
         else:
@@ -44,26 +171,46 @@ class SudokuTester:
         # Create save directory if it doesn't exist
         os.makedirs(self.save_dir, exist_ok=True)
 
+    def save_store(self, filename: str) -> None:
+        """
+        Append the puzzles, solutions and solve stats to an indexed puzzle
+        store (see sudoku.corpus), creating it if needed.
+        """
+        with StoreWriter(filename, self.box_size, append=True) as writer:
+            for result in self.results:
+                writer.add(result["puzzle"], result["solution"], self.difficulty,
+                           nodes=result["attempts"], solve_time=result["time"])
+        print(f"\nPuzzles added to: {filename} ({writer.count} in total)")
+
     def save_puzzles(self) -> None:
-        """Save generated puzzles and solutions to JSON file."""
+        """Save generated puzzles, solutions and the run's stats to a new JSON file."""
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        filename = f"{self.save_dir}/sudoku_{self.difficulty}_{timestamp}.json"
+        size = f"_{self.box_size ** 2}x{self.box_size ** 2}" if self.box_size != 3 else ""
+        filename = f"{self.save_dir}/sudoku{size}_{self.difficulty}_{timestamp}.json"
         
         save_data = {
             "metadata": {
                 "difficulty": self.difficulty,
+                "box_size": self.box_size,
                 "number_of_puzzles": self.num_puzzles,
+                "seed": self.seed,
                 "generated_at": timestamp,
                 "stats": self.stats
             },
             "puzzles": [{
                 "id": i + 1,
-                "puzzle": result["puzzle"],
-                "solution": result["solution"],
+                "puzzle": Board.parse(result["puzzle"]).rows(),
+                "solution": Board.parse(result["solution"]).rows() if result["solution"] else None,
                 "solve_time_ms": result["time"] * 1000,
                 "solve_attempts": result["attempts"]
             } for i, result in enumerate(self.results)]
         }
+        if self.profile:
+            for entry, result in zip(save_data["puzzles"], self.results):
+                entry["solve_profile"] = result["profile"]
+        if self.portfolio:
+            for entry, result in zip(save_data["puzzles"], self.results):
+                entry["portfolio_winner"] = result["winner"]
         
         with open(filename, 'w') as f:
             json.dump(save_data, f, indent=2)
@@ -84,54 +231,72 @@ class SudokuTester:
                 puzzle = SudokuGenerator.INKALA_2010
                 print(f"Testing Inkala 2010 puzzle (AI Escargot)")
                 
-            puzzle_copy = [row[:] for row in puzzle]
-            solver = SudokuSolver(puzzle_copy)
-            solved = solver.solve(verbose=True)
-            
-            self.results.append({
-                'puzzle': puzzle,
-                'solution': solver.board if solved else None,
-                'solved': solved,
-                'time': solver.get_solve_time(),
-                'attempts': solver.get_attempts()
-            })
+            result = _solve_puzzle(puzzle, self.cache, self.profile, self.portfolio, verbose=True)
+            result.update(puzzle=puzzle, solution=result.pop('board'))
+            self.results.append(result)
             
         else:
-            # Test random puzzles
-            difficulty_value = self.DIFFICULTY_LEVELS[self.difficulty]
-            print(f"Testing {self.num_puzzles} puzzles with difficulty: {self.difficulty.upper()}")
+            size = self.box_size * self.box_size
+            generation_time = 0.0
+            if self.puzzles is not None:
+                print(f"Replaying {self.num_puzzles} saved {size}x{size} puzzles")
+                puzzles = [(puzzle, None) for puzzle in self.puzzles]
+            else:
+                difficulty_value = self.DIFFICULTY_LEVELS[self.difficulty]
+                print(f"Testing {self.num_puzzles} {size}x{size} puzzles with difficulty: "
+                      f"{self.difficulty.upper()} (seed {self.seed})")
+                # Generated up front, so that only solving is timed below
+                start_time = time.perf_counter()
+                puzzles = list(SudokuGenerator.generate_many(
+                    self.num_puzzles, difficulty_value, self.workers, self.seed, self.box_size))
+                generation_time = time.perf_counter() - start_time
             
             total_time = 0
             total_attempts = 0
             solved_count = 0
+            cache_hits = 0
             min_time = float('inf')
             max_time = 0
+            phase_ns = dict.fromkeys(PHASES, 0)
+            wins: Dict[str, int] = {}
+            
+            # Workers hand their results back in order, so the statistics
+            # are aggregated exactly as in a serial run
+            start_time = time.perf_counter()
+            if self.workers > 1:
+                outcomes = pool_map(_solve_task, [(puzzle, self.profile, self.portfolio)
+                                                  for puzzle, _ in puzzles],
+                                    self.workers, self.box_size)
+            else:
+                outcomes = (_solve_puzzle(puzzle, self.cache, self.profile, self.portfolio)
+                            for puzzle, _ in puzzles)
             
-            for i in range(self.num_puzzles):
-                puzzle, solution = SudokuGenerator.generate_puzzle(difficulty_value)
-                puzzle_copy = [row[:] for row in puzzle]
-                solver = SudokuSolver(puzzle_copy)
-                solved = solver.solve(verbose=False)
-                solve_time = solver.get_solve_time()
-                attempts = solver.get_attempts()
+            for i, ((puzzle, solution), result) in enumerate(zip(puzzles, outcomes)):
+                board = result.pop('board')
+                result.update(puzzle=puzzle, solution=board if solution is None else solution)
+                solved = result['solved']
+                solve_time = result['time']
+                attempts = result['attempts']
                 
                 total_time += solve_time
                 total_attempts += attempts
                 if solved:
                     solved_count += 1
+                if solved.cached:
+                    cache_hits += 1
                 min_time = min(min_time, solve_time)
                 max_time = max(max_time, solve_time)
+                if self.profile:
+                    for phase, ns in solved.phase_ns.items():
+                        phase_ns[phase] += ns
+                if self.portfolio:
+                    wins[result['winner']] = wins.get(result['winner'], 0) + 1
                 
                 print(f"Progress: {i+1}/{self.num_puzzles}", end='\r')
                 
-                self.results.append({
-                    'puzzle': puzzle,
-                    'solution': solution,
-                    'solved': solved,
-                    'time': solve_time,
-                    'attempts': attempts
-                })
+                self.results.append(result)
                 
+            solve_wall_time = time.perf_counter() - start_time
             print()  # New line after progress
             
             # Store statistics
@@ -143,8 +308,18 @@ class SudokuTester:
                 'total_attempts': total_attempts,
                 'avg_attempts': total_attempts / self.num_puzzles,
                 'solved_count': solved_count,
-                'success_rate': (solved_count / self.num_puzzles) * 100
+                'success_rate': (solved_count / self.num_puzzles) * 100,
+                'cache_hits': cache_hits,
+                'workers': self.workers,
+                'seed': self.seed,
+                'generation_time': generation_time,
+                'solve_wall_time': solve_wall_time,
+                'throughput': self.num_puzzles / solve_wall_time
             }
+            if self.profile:
+                self.stats['phase_ms'] = {phase: ns / 1e6 for phase, ns in phase_ns.items()}
+            if self.portfolio:
+                self.stats['portfolio_wins'] = wins
 
     def print_results(self) -> None:
         """Print test results."""
@@ -160,6 +335,8 @@ class SudokuTester:
             print(f"Status: {'Solved' if result['solved'] else 'Failed to solve'}")
             print(f"Time: {result['time']*1000:.2f}ms")
             print(f"Attempts: {result['attempts']}")
+            if self.portfolio:
+                print(f"Winner: {result['winner']}")
         else:
             # Multiple puzzle statistics
             print(f"Solved: {self.stats['solved_count']}/{self.num_puzzles} "
@@ -168,26 +345,117 @@ class SudokuTester:
             print(f"Min time: {self.stats['min_time']*1000:.2f}ms")
             print(f"Max time: {self.stats['max_time']*1000:.2f}ms")
             print(f"Average attempts: {self.stats['avg_attempts']:.1f}")
+            if self.puzzles is None:
+                print(f"Generation time: {self.stats['generation_time']:.2f}s "
+                      f"(seed {self.seed})")
+            print(f"Solve wall time: {self.stats['solve_wall_time']:.2f}s with {self.workers} "
+                  f"worker{'s' if self.workers > 1 else ''}, "
+                  f"{self.stats['throughput']:.1f} puzzles/sec solve-only")
+            if self.cache is not None:
+                print(f"Cache hits: {self.stats['cache_hits']}/{self.num_puzzles}")
+            if self.profile:
+                print("Time by phase: " + ", ".join(
+                    f"{phase} {ms:.2f}ms" for phase, ms in self.stats['phase_ms'].items()))
+                slowest = max(self.results, key=lambda result: result['time'])
+                print(f"Slowest puzzle: {slowest['time']*1000:.2f}ms, {slowest['attempts']} attempts, "
+                      f"{slowest['profile']['backtracks']} backtracks, "
+                      f"max depth {slowest['profile']['max_depth']}")
+            if self.portfolio:
+                print("Portfolio wins: " + ", ".join(
+                    f"{name} {count}" for name, count in sorted(self.stats['portfolio_wins'].items(),
+                                                              key=lambda item: -item[1])))
 
 def main():
     """Command line interface."""
     parser = argparse.ArgumentParser(description='Sudoku Solver Tester')
-    parser.add_argument('-n', '--num_puzzles', type=int, default=10,
-                      help='Number of puzzles to test')
+    parser.add_argument('-n', '--num_puzzles', type=int, default=None,
+                      help='Number of puzzles to test (default: 10), or the most '
+                           'to use with --from-file or --heuristics (default: all)')
     parser.add_argument('-d', '--difficulty',
                       default='medium',
                       choices=['easy', 'medium', 'hard', 'extreme',
                               'inkala2006', 'inkala2010'],
                       help='Puzzle difficulty level')
     parser.add_argument('-s', '--save_dir', default=None,
-                      help='Directory to save generated puzzles (default: sudoku/puzzles)')
+                      help='Directory to save puzzles (default: sudoku/puzzles)')
+    parser.add_argument('--store', default=None, metavar='PATH',
+                      help='Also add the puzzles, solutions and solve stats to this '
+                           'indexed puzzle store (see sudoku.corpus); not for replays')
+    parser.add_argument('--save', action='store_true',
+                      help='Save the run to a JSON file in the save directory even when '
+                           'replaying with --from-file')
+    parser.add_argument('-c', '--cache', default=None,
+                      help='Solution cache file; puzzles solved in earlier runs, '
+                           'or isomorphic to them, are answered from it')
+    
+    parser.add_argument('-b', '--box_size', type=int, default=3,
+                      help='Box size of random puzzles: 2 (4x4), 3 (9x9, default), '
+                           '4 (16x16) or 5 (25x25)')
+    parser.add_argument('-p', '--profile', action='store_true',
+                      help='Record backtracks, search depth and time per solver phase')
+    parser.add_argument('--portfolio', action='store_true',
+                      help='Race several solver configurations per puzzle and '
+                           'record which one wins')
+    parser.add_argument('-w', '--workers', type=int, default=1,
+                      help='Generate and solve random puzzles on this many processes '
+                           '(0 for one per core)')
+    parser.add_argument('--seed', type=int, default=None,
+                      help='Random seed of the generated puzzles, printed for reruns if not given')
+    parser.add_argument('--from-file', '--corpus', dest='from_file', nargs='+', metavar='FILE',
+                      default=None,
+                      help='Replay saved puzzles instead of generating them: JSON files, '
+                           'puzzle lists, corpora or stores, or glob patterns')
+    parser.add_argument('--heuristics', nargs='*', metavar='FILE', default=None,
+                      help='Instead of generating puzzles, compare DFS nodes and time of '
+                           'every cell and value ordering on saved puzzle files or glob '
+                           'patterns (default: sudoku/puzzles/*.json)')
     
     args = parser.parse_args()
+    if args.heuristics is not None:
+        puzzles = load_puzzles(args.heuristics or [os.path.join(PUZZLE_DIR, '*.json')],
+                               args.num_puzzles)
+        if not puzzles:
+            parser.error("No puzzles found")
+        print(f"\nComparing search heuristics on {len(puzzles)} puzzles")
+        print("-" * 50)
+        print_heuristic_report(compare_heuristics(puzzles), len(puzzles))
+        return
+    puzzles = None
+    if args.from_file is not None:
+        if args.difficulty in ('inkala2006', 'inkala2010'):
+            parser.error("--from-file cannot be combined with an Inkala difficulty")
+        if args.store:
+            parser.error("--store cannot be combined with --from-file; "
+                         "the replayed puzzles are saved already")
+        puzzles = load_puzzles(args.from_file, args.num_puzzles)
+        if not puzzles:
+            parser.error("No puzzles found")
+        args.box_size = Board.parse(puzzles[0]).box_size
+    if args.num_puzzles is None:
+        args.num_puzzles = 10
+    if args.box_size != 3 and args.cache:
+        parser.error("--cache only supports 9x9 puzzles")
+    workers = args.workers or default_workers()
+    if workers > 1 and args.cache:
+        parser.error("--cache cannot be combined with --workers")
+    if args.portfolio and (workers > 1 or args.cache or args.profile):
+        parser.error("--portfolio cannot be combined with --workers, --cache or --profile")
     
-    tester = SudokuTester(args.num_puzzles, args.difficulty, args.save_dir)
-    tester.run_tests()
+    cache = SolutionCache(path=args.cache) if args.cache else None
+    tester = SudokuTester(args.num_puzzles, args.difficulty, args.save_dir, cache,
+                          args.box_size, args.profile, workers, args.portfolio,
+                          args.seed, puzzles)
+    try:
+        tester.run_tests()
+    finally:
+        if cache is not None:
+            cache.close()
     tester.print_results()
-    tester.save_puzzles()
+    # Replayed puzzles are saved already
+    if puzzles is None or args.save:
+        tester.save_puzzles()
+    if args.store:
+        tester.save_store(args.store)
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
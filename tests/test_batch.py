@@ -0,0 +1,36 @@
+import os
+import pytest
+from sudoku.benchmark import PUZZLE_DIR, load_puzzles
+from sudoku.board import Board
+from sudoku.generator import SudokuGenerator
+from sudoku.solver import SudokuSolver
+
+pytest.importorskip('numpy')
+from sudoku.batch import solve_batch  # noqa: E402
+
+# Cell (0, 8) can only be 9, which its column already holds
+UNSOLVABLE_BOARD = [[1, 2, 3, 4, 5, 6, 7, 8, 0], [0] * 8 + [9]] + [[0] * 9 for _ in range(7)]
+
+
+def test_solve_batch_agrees_with_solver():
+    puzzles = load_puzzles([os.path.join(PUZZLE_DIR, 'sudoku_extreme_20241214_222211.json')], 100)
+    puzzles += [SudokuGenerator.INKALA_2006, SudokuGenerator.INKALA_2010, UNSOLVABLE_BOARD]
+    solutions = solve_batch(puzzles)
+    assert len(solutions) == len(puzzles)
+    for puzzle, solution in zip(puzzles, solutions):
+        solver = SudokuSolver(puzzle)
+        if not solver.solve():
+            assert solution is None
+        elif solver.count_solutions() == 1:
+            assert solver.solve() and solution == solver.board
+        else:
+            # Any solution of the puzzle will do
+            check = SudokuSolver(solution)
+            assert check.validate_solution()
+            assert all(given in (0, num) for given, num
+                       in zip(Board.parse(puzzle).cells, check.givens.cells))
+    assert solutions[-1] is None
+
+
+def test_solve_batch_empty():
+    assert solve_batch([]) == []
@@ -0,0 +1,87 @@
+import copy
+import pytest
+from sudoku.benchmark import (SAVED_CORPUS, compare_to_baseline, corpus_digest,
+                              load_suite_corpora, run_suite)
+
+SOLVED_GRID = ('123456789456789123789123456231674895875912364694538217'
+               '317265948542897631968341572')
+# Every other cell blanked: singles finish it
+EASY = [[0 if (row * 9 + col) % 2 == 0 else int(SOLVED_GRID[row * 9 + col]) for col in range(9)]
+        for row in range(9)]
+SMALL = [[0] * 4 for _ in range(4)]
+
+
+def row(engine='dfs', solved=10, p50=0.01, nodes=100, digest='abc'):
+    return {'corpus': 'saved', 'engine': engine, 'digest': digest, 'count': 10, 'solved': solved,
+            'time': {'p50': p50, 'p95': p50 * 2, 'p99': p50 * 3, 'max': p50 * 4},
+            'nodes': {'p50': nodes, 'p95': nodes, 'p99': nodes, 'max': nodes}}
+
+
+def test_saved_corpus_is_frozen():
+    corpora = load_suite_corpora(['inkala', 'saved'])
+    assert len(SAVED_CORPUS) == 24
+    assert len(corpora['inkala']) == 2
+    assert len(corpora['saved']) == 2040
+    assert corpus_digest(corpora['saved']) == '5b6e942a0fbdb5ac'
+    with pytest.raises(ValueError):
+        load_suite_corpora(['random'])
+
+
+def test_run_suite_rows():
+    rows = run_suite({'easy': [EASY], 'small': [SMALL]}, engines=('dfs', 'naive', 'uniqueness'),
+                     warmup=1, repeats=2)
+    rows = {(row['corpus'], row['engine']): row for row in rows}
+    assert len(rows) == 6
+    dfs = rows['easy', 'dfs']
+    assert (dfs['count'], dfs['solved'], dfs['digest']) == (1, 1, corpus_digest([EASY]))
+    assert dfs['nodes'] == {'p50': 1, 'p95': 1, 'p99': 1, 'max': 1}
+    assert set(dfs['time']) == {'p50', 'p95', 'p99', 'max'}
+    assert rows['easy', 'uniqueness']['nodes'] is None
+    # The naive solver only takes 9x9 boards, and a 4x4 board has many solutions
+    assert rows['small', 'naive']['skipped'] == "no 9x9 puzzles"
+    assert rows['small', 'dfs']['solved'] == 1
+    assert rows['small', 'uniqueness']['solved'] == 0
+
+
+def test_same_run_passes():
+    rows = [row(), row('naive')]
+    assert compare_to_baseline(rows, {'rows': copy.deepcopy(rows)}) == ([], [])
+
+
+@pytest.mark.parametrize('new, regressed', [
+    (row(solved=9), True),
+    (row(p50=0.02), True),           # Every time percentile doubles
+    (row(p50=0.011), False),         # Within the threshold
+    (row(p50=0.00002), False),       # Faster
+    (row(nodes=150), True),
+    (row(nodes=110), False),
+])
+def test_regressions(new, regressed):
+    regressions, notes = compare_to_baseline([new], {'rows': [row()]})
+    assert bool(regressions) == regressed
+    assert notes == []
+
+
+def test_small_times_are_not_gated():
+    # +100%, but by less than min_time
+    regressions, _ = compare_to_baseline([row(p50=0.00002)], {'rows': [row(p50=0.00001)]})
+    assert regressions == []
+    regressions, _ = compare_to_baseline([row(p50=0.00002)], {'rows': [row(p50=0.00001)]},
+                                         min_time=0)
+    assert len(regressions) == 3
+
+
+def test_threshold():
+    assert compare_to_baseline([row(nodes=150)], {'rows': [row()]}, threshold=0.6)[0] == []
+
+
+def test_changed_corpus_and_skipped_rows_are_not_compared():
+    regressions, notes = compare_to_baseline([row(solved=0, digest='new')], {'rows': [row()]})
+    assert regressions == [] and len(notes) == 1
+    skipped = {'corpus': 'saved', 'engine': 'dfs', 'digest': 'abc', 'count': 10,
+               'skipped': "No module named 'torch'"}
+    assert compare_to_baseline([skipped], {'rows': [row()]}) == ([], [])
+    assert compare_to_baseline([row(solved=0)], {'rows': [skipped]}) == ([], [])
+    # Engines that do not count nodes are gated on time only
+    no_nodes = dict(row(), nodes=None)
+    assert compare_to_baseline([no_nodes], {'rows': [row(nodes=1)]}) == ([], [])
@@ -0,0 +1,55 @@
+import numpy as np
+import pytest
+from sudoku.board import Board
+from sudoku.generator import SudokuGenerator
+
+PUZZLE = SudokuGenerator.INKALA_2006
+
+
+@pytest.mark.parametrize('board', [
+    None,
+    5,
+    {1: 2},
+    'x' * 81,
+    [0] * 80,
+    [0] * 80 + [10],
+    [0] * 80 + [-1],
+    [0] * 80 + [300],
+    [[0] * 9] * 8,
+    [[0] * 9] * 8 + [5],
+    [[0] * 9] * 8 + [[0] * 8],
+    [[0] * 9] * 8 + [[0] * 8 + ['a']],
+    np.zeros((9, 8), dtype=int),
+    np.zeros(81),
+])
+def test_parse_rejects_malformed_boards(board):
+    with pytest.raises(ValueError):
+        Board.parse(board)
+
+
+def test_parse_rejects_wrong_box_size():
+    with pytest.raises(ValueError):
+        Board.parse([[0] * 4 for _ in range(4)], 3)
+
+
+def test_validate_rejects_conflicts():
+    with pytest.raises(ValueError):
+        Board.parse([[1, 1] + [0] * 7] + [[0] * 9 for _ in range(8)]).validate()
+
+
+def test_parse_representations_agree():
+    board = Board.parse(PUZZLE)
+    flat = [num for row in PUZZLE for num in row]
+    assert Board.parse(flat) == board
+    assert Board.parse(board.to_string()) == board
+    assert Board.parse(board.to_string('0').encode()) == board
+    assert Board.parse(bytes(flat)) == board
+    assert Board.parse(np.array(PUZZLE)) == board
+    assert Board.parse(board) is board
+    assert board.rows() == PUZZLE
+
+
+def test_parse_flat_cells_of_any_size():
+    board = Board.parse([1] + [0] * 15)
+    assert board.size == 4
+    assert board[0] == [1, 0, 0, 0]
@@ -0,0 +1,45 @@
+import random
+import pytest
+from sudoku.canonical import canonicalize, fingerprint
+from sudoku.generator import SudokuGenerator
+
+
+def flatten(board):
+    return [num for row in board for num in row]
+
+
+def random_symmetry(flat, rng):
+    """A random member of the puzzle's orbit under the Sudoku symmetries."""
+    def line_order():
+        bands = rng.sample(range(3), 3)
+        return [band * 3 + i for band in bands for i in rng.sample(range(3), 3)]
+
+    rows, cols = line_order(), line_order()
+    digits = [0] + rng.sample(range(1, 10), 9)
+    result = [digits[flat[r * 9 + c]] for r in rows for c in cols]
+    if rng.random() < 0.5:
+        result = [result[c * 9 + r] for r in range(9) for c in range(9)]
+    return result
+
+
+@pytest.mark.parametrize('board', [
+    SudokuGenerator.INKALA_2006,
+    SudokuGenerator.INKALA_2010,
+    SudokuGenerator.solved_board(),
+])
+def test_canonical_form_is_invariant(board):
+    flat = flatten(board)
+    key, transform = canonicalize(flat)
+    assert transform.apply(flat) == [int(ch) for ch in key]
+    assert transform.invert([int(ch) for ch in key]) == flat
+
+    rng = random.Random(7)
+    for _ in range(5):
+        other = random_symmetry(flat, rng)
+        assert canonicalize(other)[0] == key
+        assert fingerprint(other) == fingerprint(flat)
+
+
+def test_different_puzzles_have_different_forms():
+    assert canonicalize(flatten(SudokuGenerator.INKALA_2006))[0] != \
+        canonicalize(flatten(SudokuGenerator.INKALA_2010))[0]
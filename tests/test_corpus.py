@@ -0,0 +1,88 @@
+import json
+import struct
+
+import pytest
+from sudoku.board import Board
+from sudoku.corpus import (CorpusStore, StoreWriter, canonical_hash, read_corpus,
+                           write_corpus)
+from sudoku.generator import SudokuGenerator
+from sudoku.rating import rate
+from sudoku.solver import SudokuSolver
+
+
+def solved(board):
+    solver = SudokuSolver(board)
+    assert solver.solve()
+    return Board.parse(solver.board)
+
+
+PUZZLE = Board.parse(SudokuGenerator.INKALA_2006)
+SOLUTION = solved(PUZZLE)
+OTHER = Board.parse(SudokuGenerator.INKALA_2010)
+# Transposed, so isomorphic to PUZZLE
+TRANSPOSED = Board.parse([list(column) for column in zip(*PUZZLE.rows())])
+
+
+@pytest.mark.parametrize('name', ['corpus.jsonl', 'corpus.bin'])
+def test_corpus_round_trip(tmp_path, name):
+    path = str(tmp_path / name)
+    pairs = [(PUZZLE, SOLUTION), (OTHER, solved(OTHER))]
+    assert write_corpus(path, pairs) == 2
+    assert list(read_corpus(path)) == pairs
+
+
+def test_store_round_trip(tmp_path):
+    path = str(tmp_path / 'puzzles.sdk')
+    rating = rate(OTHER)
+    with StoreWriter(path) as writer:
+        assert writer.add(PUZZLE, SOLUTION, 'extreme', nodes=12, solve_time=0.5) == 0
+        assert writer.add(OTHER, difficulty='hard', rating=rating) == 1
+
+    store = CorpusStore(path)
+    assert len(store) == 2
+    record = store[0]
+    assert (record.puzzle, record.solution, record.difficulty) == (PUZZLE, SOLUTION, 'extreme')
+    assert (record.clues, record.nodes, record.solve_time) == (PUZZLE.clues, 12, 0.5)
+    assert record.rating is None
+    assert record.canonical == canonical_hash(PUZZLE)
+    record = store[-1]
+    assert (record.puzzle, record.solution, record.rating) == (OTHER, None, rating)
+    assert record.nodes is None and record.solve_time is None
+    assert list(store.by_difficulty('hard')) == [1]
+    assert list(store.by_clues(PUZZLE.clues)) == [0]
+    assert store.difficulties() == {'extreme': 1, 'hard': 1}
+
+
+def test_store_append_and_canonical_lookup(tmp_path):
+    path = str(tmp_path / 'puzzles.sdk')
+    with StoreWriter(path) as writer:
+        writer.add(PUZZLE, SOLUTION, 'extreme')
+    with StoreWriter(path, append=True) as writer:
+        writer.add(OTHER, difficulty='extreme')
+        writer.add(TRANSPOSED)
+        assert writer.count == 3
+
+    store = CorpusStore(path)
+    assert [record.puzzle for record in store] == [PUZZLE, OTHER, TRANSPOSED]
+    assert list(store.by_difficulty('extreme')) == [0, 1]
+    assert store.by_canonical(TRANSPOSED) == [0, 2]
+    assert store.by_canonical(OTHER) == [1]
+    assert store.distinct() == 2
+    assert [puzzle for puzzle, _ in read_corpus(path)] == [PUZZLE, OTHER, TRANSPOSED]
+
+
+def test_store_indexes_are_little_endian(tmp_path):
+    path = str(tmp_path / 'puzzles.sdk')
+    with StoreWriter(path) as writer:
+        writer.add(PUZZLE, difficulty='extreme')
+        writer.add(OTHER, difficulty='extreme')
+
+    with open(path, 'rb') as f:
+        data = f.read()
+    _, offset, length = struct.unpack_from('<QQQ', data, 8)
+    directory = json.loads(data[offset:offset + length])
+    offset, count = directory['difficulty']['extreme']
+    assert struct.unpack_from(f'<{count}I', data, offset) == (0, 1)
+    offset, count = directory['canonical']
+    assert struct.unpack_from(f'<{count}Q', data, offset) == tuple(
+        sorted([canonical_hash(PUZZLE), canonical_hash(OTHER)]))
@@ -0,0 +1,43 @@
+import os
+from sudoku.benchmark import PUZZLE_DIR, load_puzzles
+from sudoku.dlx import ExactCoverMatrix, get_matrix
+from sudoku.generator import SudokuGenerator
+from sudoku.solver import SudokuSolver
+
+
+def test_dlx_matches_dfs():
+    puzzles = load_puzzles([os.path.join(PUZZLE_DIR, 'sudoku_extreme_20241214_222211.json')], 50)
+    for puzzle in puzzles:
+        dfs = SudokuSolver(puzzle)
+        dlx = SudokuSolver(puzzle, engine='dlx')
+        assert dfs.solve() and dlx.solve()
+        # Saved puzzles need not be unique, so the solutions may differ
+        assert dlx.validate_solution()
+        assert dlx.count_solutions(3) == dfs.count_solutions(3)
+
+
+def test_matrix_is_restored_after_search():
+    matrix = ExactCoverMatrix()
+    links = (matrix.left[:], matrix.right[:], matrix.up[:], matrix.down[:], matrix.size[:])
+    cells = [num for row in SudokuGenerator.INKALA_2006 for num in row]
+    solutions, nodes, complete = matrix.solve(cells, limit=2)
+    assert len(solutions) == 1 and nodes > 0 and complete
+    assert (matrix.left, matrix.right, matrix.up, matrix.down, matrix.size) == links
+    assert matrix.solve(cells, limit=2)[0] == solutions
+
+
+def test_budget_marks_search_incomplete():
+    matrix = ExactCoverMatrix()
+    solutions, nodes, complete = matrix.solve([0] * 81, max_nodes=10)
+    assert solutions == [] and nodes == 10 and not complete
+
+
+def test_busy_matrix_is_not_shared():
+    shared = get_matrix()
+    search = shared.search([0] * 81)
+    next(search)
+    assert shared.busy
+    assert get_matrix() is not shared
+    search.close()
+    assert not shared.busy
+    assert get_matrix() is shared
@@ -0,0 +1,110 @@
+import random
+import pytest
+from sudoku.generator import MULTIPLE, UNIQUE, UNKNOWN, SudokuGenerator
+from sudoku.solver import UNSOLVABLE, SudokuSolver
+
+EMPTY = [[0] * 9 for _ in range(9)]
+# Cell (0, 8) can only be 9, which its column already holds
+UNSOLVABLE_BOARD = [[1, 2, 3, 4, 5, 6, 7, 8, 0], [0] * 8 + [9]] + [[0] * 9 for _ in range(7)]
+# Two 5s in the top row
+CONFLICTING = [[5, 5] + [0] * 7] + [[0] * 9 for _ in range(8)]
+
+
+def clues(puzzle):
+    return sum(num != 0 for row in puzzle for num in row)
+
+
+def assert_minimal(puzzle):
+    assert SudokuGenerator.check_uniqueness(puzzle) == UNIQUE
+    for row, col in [(r, c) for r in range(9) for c in range(9) if puzzle[r][c]]:
+        fewer = [line[:] for line in puzzle]
+        fewer[row][col] = 0
+        assert SudokuGenerator.check_uniqueness(fewer) == MULTIPLE
+
+
+@pytest.mark.parametrize('puzzle, budget, status', [
+    (SudokuGenerator.INKALA_2006, {}, UNIQUE),
+    (EMPTY, {}, MULTIPLE),
+    (UNSOLVABLE_BOARD, {}, UNSOLVABLE),
+    (CONFLICTING, {}, UNSOLVABLE),
+    (SudokuGenerator.INKALA_2006, {'max_nodes': 1}, UNKNOWN),
+    (SudokuGenerator.INKALA_2006, {'time_limit': 0}, UNKNOWN),
+    (EMPTY, {'max_nodes': 100}, MULTIPLE),
+])
+def test_check_uniqueness(puzzle, budget, status):
+    assert SudokuGenerator.check_uniqueness(puzzle, **budget) == status
+
+
+def test_has_unique_solution():
+    assert SudokuGenerator.has_unique_solution(SudokuGenerator.INKALA_2010) is True
+    assert SudokuGenerator.has_unique_solution(EMPTY) is False
+    assert SudokuGenerator.has_unique_solution(SudokuGenerator.INKALA_2006, time_limit=0) is None
+
+
+@pytest.mark.parametrize('difficulty, holes', sorted(SudokuGenerator.HOLES.items()))
+def test_generate_puzzle_is_unique(difficulty, holes):
+    puzzle, solution = SudokuGenerator.generate_puzzle(difficulty, rng=random.Random(4))
+    assert SudokuGenerator.check_uniqueness(puzzle) == UNIQUE
+    assert clues(puzzle) >= 81 - holes
+    solver = SudokuSolver(puzzle)
+    assert solver.solve() and solver.board == solution
+
+
+def test_remove_clues_to_the_end_is_minimal():
+    solution = SudokuGenerator.solved_board(rng=random.Random(2))
+    for puzzle in SudokuGenerator.remove_clues(solution, rng=random.Random(2)):
+        pass
+    assert_minimal(puzzle.rows())
+
+
+def test_generate_many_is_reproducible_across_worker_counts():
+    serial = list(SudokuGenerator.generate_many(6, 0.5, workers=1, seed=11, chunksize=2))
+    parallel = list(SudokuGenerator.generate_many(6, 0.5, workers=2, seed=11, chunksize=2))
+    assert len(serial) == 6
+    assert parallel == serial
+    other = list(SudokuGenerator.generate_many(6, 0.5, workers=1, seed=12, chunksize=2))
+    assert other != serial
+
+
+def test_generate_many_puzzles_are_unique():
+    for puzzle, solution in SudokuGenerator.generate_many(4, 0.7, workers=1, seed=3):
+        solver = SudokuSolver(puzzle)
+        assert solver.count_solutions() == 1
+        assert solver.solve() and solver.board == solution.rows()
+
+
+@pytest.mark.parametrize('method', SudokuGenerator.SOLVED_BOARD_METHODS)
+@pytest.mark.parametrize('box_size', [2, 3, 4, 5])
+def test_solved_board_is_valid_and_seeded(method, box_size):
+    board = SudokuGenerator.solved_board(box_size, method, random.Random(9))
+    assert SudokuSolver(board).validate_solution()
+    assert SudokuGenerator.solved_board(box_size, method, random.Random(9)) == board
+
+
+def test_solved_board_pattern_varies():
+    boards = {str(SudokuGenerator.solved_board(rng=random.Random(seed))) for seed in range(20)}
+    assert len(boards) == 20
+    with pytest.raises(ValueError):
+        SudokuGenerator.solved_board(method='backtrack')
+
+
+@pytest.mark.parametrize('max_clues', [None, 22])
+def test_generate_minimal_is_unique_and_minimal(max_clues):
+    puzzle, solution = SudokuGenerator.generate_minimal(max_clues, timeout=60, rng=random.Random(1))
+    assert max_clues is None or clues(puzzle) <= max_clues
+    assert_minimal(puzzle)
+    solver = SudokuSolver(puzzle)
+    assert solver.solve() and solver.board == solution
+
+
+def test_generate_minimal_keeps_the_solution():
+    solution = SudokuGenerator.solved_board(rng=random.Random(6))
+    puzzle, kept = SudokuGenerator.generate_minimal(22, timeout=60, rng=random.Random(6),
+                                                    solution=solution, as_board=True)
+    assert kept.rows() == solution
+    assert all(given in (0, num) for given, num in zip(puzzle.cells, kept.cells))
+    assert_minimal(puzzle.rows())
+
+
+def test_generate_minimal_times_out():
+    assert SudokuGenerator.generate_minimal(16, timeout=0.2, rng=random.Random(1)) == (None, None)
@@ -0,0 +1,53 @@
+import os
+import pytest
+import quiz
+from sudoku.benchmark import PUZZLE_DIR, load_puzzles
+from sudoku.parallel import pool_stream, solve_many
+from sudoku.cache import SolutionCache
+from sudoku.solver import SudokuSolver
+from sudoku.tester import SudokuTester
+
+
+def square(n):
+    return n * n
+
+
+def test_solve_many_matches_serial():
+    puzzles = load_puzzles([os.path.join(PUZZLE_DIR, 'sudoku_extreme_20241214_222211.json')], 20)
+    serial = solve_many(puzzles, workers=1)
+    parallel = solve_many(puzzles, workers=2, chunksize=3)
+    assert [solution for solution, _ in parallel] == [solution for solution, _ in serial]
+    assert [result.nodes for _, result in parallel] == [result.nodes for _, result in serial]
+    for puzzle, (solution, result) in zip(puzzles, parallel):
+        solver = SudokuSolver(puzzle)
+        assert result and solver.solve() and solution == solver.board
+
+
+def test_solve_many_rejects_a_cache():
+    with pytest.raises(ValueError):
+        solve_many([[[0] * 9 for _ in range(9)]], workers=2, cache=SolutionCache())
+
+
+def test_pool_stream_keeps_order():
+    assert list(pool_stream(square, iter(range(20)), 2, max_pending=3)) == [n * n for n in range(20)]
+
+
+def test_quiz_solve_many_uses_the_cache():
+    puzzles = load_puzzles([os.path.join(PUZZLE_DIR, 'sudoku_extreme_20241214_222211.json')], 6)
+    first = quiz.solve_many(puzzles, workers=2)
+    assert all(result for _, result in first)
+    again = quiz.solve_many(puzzles, workers=2)
+    assert [solution for solution, _ in again] == [solution for solution, _ in first]
+    assert all(result.cached for _, result in again)
+
+
+def test_tester_workers_match_serial(tmp_path):
+    runs = []
+    for workers in (1, 2):
+        tester = SudokuTester(6, 'medium', str(tmp_path), workers=workers, seed=5)
+        tester.run_tests()
+        runs.append(tester)
+    serial, parallel = runs
+    assert [(row['puzzle'], row['solution'], row['attempts']) for row in parallel.results] == \
+        [(row['puzzle'], row['solution'], row['attempts']) for row in serial.results]
+    assert parallel.stats['solved_count'] == serial.stats['solved_count'] == 6
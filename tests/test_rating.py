@@ -0,0 +1,64 @@
+import math
+import random
+import pytest
+from sudoku.board import Board
+from sudoku.generator import UNIQUE, SudokuGenerator
+from sudoku.rating import BANDS, SEARCH, TECHNIQUES, RatingCache, rate
+
+SOLVED_GRID = ('123456789456789123789123456231674895875912364694538217'
+               '317265948542897631968341572')
+# Cell (0, 8) can only be 9, which its column already holds
+UNSOLVABLE_BOARD = [[1, 2, 3, 4, 5, 6, 7, 8, 0], [0] * 8 + [9]] + [[0] * 9 for _ in range(7)]
+
+
+def in_band(rating, band):
+    low, high = BANDS[band]
+    return low <= rating.score <= high
+
+
+def test_rate_naked_single():
+    rating = rate(SOLVED_GRID.replace('5', '0', 1))
+    assert (rating.technique, rating.level, rating.nodes, rating.score) == ('naked_single', 0, 0, 0.0)
+    assert in_band(rating, 'easy')
+
+
+def test_rate_search():
+    rating = rate(SudokuGenerator.INKALA_2006)
+    assert rating.technique == 'search' and rating.level == SEARCH
+    assert rating.nodes > 0
+    assert rating.score == SEARCH + math.log2(rating.nodes)
+    assert in_band(rating, 'extreme')
+    # Too hard for the ladder up to hidden singles
+    assert rate(SudokuGenerator.INKALA_2006, max_level=1) is None
+
+
+def test_rate_unsolvable():
+    with pytest.raises(ValueError):
+        rate(UNSOLVABLE_BOARD)
+
+
+def test_bands_cover_every_score():
+    assert BANDS['easy'][0] == 0 and BANDS['extreme'][1] == math.inf
+    bands = sorted(BANDS.values())
+    assert all(high < next_low for (_, high), (next_low, _) in zip(bands, bands[1:]))
+    for level in range(len(TECHNIQUES)):
+        assert sum(low <= level <= high for low, high in bands) == 1
+
+
+def test_cache_answers_isomorphic_puzzles():
+    cache = RatingCache()
+    puzzle = Board.parse(SudokuGenerator.INKALA_2006)
+    rating = rate(puzzle, cache=cache)
+    assert (cache.hits, cache.misses, len(cache)) == (0, 1, 1)
+    assert rate(puzzle, cache=cache) == rating
+    transposed = [list(column) for column in zip(*puzzle.rows())]
+    assert rate(transposed, cache=cache) == rating
+    assert (cache.hits, cache.misses, len(cache)) == (2, 1, 2)
+
+
+@pytest.mark.parametrize('band', BANDS)
+def test_generate_rated_lands_in_band(band):
+    puzzle, solution, rating = SudokuGenerator.generate_rated(band, rng=random.Random(1))
+    assert in_band(rating, band)
+    assert rate(puzzle) == rating
+    assert SudokuGenerator.check_uniqueness(puzzle) == UNIQUE
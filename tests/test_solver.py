@@ -0,0 +1,230 @@
+import os
+import pytest
+from sudoku.benchmark import PUZZLE_DIR, load_puzzles
+from sudoku.generator import SudokuGenerator
+from sudoku.solver import BUDGET_EXCEEDED, PHASES, SOLVED, UNSOLVABLE, SudokuSolver, luby
+from sudoku.tester import compare_heuristics
+
+EMPTY = [[0] * 9 for _ in range(9)]
+
+SOLVED_GRID = ('123456789456789123789123456231674895875912364694538217'
+               '317265948542897631968341572')
+
+# Cell (0, 8) can only be 9, which its column already holds
+UNSOLVABLE_BOARD = [[1, 2, 3, 4, 5, 6, 7, 8, 0], [0] * 8 + [9]] + [[0] * 9 for _ in range(7)]
+
+
+def test_candidates_match_peer_scan():
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006)
+    board = solver.initial_board
+    expected = [[{num for num in range(1, 10) if solver.is_valid(num, (row, col), board)}
+                 if board[row][col] == 0 else set() for col in range(9)] for row in range(9)]
+    assert solver.candidates == expected
+    # Placing a digit takes it from the candidates of the cell's peers
+    num = min(expected[0][1])
+    solver.update_candidates((0, 1), num)
+    candidates = solver.candidates
+    assert candidates[0][1] == expected[0][1]
+    assert all(num not in candidates[0][col] for col in range(9) if col != 1)
+    assert all(num not in candidates[row][1] for row in range(1, 9))
+    assert candidates[4][4] == expected[4][4]
+
+
+def test_propagation_without_branching():
+    # Every other cell blanked: the singles alone fill the grid at the root
+    puzzle = ''.join('0' if idx % 2 == 0 else num for idx, num in enumerate(SOLVED_GRID))
+    solver = SudokuSolver(puzzle)
+    result = solver.solve()
+    assert result and result.nodes == 1
+    assert ''.join(str(num) for row in solver.board for num in row) == SOLVED_GRID
+    assert not solver._queue and not solver._dirty
+    # The contradiction is found by propagation, before any branch
+    result = SudokuSolver(UNSOLVABLE_BOARD).solve()
+    assert not result and result.nodes == 1
+
+
+@pytest.mark.parametrize('engine', SudokuSolver.ENGINES)
+@pytest.mark.parametrize('board, limit, expected', [
+    (EMPTY, 5, 5),
+    (SudokuGenerator.INKALA_2006, 2, 1),
+    (UNSOLVABLE_BOARD, 2, 0),
+])
+def test_count_solutions(engine, board, limit, expected):
+    solver = SudokuSolver(board, engine=engine)
+    assert solver.count_solutions(limit) == expected
+    assert solver.board == solver.initial_board
+
+
+@pytest.mark.parametrize('engine', SudokuSolver.ENGINES)
+def test_count_solutions_after_solve(engine):
+    solver = SudokuSolver(EMPTY, engine=engine)
+    assert solver.solve()
+    assert solver.count_solutions(5) == 5
+    assert solver.count_solutions(5) == 5
+
+
+@pytest.mark.parametrize('engine', SudokuSolver.ENGINES)
+def test_iter_solutions(engine):
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006, engine=engine)
+    assert solver.solve()
+    solution = solver.board
+    assert list(solver.iter_solutions()) == [solution]
+    assert list(SudokuSolver(UNSOLVABLE_BOARD, engine=engine).iter_solutions()) == []
+
+
+@pytest.mark.parametrize('engine', SudokuSolver.ENGINES)
+def test_iter_solutions_distinct(engine):
+    solver = SudokuSolver(EMPTY, engine=engine)
+    solver.solve()
+    solutions = [board for board, _ in zip(solver.iter_solutions(), range(4))]
+    assert len({str(board) for board in solutions}) == 4
+    assert all(SudokuSolver(board).validate_solution() for board in solutions)
+
+
+def test_unfinished_enumeration_leaves_dlx_usable():
+    solutions = SudokuSolver(EMPTY, engine='dlx').iter_solutions()
+    next(solutions)
+    assert SudokuSolver(SudokuGenerator.INKALA_2006, engine='dlx').count_solutions() == 1
+    solutions.close()
+
+
+def test_solve_excluding_after_solve():
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006)
+    solver.solve()
+    idx = next(i for i, num in enumerate(solver.givens.cells) if num == 0)
+    num = solver.board[idx // 9][idx % 9]
+    assert not solver.solve_excluding(idx, num).solved
+
+
+@pytest.mark.parametrize('engine', SudokuSolver.ENGINES)
+@pytest.mark.parametrize('budget', [{'max_nodes': 1}, {'deadline': 0}])
+def test_budget_exceeded_leaves_board(engine, budget):
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006, engine=engine)
+    result = solver.solve(**budget)
+    assert result.status == BUDGET_EXCEEDED and not result
+    assert solver.board == solver.initial_board
+    assert solver.solve()
+    assert solver.validate_solution()
+
+
+@pytest.mark.parametrize('engine', SudokuSolver.ENGINES)
+def test_other_board_sizes(engine):
+    assert SudokuSolver([[0] * 4 for _ in range(4)], engine=engine).count_solutions(300) == 288
+    for size in (25, 16):
+        solver = SudokuSolver([[0] * size for _ in range(size)], engine=engine)
+        assert solver.solve() and solver.validate_solution()
+    # Half of the 16x16 solution back as a puzzle
+    puzzle = [[num if (row + col) % 2 else 0 for col, num in enumerate(line)]
+              for row, line in enumerate(solver.board)]
+    solver = SudokuSolver(puzzle, engine=engine)
+    assert solver.solve() and solver.validate_solution()
+
+
+def test_strategies_need_9x9():
+    with pytest.raises(ValueError):
+        SudokuSolver([[0] * 16 for _ in range(16)], strategies=['naked_pairs'])
+
+
+def test_solve_result_instrumentation():
+    result = SudokuSolver(SudokuGenerator.INKALA_2006, strategies=['naked_pairs']).solve()
+    assert result.status == SOLVED and result.solve_time > 0
+    assert (result.backtracks, result.max_depth, result.propagation_steps, result.phase_ns) == \
+        (None, None, None, None)
+    assert set(result.strategy_hits) == {'naked_pairs'}
+
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006, strategies=['naked_pairs'], profile=True)
+    profiled = solver.solve()
+    assert profiled.nodes == result.nodes
+    assert profiled.strategy_hits == result.strategy_hits
+    assert 0 < profiled.backtracks < profiled.nodes
+    assert 0 < profiled.max_depth < profiled.nodes
+    assert profiled.propagation_steps > 0
+    assert list(profiled.phase_ns) == list(PHASES)
+    assert all(ns > 0 for ns in profiled.phase_ns.values())
+    assert solver.strategy_stats['naked_pairs']['time'] > 0
+
+    result = SudokuSolver(UNSOLVABLE_BOARD).solve()
+    assert result.status == UNSOLVABLE and not result
+
+
+@pytest.mark.parametrize('cell_order', SudokuSolver.CELL_ORDERS)
+@pytest.mark.parametrize('value_order', SudokuSolver.VALUE_ORDERS)
+def test_orderings_find_the_solution(cell_order, value_order):
+    expected = SudokuSolver(SudokuGenerator.INKALA_2006)
+    expected.solve()
+    nodes = []
+    for _ in range(2):
+        solver = SudokuSolver(SudokuGenerator.INKALA_2006, cell_order=cell_order,
+                              value_order=value_order, seed=3)
+        assert solver.solve()
+        assert solver.board == expected.board
+        nodes.append(solver.attempts)
+    assert nodes[0] == nodes[1]
+
+
+def test_random_value_order_follows_the_seed():
+    nodes = [SudokuSolver(SudokuGenerator.INKALA_2006, value_order='random', seed=seed).solve().nodes
+             for seed in (0, 1, 0)]
+    assert nodes[0] == nodes[2] != nodes[1]
+
+
+def test_compare_heuristics():
+    rows = compare_heuristics([SudokuGenerator.INKALA_2006, SudokuGenerator.INKALA_2010])
+    assert len(rows) == len(SudokuSolver.CELL_ORDERS) * (len(SudokuSolver.VALUE_ORDERS) - 1)
+    assert all(row['solved'] == 2 for row in rows)
+    assert [row['time'] for row in rows] == sorted(row['time'] for row in rows)
+    baseline = next(row for row in rows
+                    if (row['cell_order'], row['value_order']) == ('mrv', 'ascending'))
+    assert baseline['nodes'] == 23
+
+
+def test_luby():
+    assert [luby(i) for i in range(1, 16)] == [1, 1, 2, 1, 1, 2, 4, 1, 1, 2, 1, 1, 2, 4, 8]
+
+
+@pytest.mark.parametrize('schedule', SudokuSolver.RESTART_SCHEDULES)
+def test_restarts_replay_with_seed(schedule):
+    expected = SudokuSolver(SudokuGenerator.INKALA_2006)
+    expected.solve()
+    runs = []
+    for seed in (7, 7, 8):
+        solver = SudokuSolver(SudokuGenerator.INKALA_2006, restarts=schedule,
+                              restart_nodes=5, seed=seed)
+        result = solver.solve()
+        assert result and result.seed == seed and result.restarts > 0
+        assert solver.board == expected.board
+        runs.append((result.nodes, result.restarts))
+    assert runs[0] == runs[1] != runs[2]
+
+    # A drawn seed is recorded and replays the same search
+    result = SudokuSolver(SudokuGenerator.INKALA_2006, restarts=schedule).solve()
+    replay = SudokuSolver(SudokuGenerator.INKALA_2006, restarts=schedule, seed=result.seed).solve()
+    assert (replay.nodes, replay.restarts) == (result.nodes, result.restarts)
+
+
+def test_restarts_keep_the_budget():
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006, restarts='luby', restart_nodes=5, seed=7)
+    result = solver.solve(max_nodes=30)
+    assert result.status == BUDGET_EXCEEDED and result.nodes == 30
+    assert solver.board == solver.initial_board
+    with pytest.raises(ValueError):
+        SudokuSolver(SudokuGenerator.INKALA_2006, restarts='luby', engine='dlx')
+
+
+@pytest.mark.parametrize('board, nodes', [
+    (SudokuGenerator.INKALA_2006, 22),
+    (SudokuGenerator.INKALA_2010, 1),
+])
+@pytest.mark.parametrize('search_mode', SudokuSolver.SEARCH_MODES)
+def test_inkala_node_counts(board, nodes, search_mode):
+    solver = SudokuSolver(board, search_mode=search_mode)
+    assert solver.solve()
+    assert solver.attempts == nodes
+
+
+def test_trail_matches_snapshot_search():
+    puzzles = load_puzzles([os.path.join(PUZZLE_DIR, 'sudoku_extreme_20241214_222211.json')], 200)
+    for puzzle in puzzles:
+        trail = SudokuSolver(puzzle).solve()
+        snapshot = SudokuSolver(puzzle, search_mode='snapshot').solve()
+        assert (trail.status, trail.nodes) == (snapshot.status, snapshot.nodes)
@@ -0,0 +1,82 @@
+import pytest
+from sudoku.generator import SudokuGenerator
+from sudoku.geometry import FULL_MASK
+from sudoku.solver import SudokuSolver
+from sudoku.strategies import (STRATEGIES, BoxLineReduction, HiddenSubset, NakedSubset,
+                               PointingPairs, build_pipeline)
+
+ONE, TWO = 1 << 0, 1 << 1
+ROW0 = list(range(9))
+BOX0 = [0, 1, 2, 9, 10, 11, 18, 19, 20]
+
+
+def apply(strategy, masks):
+    """Run strategy on masks in place; returns the number of cells changed."""
+    def remove(idx, bits):
+        if not masks[idx] & bits:
+            return False
+        masks[idx] &= ~bits
+        return True
+    return strategy.apply(masks, remove)
+
+
+def test_naked_pair():
+    masks = [FULL_MASK] * 81
+    masks[0] = masks[1] = ONE | TWO
+    assert apply(NakedSubset(2), masks) == 13
+    # Cells 0 and 1 share row 0 and box 0
+    for idx in set(ROW0 + BOX0) - {0, 1}:
+        assert masks[idx] == FULL_MASK & ~(ONE | TWO)
+    assert masks[0] == masks[1] == ONE | TWO
+    assert masks[27] == FULL_MASK
+
+
+def test_hidden_pair():
+    masks = [FULL_MASK] * 81
+    for idx in ROW0[2:]:
+        masks[idx] &= ~(ONE | TWO)
+    assert apply(HiddenSubset(2), masks) == 2
+    assert masks[0] == masks[1] == ONE | TWO
+    assert masks[9] == FULL_MASK
+
+
+def test_pointing_pair():
+    masks = [FULL_MASK] * 81
+    # Digit 1 of box 0 only on row 0
+    for idx in BOX0[3:]:
+        masks[idx] &= ~ONE
+    assert apply(PointingPairs(), masks) == 6
+    assert all(not masks[idx] & ONE for idx in ROW0[3:])
+    assert all(masks[idx] & ONE for idx in ROW0[:3] + [27, 80])
+
+
+def test_box_line_reduction():
+    masks = [FULL_MASK] * 81
+    # Digit 1 of row 0 only in box 0
+    for idx in ROW0[3:]:
+        masks[idx] &= ~ONE
+    assert apply(BoxLineReduction(), masks) == 6
+    assert all(not masks[idx] & ONE for idx in BOX0[3:])
+    assert all(masks[idx] & ONE for idx in ROW0[:3] + [27, 80])
+
+
+def test_no_pattern_no_change():
+    masks = [FULL_MASK] * 81
+    for strategy in build_pipeline(list(STRATEGIES)):
+        assert apply(strategy, masks) == 0
+    assert masks == [FULL_MASK] * 81
+
+
+def test_pipeline_solves_with_eliminations():
+    plain = SudokuSolver(SudokuGenerator.INKALA_2006)
+    assert plain.solve()
+    solver = SudokuSolver(SudokuGenerator.INKALA_2006, strategies=list(STRATEGIES))
+    assert solver.solve()
+    assert solver.board == plain.board
+    assert solver.strategy_stats['pointing_pairs']['eliminations'] > 0
+    assert solver.strategy_stats['naked_pairs']['hits'] > 0
+
+
+def test_unknown_strategy():
+    with pytest.raises(ValueError):
+        build_pipeline(['x_wing'])
@@ -0,0 +1,50 @@
+import os
+import sys
+import pytest
+from sudoku import tester as tester_module
+from sudoku.benchmark import load_puzzles
+from sudoku.generator import SudokuGenerator
+from sudoku.tester import SudokuTester
+
+PUZZLES = [SudokuGenerator.INKALA_2006, SudokuGenerator.INKALA_2010]
+
+
+def run_main(monkeypatch, *args):
+    monkeypatch.setattr(sys, 'argv', ['tester', *args])
+    tester_module.main()
+
+
+def test_replay_solves_the_given_puzzles(tmp_path):
+    tester = SudokuTester(save_dir=str(tmp_path), puzzles=PUZZLES)
+    assert (tester.difficulty, tester.num_puzzles, tester.seed) == ('replay', 2, None)
+    tester.run_tests()
+    assert [result['puzzle'] for result in tester.results] == PUZZLES
+    assert all(result['solved'] for result in tester.results)
+    assert tester.stats['generation_time'] == 0.0
+    assert tester.stats['solved_count'] == 2
+    assert os.listdir(tmp_path) == []
+
+
+def test_generated_run_times_generation_apart(tmp_path):
+    tester = SudokuTester(3, 'easy', str(tmp_path), seed=1)
+    tester.run_tests()
+    assert tester.stats['generation_time'] > 0
+    assert tester.stats['solved_count'] == 3
+
+
+def test_saved_run_replays(monkeypatch, tmp_path):
+    saved, replays = tmp_path / 'saved', tmp_path / 'replays'
+    run_main(monkeypatch, '-n', '3', '-d', 'easy', '--seed', '2', '-s', str(saved))
+    [filename] = os.listdir(saved)
+    path = str(saved / filename)
+
+    # Replays write nothing unless asked to
+    run_main(monkeypatch, '--from-file', path, '-s', str(replays))
+    assert os.listdir(replays) == []
+    run_main(monkeypatch, '--from-file', path, '-s', str(replays), '--save')
+    [filename] = os.listdir(replays)
+    assert load_puzzles([str(replays / filename)]) == load_puzzles([path])
+
+    with pytest.raises(SystemExit):
+        run_main(monkeypatch, '--from-file', path, '--store', str(tmp_path / 'puzzles.sdk'))
+    assert not os.path.exists(tmp_path / 'puzzles.sdk')